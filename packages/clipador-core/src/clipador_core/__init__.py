@@ -5,8 +5,10 @@ from .monitoring import (  # noqa: F401
     BurstConfig,
     Clip,
     ClipGroup,
+    ParsedClip,
     get_time_minutes_ago,
     group_clips_by_burst,
+    iso_to_epoch,
     minimo_clipes_por_viewers,
     resolve_monitoring_parameters,
 )
@@ -15,7 +17,9 @@ __all__ = [
     "BurstConfig",
     "Clip",
     "ClipGroup",
+    "ParsedClip",
     "group_clips_by_burst",
+    "iso_to_epoch",
     "get_time_minutes_ago",
     "minimo_clipes_por_viewers",
     "resolve_monitoring_parameters",
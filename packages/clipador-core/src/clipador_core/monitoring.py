@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Iterable, Mapping, Tuple, Union
+from typing import Any, Callable, Iterable, Mapping, Tuple, Union
 
 MinClipsStrategy = Union[int, Callable[[int], int]]
 
@@ -37,6 +37,63 @@ class Clip:
         )
 
 
+def iso_to_epoch(value: str) -> int:
+    """Converte um timestamp ISO8601 da Twitch (sufixo `Z` suportado) em segundos UTC."""
+
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+@dataclass(slots=True)
+class ParsedClip:
+    """Clipe bruto da Twitch já convertido, com `created_at` em epoch (segundos UTC).
+
+    Construído uma única vez na borda do adaptador para que agrupamento, deduplicação
+    e persistência não precisem reinterpretar o timestamp ISO de cada clipe.
+    """
+
+    id: str
+    created_at: int
+    broadcaster_id: str | None = None
+    broadcaster_name: str | None = None
+    creator_name: str | None = None
+    title: str | None = None
+    url: str | None = None
+    thumbnail_url: str | None = None
+    video_id: str | None = None
+    view_count: int = 0
+    duration: float = 0.0
+    _created_at_dt: datetime | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_twitch(cls, data: Mapping[str, Any]) -> "ParsedClip":
+        """Cria o registro a partir do payload do endpoint `/clips` da Helix."""
+
+        created_at_dt = datetime.fromisoformat(data["created_at"].replace("Z", "+00:00"))
+        get = data.get
+        return cls(
+            data["id"],
+            int(created_at_dt.timestamp()),
+            get("broadcaster_id"),
+            get("broadcaster_name"),
+            get("creator_name"),
+            get("title"),
+            get("url"),
+            get("thumbnail_url"),
+            get("video_id"),
+            int(get("view_count") or 0),
+            float(get("duration") or 0),
+            created_at_dt,
+        )
+
+    @property
+    def created_at_datetime(self) -> datetime:
+        """`created_at` como datetime UTC, reaproveitando o valor já convertido na borda."""
+
+        if self._created_at_dt is None:
+            self._created_at_dt = datetime.fromtimestamp(self.created_at, timezone.utc)
+        return self._created_at_dt
+
+
 @dataclass(slots=True)
 class ClipGroup:
     """Agrupamento (burst) de clipes em um intervalo de tempo."""
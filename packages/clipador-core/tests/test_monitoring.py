@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 from clipador_core.monitoring import (
     BurstConfig,
     Clip,
+    ParsedClip,
     get_time_minutes_ago,
     group_clips_by_burst,
     minimo_clipes_por_viewers,
@@ -132,3 +133,28 @@ def test_resolve_monitoring_parameters_with_presets_and_manual():
     )
     assert intervalo_default == 75
     assert minimo_default == 4
+
+
+def test_parsed_clip_from_twitch_payload():
+    raw = {
+        "id": "clipX",
+        "created_at": "2024-05-01T12:30:15Z",
+        "broadcaster_id": "123",
+        "broadcaster_name": "Streamer",
+        "creator_name": "fan",
+        "title": "Jogada",
+        "url": "https://clips.twitch.tv/clipX",
+        "thumbnail_url": "https://static/clipX.jpg",
+        "view_count": "42",
+        "duration": 27.5,
+    }
+
+    parsed = ParsedClip.from_twitch(raw)
+
+    expected = datetime(2024, 5, 1, 12, 30, 15, tzinfo=timezone.utc)
+    assert parsed.created_at == int(expected.timestamp())
+    assert parsed.created_at_datetime == expected
+    assert parsed.view_count == 42
+    assert parsed.duration == 27.5
+    assert parsed.video_id is None
+    assert not hasattr(parsed, "__dict__")
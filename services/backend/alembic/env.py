@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -8,6 +9,7 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from clipador_backend.models import Base
+from clipador_backend.services.partitions import PARTITIONED_TABLES
 from clipador_backend.settings import get_settings
 
 config = context.config
@@ -24,11 +26,25 @@ config.set_main_option("sqlalchemy.url", database_url)
 
 target_metadata = Base.metadata
 
+_PARTITION_NAME = re.compile(r"^(\w+?)_(?:p\d{6}|default)$")
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # As partições mensais (`clips_p202501`, `clips_default`, ...) são criadas pela
+    # migração 0005 e por `maintain_partitions`, não pelos modelos; sem este filtro o
+    # autogenerate proporia removê-las.
+    if type_ == "table" and reflected and compare_to is None:
+        match = _PARTITION_NAME.match(name)
+        if match and match.group(1) in PARTITIONED_TABLES:
+            return False
+    return True
+
 
 def run_migrations_offline() -> None:
     context.configure(
         url=database_url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -38,7 +54,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_object=include_object
+    )
 
     with context.begin_transaction():
         context.run_migrations()
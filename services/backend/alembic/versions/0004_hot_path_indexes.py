@@ -0,0 +1,48 @@
+"""Add composite, partial and covering indexes for hot query paths"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_hot_path_indexes"
+down_revision = "0003_channel_config"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES: list[tuple[str, str, list[str], dict]] = [
+    ("ix_clips_created_at", "clips", ["created_at"], {}),
+    ("ix_clips_streamer_created_at", "clips", ["streamer_id", "created_at"], {}),
+    ("ix_bursts_start_time", "bursts", ["start_time"], {}),
+    ("ix_bursts_streamer_start_time", "bursts", ["streamer_id", "start_time"], {}),
+    ("ix_burst_clips_clip_external_id", "burst_clips", ["clip_external_id"], {"postgresql_include": ["burst_id"]}),
+    ("ix_user_streamers_streamer_id", "user_streamers", ["streamer_id"], {}),
+    ("ix_clip_deliveries_user_delivered_at", "clip_deliveries", ["user_id", "delivered_at"], {}),
+    ("ix_streamer_status_user_updated_at", "streamer_status", ["user_id", "updated_at"], {}),
+    (
+        "ix_streamers_active_id",
+        "streamers",
+        ["id"],
+        {"postgresql_where": sa.text("is_active = true"), "sqlite_where": sa.text("is_active = true")},
+    ),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # CONCURRENTLY evita bloquear escritas nas tabelas grandes; exige rodar fora da transação.
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in _INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+        return
+
+    for name, table, columns, kwargs in _INDEXES:
+        op.create_index(name, table, columns, **kwargs)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
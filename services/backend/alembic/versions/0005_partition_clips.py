@@ -0,0 +1,124 @@
+"""Partition clips and clip_deliveries by month (Postgres only)
+
+`clips` passa a ser particionada por `created_at` e `clip_deliveries` por `burst_start`
+(a chave de partição precisa fazer parte de toda constraint única, e a janela de
+deduplicação `uq_clip_delivery_window` já inclui `burst_start`). Como PK/UNIQUE de
+tabelas particionadas precisam conter a chave de partição, `clips.id` deixa de ser
+único isoladamente e as FKs que apontavam para ele (`burst_clips.clip_id`,
+`clip_deliveries.clip_id`) são removidas; a limpeza desses vínculos fica com a retenção.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from clipador_backend.services.partitions import add_months, month_partitions, month_start
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_partition_clips"
+down_revision = "0004_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _create_monthly_partitions(table: str, column: str) -> None:
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text(f"SELECT min({column}) FROM {table}_legacy")).scalar()
+    current = month_start(datetime.now(timezone.utc))
+    first = month_start(oldest) if oldest is not None else current
+    for partition in month_partitions(table, min(first, current), add_months(current, MONTHS_AHEAD)):
+        op.execute(partition.create_sql())
+    # Linhas fora de qualquer mês previsto não quebram inserts.
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_constraint("burst_clips_clip_id_fkey", "burst_clips", type_="foreignkey")
+    op.drop_constraint("clip_deliveries_clip_id_fkey", "clip_deliveries", type_="foreignkey")
+
+    # clips -------------------------------------------------------------------
+    op.execute("ALTER TABLE clips RENAME TO clips_legacy")
+    op.execute("ALTER SEQUENCE clips_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE clips (LIKE clips_legacy INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+    )
+    _create_monthly_partitions("clips", "created_at")
+    op.execute("INSERT INTO clips SELECT * FROM clips_legacy")
+    op.execute("DROP TABLE clips_legacy")
+    op.execute("ALTER SEQUENCE clips_id_seq OWNED BY clips.id")
+    op.create_primary_key("clips_pkey", "clips", ["id", "created_at"])
+    op.create_unique_constraint("uq_clips_clip_id_created_at", "clips", ["clip_id", "created_at"])
+    op.create_foreign_key(None, "clips", "streamers", ["streamer_id"], ["id"], ondelete="CASCADE")
+    op.create_index("ix_clips_created_at", "clips", ["created_at"])
+    op.create_index("ix_clips_streamer_created_at", "clips", ["streamer_id", "created_at"])
+    op.create_index("ix_clips_clip_id", "clips", ["clip_id"])
+
+    # clip_deliveries ---------------------------------------------------------
+    op.execute("ALTER TABLE clip_deliveries RENAME TO clip_deliveries_legacy")
+    op.execute("ALTER SEQUENCE clip_deliveries_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE clip_deliveries (LIKE clip_deliveries_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (burst_start)"
+    )
+    _create_monthly_partitions("clip_deliveries", "burst_start")
+    op.execute("INSERT INTO clip_deliveries SELECT * FROM clip_deliveries_legacy")
+    op.execute("DROP TABLE clip_deliveries_legacy")
+    op.execute("ALTER SEQUENCE clip_deliveries_id_seq OWNED BY clip_deliveries.id")
+    op.create_primary_key("clip_deliveries_pkey", "clip_deliveries", ["id", "burst_start"])
+    op.create_unique_constraint(
+        "uq_clip_delivery_window",
+        "clip_deliveries",
+        ["user_id", "streamer_id", "burst_start", "burst_end", "clip_external_id"],
+    )
+    op.create_foreign_key(None, "clip_deliveries", "users", ["user_id"], ["id"], ondelete="CASCADE")
+    op.create_foreign_key(None, "clip_deliveries", "streamers", ["streamer_id"], ["id"], ondelete="CASCADE")
+    op.create_foreign_key(None, "clip_deliveries", "bursts", ["burst_id"], ["id"], ondelete="SET NULL")
+    op.create_index("ix_clip_deliveries_user_delivered_at", "clip_deliveries", ["user_id", "delivered_at"])
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, unique in (
+        # nome gerado pelo Postgres para o UniqueConstraint("clip_id") sem nome da 0001
+        ("clips", ("clips_clip_id_key", "clip_id")),
+        ("clip_deliveries", None),
+    ):
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+        op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.create_primary_key(f"{table}_pkey", table, ["id"])
+        if unique:
+            op.create_unique_constraint(unique[0], table, [unique[1]])
+
+    op.create_unique_constraint(
+        "uq_clip_delivery_window",
+        "clip_deliveries",
+        ["user_id", "streamer_id", "burst_start", "burst_end", "clip_external_id"],
+    )
+    op.create_foreign_key(None, "clips", "streamers", ["streamer_id"], ["id"], ondelete="CASCADE")
+    op.create_foreign_key(None, "clip_deliveries", "users", ["user_id"], ["id"], ondelete="CASCADE")
+    op.create_foreign_key(None, "clip_deliveries", "streamers", ["streamer_id"], ["id"], ondelete="CASCADE")
+    op.create_foreign_key(None, "clip_deliveries", "bursts", ["burst_id"], ["id"], ondelete="SET NULL")
+    op.create_foreign_key(
+        "burst_clips_clip_id_fkey", "burst_clips", "clips", ["clip_id"], ["id"], ondelete="CASCADE"
+    )
+    op.create_foreign_key(
+        "clip_deliveries_clip_id_fkey", "clip_deliveries", "clips", ["clip_id"], ["id"], ondelete="SET NULL"
+    )
+    op.create_index("ix_clips_created_at", "clips", ["created_at"])
+    op.create_index("ix_clips_streamer_created_at", "clips", ["streamer_id", "created_at"])
+    op.create_index("ix_clip_deliveries_user_delivered_at", "clip_deliveries", ["user_id", "delivered_at"])
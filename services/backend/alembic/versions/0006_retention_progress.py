@@ -0,0 +1,29 @@
+"""Add retention progress checkpoints"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_retention_progress"
+down_revision = "0005_partition_clips"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "retention_progress",
+        sa.Column("table_name", sa.String(length=64), primary_key=True),
+        sa.Column("last_pk", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("cutoff", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("rows_deleted", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("runs", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("retention_progress")
@@ -0,0 +1,46 @@
+"""Add pg_trgm GIN indexes for streamer and user substring search (Postgres only)"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_trigram_search"
+down_revision = "0006_retention_progress"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES: list[tuple[str, str, str]] = [
+    ("ix_streamers_display_name_trgm", "streamers", "display_name"),
+    ("ix_streamers_twitch_user_id_trgm", "streamers", "twitch_user_id"),
+    ("ix_users_username_trgm", "users", "username"),
+    ("ix_users_email_trgm", "users", "email"),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in _INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
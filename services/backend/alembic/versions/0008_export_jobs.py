@@ -0,0 +1,37 @@
+"""Add export jobs"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_export_jobs"
+down_revision = "0007_trigram_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.String(length=32), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("fmt", sa.String(length=16), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("rows_written", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("file_path", sa.String(length=512), nullable=True),
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_export_jobs_user_created", "export_jobs", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_user_created", table_name="export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,36 @@
+"""Add webhook inbox"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009_webhook_inbox"
+down_revision = "0008_export_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_inbox",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("idempotency_key", sa.String(length=160), nullable=False),
+        sa.Column("event_type", sa.String(length=64), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("received_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("source", "idempotency_key", name="uq_webhook_inbox_key"),
+    )
+    op.create_index("ix_webhook_inbox_status_id", "webhook_inbox", ["status", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_inbox_status_id", table_name="webhook_inbox")
+    op.drop_table("webhook_inbox")
@@ -0,0 +1,33 @@
+"""Add functional index on lower(users.email)"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010_users_email_lower"
+down_revision = "0009_webhook_inbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")])
+        return
+
+    # CONCURRENTLY não bloqueia as escritas em `users` durante a criação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email_lower",
+            "users",
+            [sa.text("lower(email)")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_lower", table_name="users")
@@ -0,0 +1,151 @@
+"""Benchmark: ciclo de ingestão (`ClipIngestionService.sync_once`) contra a Helix falsa.
+
+Para cada tamanho em `--streamers` (padrão 100, 1000 e 10000), recria o schema,
+cadastra os streamers e roda `--cycles` ciclos de `sync_once`, avançando o relógio
+da Helix falsa `--advance-seconds` entre eles para que novos clipes cheguem pelo
+processo de Poisson com rajadas. Por ciclo, reporta tempo, consultas SQL, requisições
+à Helix, clipes/bursts novos e memória (RSS máximo e, com `--trace-memory`, o pico
+do `tracemalloc`).
+
+O banco é um SQLite temporário em arquivo, ou o que estiver em `CLIPADOR_DATABASE_URL`.
+
+    python services/backend/scripts/bench_ingestion.py --streamers 100 1000 --cycles 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="bench-ingestion-"), "bench.db")
+os.environ.setdefault("CLIPADOR_DATABASE_URL", f"sqlite+aiosqlite:///{_DB_PATH}")
+os.environ.setdefault("CLIPADOR_APP_ENV", "test")
+os.environ.setdefault("CLIPADOR_JWT_SECRET", "bench-secret")
+os.environ.setdefault("CLIPADOR_TWITCH_CLIENT_ID", "bench-client")
+os.environ.setdefault("CLIPADOR_TWITCH_CLIENT_SECRET", "bench-secret")
+
+import httpx  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from clipador_backend.adapters.twitch import TwitchAPI  # noqa: E402
+from clipador_backend.db import dispose_engine, get_engine  # noqa: E402
+from clipador_backend.models import Base, Streamer  # noqa: E402
+from clipador_backend.services.ingestion import ClipIngestionService  # noqa: E402
+from clipador_backend.testing import FakeHelix, FakeHelixConfig, PoissonBursts  # noqa: E402
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.offset = 0.0
+
+    def __call__(self) -> float:
+        return time.time() + self.offset
+
+
+def _rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB; macOS, bytes
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+async def _seed(count: int) -> None:
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Streamer),
+            [
+                {"twitch_user_id": str(index), "display_name": f"Streamer {index}"}
+                for index in range(1, count + 1)
+            ],
+        )
+
+
+async def _run(count: int, args: argparse.Namespace) -> None:
+    await _seed(count)
+
+    clock = _Clock()
+    fake = FakeHelix(
+        config=FakeHelixConfig(
+            latency_seconds=args.latency_ms / 1000,
+            error_rate=args.error_rate,
+            rate_limit=10**9,
+        ),
+        arrivals=PoissonBursts(
+            background_per_hour=args.clips_per_hour, bursts_per_hour=args.bursts_per_hour
+        ),
+        clock=clock,
+    )
+    twitch = TwitchAPI(client=httpx.AsyncClient(transport=fake.transport()))
+    service = ClipIngestionService(twitch)
+
+    queries = 0
+
+    def _count(*_args) -> None:
+        nonlocal queries
+        queries += 1
+
+    engine = get_engine()
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        for cycle in range(1, args.cycles + 1):
+            queries = 0
+            helix_before = sum(fake.requests.values())
+            if args.trace_memory:
+                tracemalloc.reset_peak()
+
+            started = time.perf_counter()
+            outcomes = await service.sync_once()
+            elapsed = time.perf_counter() - started
+
+            peak = tracemalloc.get_traced_memory()[1] / 2**20 if args.trace_memory else 0.0
+            print(
+                f"{count:>6} streamers  ciclo {cycle}  {elapsed:8.2f} s  "
+                f"{queries:8d} queries ({queries / max(count, 1):5.1f}/streamer)  "
+                f"{sum(fake.requests.values()) - helix_before:7d} req helix  "
+                f"{sum(o.new_clips for o in outcomes.values()):7d} clipes  "
+                f"{sum(o.bursts for o in outcomes.values()):5d} bursts  "
+                f"{sum(o.failed for o in outcomes.values()):4d} falhas  "
+                + (f"pico {peak:7.1f} MiB  " if args.trace_memory else "")
+                + f"rss {_rss_mb():7.1f} MiB"
+            )
+            clock.offset += args.advance_seconds
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _count)
+        await twitch.aclose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--streamers", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--advance-seconds", type=float, default=180.0)
+    parser.add_argument("--clips-per-hour", type=float, default=2.0)
+    parser.add_argument("--bursts-per-hour", type=float, default=0.5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="pico por ciclo via tracemalloc (mais lento)"
+    )
+    args = parser.parse_args()
+
+    if args.trace_memory:
+        tracemalloc.start()
+    try:
+        for count in args.streamers:
+            await _run(count, args)
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
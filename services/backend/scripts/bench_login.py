@@ -0,0 +1,105 @@
+"""Benchmark: logins concorrentes e o atraso que eles impõem ao event loop.
+
+Dispara `--logins` verificações de senha concorrentes e, em paralelo, um heartbeat que
+acorda a cada 5 ms; o atraso máximo do heartbeat mostra quanto o loop ficou travado.
+
+- `inline`: comportamento antigo (pbkdf2_sha256 verificado direto no loop);
+- `pool`: `verify_and_update_password` (argon2id no pool de threads limitado);
+- `route`: `POST /auth/login` completo contra um SQLite em memória.
+
+    python services/backend/scripts/bench_login.py --logins 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Awaitable, Callable
+
+os.environ.setdefault("CLIPADOR_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("CLIPADOR_APP_ENV", "test")
+
+from passlib.hash import pbkdf2_sha256  # noqa: E402
+
+from clipador_backend.security.auth import hash_password, verify_and_update_password  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+TICK = 0.005
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def _measure(name: str, logins: int, login: Callable[[], Awaitable[None]]) -> None:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(TICK * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+    lags = lags or [0.0]
+    print(
+        f"{name:<7} {logins / elapsed:8.1f} logins/s   "
+        f"loop lag p50 {statistics.median(lags) * 1000:7.1f} ms   max {max(lags) * 1000:7.1f} ms"
+    )
+
+
+async def _inline_login(hashed: str) -> None:
+    await asyncio.sleep(0)
+    assert pbkdf2_sha256.verify(PASSWORD, hashed)
+
+
+async def _pool_login(hashed: str) -> None:
+    valid, _ = await verify_and_update_password(PASSWORD, hashed)
+    assert valid
+
+
+async def _route_benchmark(logins: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from clipador_backend.db import get_engine, session_scope
+    from clipador_backend.main import create_app
+    from clipador_backend.models import Base, UserAccount
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_scope() as session:
+        session.add(UserAccount(username="bench", hashed_password=hash_password(PASSWORD)))
+
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def login() -> None:
+            response = await client.post("/auth/login", json={"username": "bench", "password": PASSWORD})
+            assert response.status_code == 200, response.text
+
+        await _measure("route", logins, login)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    legacy_hash = pbkdf2_sha256.hash(PASSWORD)
+    argon_hash = hash_password(PASSWORD)
+
+    await _measure("inline", args.logins, lambda: _inline_login(legacy_hash))
+    await _measure("pool", args.logins, lambda: _pool_login(argon_hash))
+    await _route_benchmark(args.logins)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
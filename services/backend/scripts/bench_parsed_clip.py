@@ -0,0 +1,140 @@
+"""Micro-benchmark: dicts brutos da Twitch vs. ParsedClip no pipeline legado de monitoramento.
+
+Reproduz o caminho quente do antigo `MonitoringService` (agrupamento por proximidade,
+janela do grupo para deduplicação e montagem das linhas a persistir) nas duas
+representações e reporta o custo por clipe. O serviço foi removido — a ingestão atual é
+`services/ingestion.py` —, então o script serve só para comparar as representações.
+
+    python services/backend/scripts/bench_parsed_clip.py --clips 2000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from clipador_core import ParsedClip
+
+
+def _gerar_clipes(total: int) -> list[dict]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    atual = base
+    clipes = []
+    for indice in range(total):
+        # rajadas curtas separadas por pausas longas, como numa live real
+        atual += timedelta(seconds=random.choice([5, 20, 45, 2400]))
+        clipes.append(
+            {
+                "id": f"clip{indice}",
+                "created_at": atual.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "broadcaster_id": "1",
+                "broadcaster_name": "Streamer",
+                "creator_name": "fan",
+                "title": f"Clip {indice}",
+                "url": f"https://clips.twitch.tv/clip{indice}",
+                "thumbnail_url": f"https://static/clip{indice}.jpg",
+                "view_count": indice,
+                "duration": 30.0,
+            }
+        )
+    random.shuffle(clipes)
+    return clipes
+
+
+def _pipeline_dicts(clipes: list[dict], janela_minutos: int = 30) -> int:
+    ordenados = sorted(clipes, key=lambda x: x["created_at"])
+    grupos = []
+    grupo_atual = [ordenados[0]]
+    for clip_atual in ordenados[1:]:
+        ultimo_clip = grupo_atual[-1]
+        tempo_atual = datetime.fromisoformat(clip_atual["created_at"].replace("Z", "+00:00"))
+        tempo_ultimo = datetime.fromisoformat(ultimo_clip["created_at"].replace("Z", "+00:00"))
+        if (tempo_atual - tempo_ultimo).total_seconds() / 60 <= janela_minutos:
+            grupo_atual.append(clip_atual)
+        else:
+            grupos.append(grupo_atual)
+            grupo_atual = [clip_atual]
+    grupos.append(grupo_atual)
+
+    linhas = 0
+    for grupo in grupos:
+        # deve_enviar_grupo
+        primeiro = min(grupo, key=lambda x: x["created_at"])
+        ultimo = max(grupo, key=lambda x: x["created_at"])
+        datetime.fromisoformat(primeiro["created_at"].replace("Z", "+00:00"))
+        datetime.fromisoformat(ultimo["created_at"].replace("Z", "+00:00"))
+        # enviar_grupo_clipes
+        for clip in grupo:
+            datetime.fromisoformat(clip["created_at"].replace("Z", "+00:00"))
+            linhas += 1
+        primeiro = min(grupo, key=lambda x: x["created_at"])
+        ultimo = max(grupo, key=lambda x: x["created_at"])
+        datetime.fromisoformat(primeiro["created_at"].replace("Z", "+00:00"))
+        datetime.fromisoformat(ultimo["created_at"].replace("Z", "+00:00"))
+    return linhas
+
+
+def _converter(clipes: list[dict]) -> list[ParsedClip]:
+    return [ParsedClip.from_twitch(clip) for clip in clipes]
+
+
+def _pipeline_parsed(parsed: list[ParsedClip], janela_minutos: int = 30) -> int:
+    ordenados = sorted(parsed, key=lambda x: x.created_at)
+    janela_segundos = janela_minutos * 60
+    grupos = []
+    grupo_atual = [ordenados[0]]
+    tempo_ultimo = ordenados[0].created_at
+    for clip_atual in ordenados[1:]:
+        if clip_atual.created_at - tempo_ultimo <= janela_segundos:
+            grupo_atual.append(clip_atual)
+        else:
+            grupos.append(grupo_atual)
+            grupo_atual = [clip_atual]
+        tempo_ultimo = clip_atual.created_at
+    grupos.append(grupo_atual)
+
+    linhas = 0
+    for grupo in grupos:
+        inicio = min(clip.created_at for clip in grupo)
+        fim = max(clip.created_at for clip in grupo)
+        datetime.fromtimestamp(inicio, timezone.utc)
+        datetime.fromtimestamp(fim, timezone.utc)
+        for clip in grupo:
+            _ = clip.created_at_datetime
+            linhas += 1
+    return linhas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline legado com ParsedClip")
+    parser.add_argument("--clips", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    clipes = _gerar_clipes(args.clips)
+    parsed = _converter(clipes)
+    assert _pipeline_dicts(clipes) == _pipeline_parsed(parsed) == args.clips
+
+    def medir(funcao) -> float:
+        return min(timeit.repeat(funcao, number=1, repeat=args.repeat)) / args.clips * 1e6
+
+    tempo_dicts = medir(lambda: _pipeline_dicts(clipes))
+    tempo_conversao = medir(lambda: _converter(clipes))
+    tempo_estagios = medir(lambda: _pipeline_parsed(parsed))
+    tempo_total = tempo_conversao + tempo_estagios
+
+    print(f"clipes: {args.clips}")
+    print(f"dicts brutos (estágios)       : {tempo_dicts:8.2f} µs/clipe")
+    print(f"ParsedClip conversão na borda : {tempo_conversao:8.2f} µs/clipe")
+    ganho_estagios = tempo_dicts / tempo_estagios
+    ganho_total = tempo_dicts / tempo_total
+    print(f"ParsedClip estágios           : {tempo_estagios:8.2f} µs/clipe ({ganho_estagios:.1f}x)")
+    print(f"ParsedClip total              : {tempo_total:8.2f} µs/clipe ({ganho_total:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark: latência do webhook da Kirvano sob rajadas de reenvio.
+
+Gera `--sales` vendas aprovadas, cada uma reenviada `--replays` vezes em ordem
+embaralhada (como a Kirvano faz quando a resposta demora), e mede p50/p99 por
+requisição com `--concurrency` requisições em voo. O banco é um SQLite temporário em
+arquivo, ou o que estiver em `CLIPADOR_DATABASE_URL`; no SQLite a concorrência padrão é
+1, porque escritores simultâneos só medem a espera pelo lock do arquivo — use um
+Postgres descartável para rajadas concorrentes.
+
+- `inline`: o processamento antigo, com a cobrança aplicada dentro da requisição
+  (reenvios simultâneos da mesma venda disputam o INSERT e aparecem como erros);
+- `route`: `POST /webhooks/kirvano` completo (grava na caixa de entrada e responde);
+- `drain`: tempo do worker para aplicar a caixa de entrada acumulada pelo `route`.
+
+    python services/backend/scripts/bench_webhooks.py --sales 200 --replays 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Awaitable, Callable
+
+# em memória o SQLite usa uma conexão só, que não comporta sessões concorrentes
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="bench-webhooks-"), "bench.db")
+os.environ.setdefault("CLIPADOR_DATABASE_URL", f"sqlite+aiosqlite:///{_DB_PATH}")
+os.environ.setdefault("CLIPADOR_APP_ENV", "test")
+os.environ.setdefault("CLIPADOR_JWT_SECRET", "bench-secret")
+os.environ.setdefault("CLIPADOR_KIRVANO_TOKEN", "bench-token")
+
+from clipador_backend.db import get_engine, get_session_factory, session_scope  # noqa: E402
+from clipador_backend.models import Base, UserAccount  # noqa: E402
+from clipador_backend.services.webhook_inbox import InboxDrainer, apply_kirvano_event  # noqa: E402
+
+
+def _payloads(sales: int, replays: int, prefix: str) -> list[dict[str, Any]]:
+    payloads = [
+        {
+            "event": "SALE_APPROVED",
+            "sale_id": f"{prefix}-{index}",
+            "status": "approved",
+            "customer": {"email": f"user{index % 50}@example.com", "id": f"cust-{index}"},
+            "products": [{"offer_name": "Mensal Solo"}],
+        }
+        for index in range(sales)
+        for _ in range(replays)
+    ]
+    random.Random(42).shuffle(payloads)
+    return payloads
+
+
+def _report(name: str, latencies: list[float], errors: int, elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<7} {len(ordered) / elapsed:8.1f} req/s   "
+        f"p50 {statistics.median(ordered) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms   "
+        f"max {ordered[-1] * 1000:7.2f} ms   erros {errors}"
+    )
+
+
+async def _measure(
+    name: str,
+    payloads: list[dict[str, Any]],
+    concurrency: int,
+    call: Callable[[dict[str, Any]], Awaitable[None]],
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(payload: dict[str, Any]) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(payload)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    _report(name, latencies, errors, time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sales", type=int, default=200)
+    parser.add_argument("--replays", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+    if args.concurrency is None:
+        args.concurrency = 1 if get_engine().dialect.name == "sqlite" else 32
+
+    from httpx import ASGITransport, AsyncClient
+
+    from clipador_backend.main import create_app
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_scope() as session:
+        session.add_all(
+            UserAccount(
+                username=f"user{index}", email=f"user{index}@example.com", hashed_password="x"
+            )
+            for index in range(50)
+        )
+
+    inline = _payloads(args.sales, args.replays, "inline")
+    await _measure("inline", inline, args.concurrency, apply_kirvano_event)
+
+    app = create_app()
+    headers = {"Security-Token": os.environ["CLIPADOR_KIRVANO_TOKEN"]}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def post(payload: dict[str, Any]) -> None:
+            response = await client.post("/webhooks/kirvano", headers=headers, json=payload)
+            assert response.status_code == 200, response.text
+
+        routed = _payloads(args.sales, args.replays, "route")
+        await _measure("route", routed, args.concurrency, post)
+
+    started = time.perf_counter()
+    report = await InboxDrainer(get_session_factory()).drain()
+    elapsed = time.perf_counter() - started
+    print(f"drain   {report.processed} eventos aplicados em {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
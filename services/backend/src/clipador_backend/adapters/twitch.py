@@ -12,8 +12,6 @@ from clipador_adapters import TwitchClient
 
 from ..settings import get_settings
 
-_BASE_URL = "https://api.twitch.tv/helix"
-
 
 class TwitchAPI(TwitchClient):
     def __init__(self, *, client: httpx.AsyncClient | None = None):
@@ -33,7 +31,7 @@ class TwitchAPI(TwitchClient):
             return cached[0]
 
         response = await self._client.post(
-            "https://id.twitch.tv/oauth2/token",
+            self._settings.twitch_auth_url,
             data={
                 "client_id": cid,
                 "client_secret": secret,
@@ -62,18 +60,18 @@ class TwitchAPI(TwitchClient):
             "Client-ID": cid,
             "Authorization": f"Bearer {token}",
         }
-        url = f"{_BASE_URL}{path}"
+        url = f"{self._settings.twitch_api_base_url}{path}"
         response = await self._client.request(method, url, params=params, headers=headers)
         response.raise_for_status()
         return response.json()
 
     async def get_stream_info(self, user_id: str) -> dict[str, Any] | None:
         data = await self._request("GET", "/streams", params={"user_id": user_id})
-        return data.get("data", [None])[0]
+        return (data.get("data") or [None])[0]
 
     async def get_vod_by_id(self, vod_id: str) -> dict[str, Any] | None:
         data = await self._request("GET", "/videos", params={"id": vod_id})
-        return data.get("data", [None])[0]
+        return (data.get("data") or [None])[0]
 
     async def get_clips(
         self,
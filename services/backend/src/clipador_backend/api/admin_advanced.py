@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from clipador_backend.dependencies import get_current_user, get_db
 from clipador_backend.models.user import UserAccount, UserRole
 from clipador_backend.models.config import ConfiguracaoCanal
+from clipador_backend.repositories.search import ilike_contains
 from clipador_backend.services.plan_service import PlanService
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -98,8 +99,7 @@ async def list_users(
     if plano:
         q = q.filter(UserAccount.plan.ilike(f"%{plano}%"))
     if termo:
-        like_term = f"%{termo}%"
-        q = q.filter(or_(UserAccount.username.ilike(like_term), UserAccount.email.ilike(like_term)))
+        q = q.filter(or_(ilike_contains(UserAccount.username, termo), ilike_contains(UserAccount.email, termo)))
     if telegram_id is not None:
         # Compat: não temos telegram_id em UserAccount; manter como filtro no username/email
         q = q.filter(or_(UserAccount.username == str(telegram_id), UserAccount.email.ilike(f"%{telegram_id}%")))
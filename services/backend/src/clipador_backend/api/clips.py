@@ -11,6 +11,7 @@ from clipador_backend.dependencies import get_current_user, get_db
 from clipador_backend.models.user import UserAccount
 from clipador_backend.models.clip import Clip
 from clipador_backend.models.config import HistoricoEnvio, StatusStreamer
+from clipador_backend.repositories.search import ilike_contains
 
 router = APIRouter(prefix="/clips", tags=["clips"])
 
@@ -29,7 +30,7 @@ async def listar_meus_clipes(
     q = db.query(Clip).filter(Clip.user_id == current_user.id)
 
     if streamer:
-        q = q.filter(Clip.broadcaster_name.ilike(f"%{streamer}%"))
+        q = q.filter(ilike_contains(Clip.broadcaster_name, streamer))
 
     if days:
         start = datetime.now() - timedelta(days=days)
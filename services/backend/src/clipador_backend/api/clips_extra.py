@@ -14,6 +14,7 @@ from sqlalchemy import and_, desc
 from clipador_backend.dependencies import get_current_user, get_db
 from clipador_backend.models.user import UserAccount
 from clipador_backend.models.clip import Clip
+from clipador_backend.repositories.search import ilike_contains
 from clipador_backend.settings import settings
 
 router = APIRouter(prefix="/clips", tags=["clips"])
@@ -54,7 +55,7 @@ async def exportar_clipes(
     q = db.query(Clip).filter(Clip.user_id == current_user.id)
 
     if streamer:
-        q = q.filter(Clip.broadcaster_name.ilike(f"%{streamer}%"))
+        q = q.filter(ilike_contains(Clip.broadcaster_name, streamer))
 
     inicio = datetime.now() - timedelta(days=days)
     q = q.filter(Clip.created_at >= inicio).order_by(desc(Clip.created_at))
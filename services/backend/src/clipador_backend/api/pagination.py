@@ -0,0 +1,123 @@
+"""Paginação por cursor (keyset) sobre `(created_at, id)`.
+
+Em vez de `OFFSET` + `count()`, cada página filtra a partir da chave da última linha
+vista (`(created_at, id) < (:t, :id)`), então a página 1000 custa o mesmo que a
+primeira. Os cursores são opacos (base64 de um JSON curto) e carregam a direção:
+`next` avança, `prev` volta uma página.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+
+T = TypeVar("T")
+Q = TypeVar("Q")
+
+NEXT = "next"
+PREV = "prev"
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    created_at: datetime
+    id: int
+    direction: str = NEXT
+
+
+@dataclass(slots=True)
+class KeysetPage(Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def encode_cursor(created_at: datetime, id_: int, direction: str = NEXT) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "i": id_, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> Cursor | None:
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = data.get("d", NEXT)
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return Cursor(datetime.fromisoformat(data["t"]), int(data["i"]), direction)
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+
+
+def apply_keyset(
+    query: Q,
+    time_column: Any,
+    id_column: Any,
+    cursor: Cursor | None,
+    *,
+    limit: int,
+    descending: bool = True,
+) -> Q:
+    """Filtra/ordena `query` (Query legado ou Select 2.0) e busca `limit + 1` linhas."""
+
+    # voltar uma página = varrer no sentido oposto a partir do primeiro item visto
+    forward = cursor is None or cursor.direction == NEXT
+    scan_descending = descending if forward else not descending
+    key = tuple_(time_column, id_column)
+    if cursor is not None:
+        bound = tuple_(literal(cursor.created_at, time_column.type), literal(cursor.id, id_column.type))
+        query = query.where(key < bound if scan_descending else key > bound)  # type: ignore[attr-defined]
+    if scan_descending:
+        query = query.order_by(time_column.desc(), id_column.desc())  # type: ignore[attr-defined]
+    else:
+        query = query.order_by(time_column.asc(), id_column.asc())  # type: ignore[attr-defined]
+    return query.limit(limit + 1)  # type: ignore[attr-defined]
+
+
+def build_page(
+    rows: Sequence[T],
+    cursor: Cursor | None,
+    *,
+    limit: int,
+    key: Callable[[T], tuple[datetime, int]],
+) -> KeysetPage[T]:
+    """Monta a página a partir das `limit + 1` linhas buscadas por `apply_keyset`."""
+
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    forward = cursor is None or cursor.direction == NEXT
+    if not forward:
+        items.reverse()
+
+    if not items:
+        return KeysetPage(items=[], next_cursor=None, prev_cursor=None)
+
+    first, last = key(items[0]), key(items[-1])
+    if forward:
+        next_cursor = encode_cursor(*last, NEXT) if has_more else None
+        prev_cursor = encode_cursor(*first, PREV) if cursor is not None else None
+    else:
+        next_cursor = encode_cursor(*last, NEXT)
+        prev_cursor = encode_cursor(*first, PREV) if has_more else None
+    return KeysetPage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+__all__ = [
+    "Cursor",
+    "KeysetPage",
+    "NEXT",
+    "PREV",
+    "apply_keyset",
+    "build_page",
+    "decode_cursor",
+    "encode_cursor",
+]
@@ -2,12 +2,18 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from ...db import session_scope
 from ...models import UserAccount, UserRole
-from ...security.auth import create_access_token, create_refresh_token, decode_token, verify_password
-from ...security.dependencies import get_current_user
+from ...security.auth import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    verify_and_update_password,
+)
+from ...security.dependencies import get_current_principal
+from ...security.principal import Principal, principal_claims
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -31,10 +37,20 @@ async def login(payload: LoginRequest) -> TokenResponse:
     async with session_scope() as session:
         result = await session.execute(select(UserAccount).where(UserAccount.username == payload.username))
         user = result.scalar_one_or_none()
-        if user is None or not verify_password(payload.password, user.hashed_password):
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais incorretas")
-
-    token = create_access_token(payload.username, extra={"role": user.role})
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais incorretas")
+
+    # a verificação roda no pool de hash, sem segurar conexão do banco
+    valid, new_hash = await verify_and_update_password(payload.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais incorretas")
+    if new_hash is not None:
+        async with session_scope() as session:
+            await session.execute(
+                update(UserAccount).where(UserAccount.id == user.id).values(hashed_password=new_hash)
+            )
+
+    token = create_access_token(payload.username, extra=principal_claims(user))
     refresh = create_refresh_token(payload.username)
     return TokenResponse(access_token=token, refresh_token=refresh)
 
@@ -63,7 +79,7 @@ async def refresh_token(payload: RefreshRequest) -> TokenResponse:
         if user is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    access = create_access_token(username, extra={"role": user.role})
+    access = create_access_token(username, extra=principal_claims(user))
     refresh = create_refresh_token(username)
     return TokenResponse(access_token=access, refresh_token=refresh)
 
@@ -80,5 +96,5 @@ class MeResponse(BaseModel):
 
 
 @router.get("/me", response_model=MeResponse)
-async def me(user: UserAccount = Depends(get_current_user)) -> MeResponse:
+async def me(user: Principal = Depends(get_current_principal)) -> MeResponse:
     return MeResponse(username=user.username, role=user.role)
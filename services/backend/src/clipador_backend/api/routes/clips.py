@@ -2,10 +2,27 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
 
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from ...db import session_scope
 from ...dependencies import get_clip_repository
+from ...models import UserRole
 from ...repositories.clips import ClipRepository
+from ...security.dependencies import get_current_principal
+from ...security.principal import Principal
+from ...services.clip_export import (
+    CLIP_RECORD_FIELDS,
+    MEDIA_TYPES,
+    aencode_rows,
+    agzip_chunks,
+    clip_export_query,
+    export_headers,
+    stream_clip_rows,
+)
 
 router = APIRouter(prefix="/clips", tags=["clips"])
 
@@ -17,3 +34,37 @@ async def list_recent_bursts(
 ) -> dict[str, object]:
     bursts = await repo.recent_bursts(since_minutes=since_minutes)
     return {"data": bursts}
+
+
+@router.get("/export", summary="Exporta clipes em streaming (CSV, NDJSON ou JSON)")
+async def export_clips(
+    fmt: str = Query("csv", pattern="^(csv|ndjson|json)$"),
+    days: int = Query(30, ge=1, le=365),
+    streamer: str | None = Query(None, max_length=100),
+    gzip: bool = Query(False, description="Comprime a resposta com Content-Encoding: gzip"),
+    all_streamers: bool = Query(
+        False, description="Exporta os clipes de todos os streamers (somente admin)"
+    ),
+    user: Principal = Depends(get_current_principal),
+) -> StreamingResponse:
+    if all_streamers and user.role != UserRole.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Exportação global restrita a administradores",
+        )
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    stmt = clip_export_query(
+        user_id=None if all_streamers else user.id, since=since, streamer=streamer
+    )
+
+    async def body() -> AsyncIterator[bytes]:
+        # a sessão vive enquanto o corpo é transmitido, não só durante o handler
+        async with session_scope(readonly=True) as session:
+            rows = stream_clip_rows(session, stmt)
+            async for chunk in aencode_rows(rows, fmt, CLIP_RECORD_FIELDS):
+                yield chunk
+
+    content = agzip_chunks(body()) if gzip else body()
+    return StreamingResponse(
+        content, media_type=MEDIA_TYPES[fmt], headers=export_headers(fmt, gzip=gzip)
+    )
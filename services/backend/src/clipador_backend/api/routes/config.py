@@ -1,25 +1,48 @@
-"""User channel configuration endpoints."""
+"""User channel configuration endpoints.
+
+`/config/me` is built from a single joined query (`UserConfigRepository.load_snapshot`)
+and kept per user in a short-lived, per-process cache. Whoever changes a configuration
+(these routes, the trial sweep in the worker) calls `invalidate_configs` after the
+commit, which stamps the user in Redis; a cached snapshot built before that stamp is
+discarded on read, in every process. Streamer status changes made by the workers only
+show up once the entry expires (`config_cache_seconds`).
+"""
 
 from __future__ import annotations
 
 import json
+import time
+from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
 
+from ...cache import TTLCache
+from ..pagination import apply_keyset, build_page, decode_cursor
 from ...dependencies import (
     get_streamer_repository,
     get_user_config_repository,
 )
-from ...models import Streamer, UserAccount
+from ...models import ClipDelivery, Streamer
 from ...repositories.streamers import StreamerRepository
-from ...repositories.user_config import UserConfigRepository
-from ...security.dependencies import get_current_user
+from ...repositories.user_config import (
+    ConfigSnapshot,
+    UserConfigRepository,
+    config_changes,
+    invalidate_configs,
+)
+from ...security.dependencies import get_current_principal
+from ...security.principal import Principal
 from ...services.plan import base_slots, remaining_slots, resolve_total_slots
 
 router = APIRouter(prefix="/config", tags=["config"])
 
+# user_id -> (plan the slot counts were computed for, payload, epoch the load started)
+config_cache: TTLCache[int, tuple[str | None, "ConfigResponse", float]] = TTLCache(
+    maxsize=10_000, ttl=10.0
+)
+
 
 class StreamerStatusPayload(BaseModel):
     status: str | None = None
@@ -82,6 +105,10 @@ class StreamerAttach(BaseModel):
     label: str | None = Field(default=None, max_length=120)
 
 
+class StreamerSet(BaseModel):
+    streamers: list[StreamerAttach] = Field(default_factory=list, max_length=999)
+
+
 class StreamerReorder(BaseModel):
     streamer_ids: list[int] = Field(..., min_length=1)
 
@@ -97,6 +124,8 @@ class DeliveryRecordPayload(BaseModel):
 
 class DeliveryHistoryResponse(BaseModel):
     items: list[DeliveryRecordPayload]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 def _serialize_status(raw_status) -> StreamerStatusPayload | None:
@@ -109,23 +138,15 @@ def _serialize_status(raw_status) -> StreamerStatusPayload | None:
     )
 
 
-async def _config_payload(
-    user: UserAccount,
-    config_repo: UserConfigRepository,
-) -> ConfigResponse:
-    config = await config_repo.ensure_config(user.id)
-    attachments = await config_repo.list_user_streamers(user.id)
-    statuses = await config_repo.list_streamer_status(user.id)
-    status_map = {item.streamer_id: item for item in statuses}
-
+def _config_payload(user: Principal, snapshot: ConfigSnapshot) -> ConfigResponse:
+    config = snapshot.config
     base = base_slots(user.plan)
     total = resolve_total_slots(user, config)
-    used = len(attachments)
+    used = len(snapshot.streamers)
     remaining = remaining_slots(user, config, used)
 
     payload_streamers: list[UserStreamerPayload] = []
-    for mapping, streamer in attachments:
-        status_payload = _serialize_status(status_map.get(streamer.id))
+    for mapping, streamer, raw_status in snapshot.streamers:
         payload_streamers.append(
             UserStreamerPayload(
                 id=mapping.id,
@@ -137,7 +158,7 @@ async def _config_payload(
                 label=mapping.label,
                 monitor_interval_seconds=streamer.monitor_interval_seconds,
                 monitor_min_clips=streamer.monitor_min_clips,
-                status=status_payload,
+                status=_serialize_status(raw_status),
             )
         )
 
@@ -155,22 +176,50 @@ async def _config_payload(
         slots_total=total,
         slots_used=used,
         slots_remaining=remaining,
-        streamers=sorted(payload_streamers, key=lambda item: (item.order_index, item.display_name.lower())),
+        streamers=sorted(
+            payload_streamers, key=lambda item: (item.order_index, item.display_name.lower())
+        ),
     )
 
 
+async def _commit_and_reload(
+    user: Principal, config_repo: UserConfigRepository
+) -> ConfigResponse:
+    """Reload the snapshot after a write, commit, then invalidate it everywhere.
+
+    The payload is not cached here: the stamp written by `invalidate_configs` is newer
+    than this load, so the next read rebuilds it (once) in whichever process serves it.
+    """
+
+    payload = _config_payload(user, await config_repo.load_snapshot(user.id))
+    await config_repo.commit()
+    config_cache.invalidate(user.id)
+    await invalidate_configs([user.id])
+    return payload
+
+
 @router.get("/me", response_model=ConfigResponse)
 async def get_my_config(
-    user: UserAccount = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     config_repo: UserConfigRepository = Depends(get_user_config_repository),
 ) -> ConfigResponse:
-    return await _config_payload(user, config_repo)
+    changed_at = await config_changes.changed_at(user.id)
+    cached = config_cache.get(user.id)
+    if cached is not None:
+        plan, payload, loaded_at = cached
+        if plan == user.plan and (changed_at is None or loaded_at > changed_at):
+            return payload
+    # stamp taken before the query: a change committed during the load invalidates it
+    started = time.time()
+    payload = _config_payload(user, await config_repo.load_snapshot(user.id))
+    config_cache.set(user.id, (user.plan, payload, started))
+    return payload
 
 
 @router.put("/me", response_model=ConfigResponse)
 async def update_my_config(
     payload: ConfigUpdate,
-    user: UserAccount = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     config_repo: UserConfigRepository = Depends(get_user_config_repository),
 ) -> ConfigResponse:
     data: dict[str, Any] = {}
@@ -188,7 +237,42 @@ async def update_my_config(
             data["slots_configured"] = base
 
     await config_repo.update_config(user.id, **data)
-    return await _config_payload(user, config_repo)
+    return await _commit_and_reload(user, config_repo)
+
+
+def _apply_streamer_changes(existing: Streamer, payload: StreamerAttach) -> bool:
+    needs_update = False
+    if payload.display_name and payload.display_name != existing.display_name:
+        existing.display_name = payload.display_name
+        needs_update = True
+    if payload.avatar_url and payload.avatar_url != existing.avatar_url:
+        existing.avatar_url = payload.avatar_url
+        needs_update = True
+    interval = payload.monitor_interval_seconds
+    if interval and interval != existing.monitor_interval_seconds:
+        existing.monitor_interval_seconds = interval
+        needs_update = True
+    if payload.monitor_min_clips and payload.monitor_min_clips != existing.monitor_min_clips:
+        existing.monitor_min_clips = payload.monitor_min_clips
+        needs_update = True
+    if payload.api_mode and payload.api_mode != existing.api_mode:
+        existing.api_mode = payload.api_mode
+        needs_update = True
+    return needs_update
+
+
+def _new_streamer(payload: StreamerAttach) -> dict[str, Any]:
+    return {
+        "twitch_user_id": payload.twitch_user_id,
+        "display_name": payload.display_name or payload.twitch_user_id,
+        "avatar_url": payload.avatar_url,
+        "monitor_interval_seconds": payload.monitor_interval_seconds or 180,
+        "monitor_min_clips": payload.monitor_min_clips or 2,
+        "api_mode": payload.api_mode or "clipador_only",
+        "trial_expires_at": None,
+        "client_twitch_client_id": None,
+        "client_twitch_client_secret": None,
+    }
 
 
 async def _ensure_global_streamer(
@@ -197,50 +281,44 @@ async def _ensure_global_streamer(
 ) -> Streamer:
     existing = await streamer_repo.get_by_twitch_id(payload.twitch_user_id)
     if existing:
-        needs_update = False
-        if payload.display_name and payload.display_name != existing.display_name:
-            existing.display_name = payload.display_name
-            needs_update = True
-        if payload.avatar_url and payload.avatar_url != existing.avatar_url:
-            existing.avatar_url = payload.avatar_url
-            needs_update = True
-        if payload.monitor_interval_seconds and payload.monitor_interval_seconds != existing.monitor_interval_seconds:
-            existing.monitor_interval_seconds = payload.monitor_interval_seconds
-            needs_update = True
-        if payload.monitor_min_clips and payload.monitor_min_clips != existing.monitor_min_clips:
-            existing.monitor_min_clips = payload.monitor_min_clips
-            needs_update = True
-        if payload.api_mode and payload.api_mode != existing.api_mode:
-            existing.api_mode = payload.api_mode
-            needs_update = True
-        if needs_update:
+        if _apply_streamer_changes(existing, payload):
             await streamer_repo.touch(existing)
         return existing
 
-    return await streamer_repo.create_streamer(
-        twitch_user_id=payload.twitch_user_id,
-        display_name=payload.display_name or payload.twitch_user_id,
-        avatar_url=payload.avatar_url,
-        monitor_interval_seconds=payload.monitor_interval_seconds or 180,
-        monitor_min_clips=payload.monitor_min_clips or 2,
-        api_mode=payload.api_mode or "clipador_only",
-        trial_expires_at=None,
-        client_twitch_client_id=None,
-        client_twitch_client_secret=None,
-    )
+    return await streamer_repo.create_streamer(**_new_streamer(payload))
+
+
+async def _ensure_global_streamers(
+    payloads: list[StreamerAttach],
+    streamer_repo: StreamerRepository,
+) -> list[Streamer]:
+    """Resolve a lista inteira com um SELECT e, se preciso, um INSERT em lote."""
+
+    twitch_ids = [item.twitch_user_id for item in payloads]
+    existing = await streamer_repo.get_many_by_twitch_ids(twitch_ids)
+    now = datetime.now(timezone.utc)
+    missing: list[StreamerAttach] = []
+    for item in payloads:
+        streamer = existing.get(item.twitch_user_id)
+        if streamer is None:
+            missing.append(item)
+        elif _apply_streamer_changes(streamer, item):
+            streamer.updated_at = now
+    created = await streamer_repo.create_streamers([_new_streamer(item) for item in missing])
+    existing.update((streamer.twitch_user_id, streamer) for streamer in created)
+    return [existing[item.twitch_user_id] for item in payloads]
 
 
 @router.post("/me/streamers", response_model=ConfigResponse, status_code=status.HTTP_201_CREATED)
 async def attach_streamer_to_me(
     payload: StreamerAttach,
-    user: UserAccount = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     config_repo: UserConfigRepository = Depends(get_user_config_repository),
     streamer_repo: StreamerRepository = Depends(get_streamer_repository),
 ) -> ConfigResponse:
-    config = await config_repo.ensure_config(user.id)
-    max_slots = resolve_total_slots(user, config)
-    current = await config_repo.count_user_streamers(user.id)
-    if current >= max_slots:
+    snapshot = await config_repo.load_snapshot(user.id)
+    max_slots = resolve_total_slots(user, snapshot.config)
+    if len(snapshot.streamers) >= max_slots:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Limite de slots atingido para o seu plano.",
@@ -252,42 +330,94 @@ async def attach_streamer_to_me(
             user_id=user.id,
             streamer_id=streamer.id,
             label=payload.label,
+            order_index=max((mapping.order_index for mapping, _, _ in snapshot.streamers), default=0) + 1,
         )
     except ValueError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Streamer já configurado.")
 
-    return await _config_payload(user, config_repo)
+    return await _commit_and_reload(user, config_repo)
+
+
+@router.put("/me/streamers", response_model=ConfigResponse)
+async def replace_my_streamers(
+    payload: StreamerSet,
+    user: Principal = Depends(get_current_principal),
+    config_repo: UserConfigRepository = Depends(get_user_config_repository),
+    streamer_repo: StreamerRepository = Depends(get_streamer_repository),
+) -> ConfigResponse:
+    """Replace the whole attached set (in order) with set-based inserts, deletes and reorders."""
+
+    twitch_ids = [item.twitch_user_id for item in payload.streamers]
+    if len(set(twitch_ids)) != len(twitch_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Streamer repetido na lista."
+        )
+
+    snapshot = await config_repo.load_snapshot(user.id)
+    if len(twitch_ids) > resolve_total_slots(user, snapshot.config):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Limite de slots atingido para o seu plano.",
+        )
+
+    streamers = await _ensure_global_streamers(payload.streamers, streamer_repo)
+    await config_repo.replace_streamers(
+        user.id,
+        [
+            (streamer.id, item.label)
+            for streamer, item in zip(streamers, payload.streamers, strict=True)
+        ],
+        current={
+            streamer.id: (mapping.order_index, mapping.label)
+            for mapping, streamer, _ in snapshot.streamers
+        },
+    )
+    return await _commit_and_reload(user, config_repo)
 
 
 @router.delete("/me/streamers/{streamer_id}", response_model=ConfigResponse)
 async def detach_streamer_from_me(
     streamer_id: int,
-    user: UserAccount = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     config_repo: UserConfigRepository = Depends(get_user_config_repository),
 ) -> ConfigResponse:
     await config_repo.detach_streamer(user_id=user.id, streamer_id=streamer_id)
-    return await _config_payload(user, config_repo)
+    return await _commit_and_reload(user, config_repo)
 
 
 @router.post("/me/streamers/reorder", response_model=ConfigResponse)
 async def reorder_streamers(
     payload: StreamerReorder,
-    user: UserAccount = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     config_repo: UserConfigRepository = Depends(get_user_config_repository),
 ) -> ConfigResponse:
     await config_repo.set_streamer_order(user.id, payload.streamer_ids)
-    return await _config_payload(user, config_repo)
+    return await _commit_and_reload(user, config_repo)
 
 
 @router.get("/me/history", response_model=DeliveryHistoryResponse)
 async def get_delivery_history(
-    limit: int = 50,
-    user: UserAccount = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    user: Principal = Depends(get_current_principal),
     config_repo: UserConfigRepository = Depends(get_user_config_repository),
 ) -> DeliveryHistoryResponse:
-    rows = await config_repo.recent_deliveries_with_streamer(user.id, limit=limit)
+    """Entregas mais recentes primeiro, paginadas por cursor sobre `(delivered_at, id)`."""
+
+    position = decode_cursor(cursor)
+    stmt = apply_keyset(
+        config_repo.delivery_history_query(user.id),
+        ClipDelivery.delivered_at,
+        ClipDelivery.id,
+        position,
+        limit=limit,
+    )
+    rows = (await config_repo.session.execute(stmt)).all()
+    page = build_page(
+        rows, position, limit=limit, key=lambda row: (row[0].delivered_at, row[0].id)
+    )
     items: list[DeliveryRecordPayload] = []
-    for delivery, streamer in rows:
+    for delivery, streamer in page.items:
         extra = {}
         if delivery.extra_payload:
             try:
@@ -304,4 +434,6 @@ async def get_delivery_history(
                 clip_title=extra.get("clip_title"),
             )
         )
-    return DeliveryHistoryResponse(items=items)
+    return DeliveryHistoryResponse(
+        items=items, next_cursor=page.next_cursor, prev_cursor=page.prev_cursor
+    )
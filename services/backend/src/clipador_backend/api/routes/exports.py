@@ -0,0 +1,126 @@
+"""Exportações assíncronas: enfileira o job, consulta o status e baixa o arquivo."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db import get_db_session
+from ...models import ExportJob, ExportStatus, UserRole
+from ...security.dependencies import get_current_principal
+from ...security.principal import Principal
+from ...services.exports import CSV_GZ, MEDIA_TYPES, available_formats, new_job_id
+from ...tasks.exports import run_export_task
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+class ExportRequest(BaseModel):
+    fmt: str = Field(default=CSV_GZ, description="parquet | csv.gz")
+    days: int = Field(default=30, ge=1, le=365)
+    streamer: str | None = Field(default=None, max_length=100)
+    all_streamers: bool = Field(
+        default=False, description="Exporta os clipes de todos os streamers (somente admin)"
+    )
+
+
+class ExportJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    fmt: str
+    status: str
+    params: dict
+    rows_written: int
+    file_size: int | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+def enqueue_export(job_id: str) -> None:
+    run_export_task.delay(job_id)
+
+
+async def _get_job(session: AsyncSession, job_id: str, user: Principal) -> ExportJob:
+    job = await session.get(ExportJob, job_id)
+    if job is None or (job.user_id != user.id and user.role != UserRole.ADMIN.value):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Exportação não encontrada"
+        )
+    return job
+
+
+@router.post("", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export(
+    payload: ExportRequest,
+    user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> ExportJob:
+    if payload.fmt not in available_formats():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato indisponível; use um de {', '.join(available_formats())}",
+        )
+    if payload.all_streamers and user.role != UserRole.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Exportação global restrita a administradores",
+        )
+    job = ExportJob(
+        id=new_job_id(),
+        user_id=user.id,
+        fmt=payload.fmt,
+        params={
+            "days": payload.days,
+            "streamer": payload.streamer,
+            "all_streamers": payload.all_streamers,
+        },
+        status=ExportStatus.PENDING.value,
+        rows_written=0,
+    )
+    session.add(job)
+    # o worker precisa enxergar o job: commit antes de enfileirar
+    await session.commit()
+    enqueue_export(job.id)
+    return job
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+async def get_export(
+    job_id: str,
+    user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> ExportJob:
+    return await _get_job(session, job_id, user)
+
+
+@router.get("/{job_id}/download", summary="Baixa o arquivo (aceita Range para retomar)")
+async def download_export(
+    job_id: str,
+    user: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> FileResponse:
+    job = await _get_job(session, job_id, user)
+    if job.status == ExportStatus.EXPIRED.value:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE, detail="Arquivo de exportação expirou"
+        )
+    if job.status != ExportStatus.COMPLETED.value or not job.file_path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Exportação ainda não concluída"
+        )
+    path = Path(job.file_path)
+    if not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE, detail="Arquivo de exportação expirou"
+        )
+    # FileResponse responde `Range`/`If-Range` com 206 e anuncia `Accept-Ranges: bytes`
+    filename = f"clipes-{job.id}.{job.fmt}"
+    return FileResponse(path, media_type=MEDIA_TYPES[job.fmt], filename=filename)
@@ -4,8 +4,8 @@ from fastapi import APIRouter, Depends
 
 from clipador_core import minimo_clipes_por_viewers, resolve_monitoring_parameters
 
-from ...security.dependencies import get_current_user
-from ...models import UserAccount
+from ...security.dependencies import get_current_principal
+from ...security.principal import Principal
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
 
@@ -22,12 +22,12 @@ _PRESETS = {
 
 
 @router.get("/presets", summary="Presets disponíveis")
-def list_presets(_user: UserAccount = Depends(get_current_user)) -> dict[str, object]:
+def list_presets(_user: Principal = Depends(get_current_principal)) -> dict[str, object]:
     return {"data": _PRESETS}
 
 
 @router.post("/resolve", summary="Resolve intervalo e mínimo para um modo")
-def resolve_monitoring(body: dict[str, object], _user: UserAccount = Depends(get_current_user)) -> dict[str, object]:
+def resolve_monitoring(body: dict[str, object], _user: Principal = Depends(get_current_principal)) -> dict[str, object]:
     mode = body.get("modo", "PADRAO")
     intervalo, minimo = resolve_monitoring_parameters(
         mode,
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
 
 from ...dependencies import get_streamer_repository
@@ -40,8 +40,15 @@ class StreamerResponse(BaseModel):
     has_client_credentials: bool
 
 @router.get("", response_model=list[StreamerResponse])
-async def list_streamers(repo: StreamerRepository = Depends(get_streamer_repository)) -> list[StreamerResponse]:
-    streamers = await repo.list_streamers()
+async def list_streamers(
+    q: str | None = Query(None, min_length=1, max_length=100, description="Busca por nome ou id"),
+    limit: int = Query(20, ge=1, le=100),
+    repo: StreamerRepository = Depends(get_streamer_repository),
+) -> list[StreamerResponse]:
+    if q:
+        streamers = await repo.search(q, limit=limit)
+    else:
+        streamers = await repo.list_streamers(limit=limit)
     return [
         StreamerResponse(
             id=streamer.id,
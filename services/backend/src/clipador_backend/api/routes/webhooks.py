@@ -5,9 +5,10 @@ from __future__ import annotations
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...security.dependencies import get_current_user
-from ...services import billing
+from ...db import get_db_session
+from ...services.webhook_inbox import KIRVANO, accept_webhook, kirvano_idempotency_key
 from ...settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,11 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
 @router.post("/kirvano")
-async def kirvano_webhook(request: Request) -> dict[str, str]:
+async def kirvano_webhook(
+    request: Request, session: AsyncSession = Depends(get_db_session)
+) -> dict[str, str]:
+    """Grava o evento na caixa de entrada e responde na hora; o worker aplica depois."""
+
     settings = get_settings()
     token = request.headers.get("Security-Token")
     if not settings.kirvano_token or token != settings.kirvano_token:
@@ -24,35 +29,15 @@ async def kirvano_webhook(request: Request) -> dict[str, str]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token")
 
     payload = await request.json()
-    event_type = payload.get("event")
-    email = payload.get("customer", {}).get("email")
-    status_value = payload.get("status")
-
-    if not email:
-        logger.warning("kirvano_missing_email", extra={"payload": payload})
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email missing")
-
-    logger.info("kirvano_event", extra={"event": event_type, "email": email})
-
-    if event_type in {
-        "subscription.canceled",
-        "subscription.expired",
-        "purchase.refunded",
-        "purchase.chargeback",
-        "subscription.late",
-    }:
-        await billing.mark_subscription_ended(email, status_value or "canceled")
-    elif event_type == "subscription.renewed":
-        plan = payload.get("plan", {}).get("name", "")
-        await billing.mark_subscription_renewed(email, plan)
-    elif event_type == "SALE_APPROVED":
-        sale_id = payload.get("sale_id")
-        if not sale_id:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="sale_id missing")
-        product = (payload.get("products") or [{}])[0]
-        plan = product.get("offer_name") or payload.get("plan", {}).get("name", "")
-        await billing.register_purchase(email, plan, status_value or "approved", sale_id, payload)
-    else:
-        logger.info("kirvano_event_unhandled", extra={"event": event_type})
+    try:
+        key = kirvano_idempotency_key(payload)
+    except ValueError as exc:
+        logger.warning("kirvano_invalid_payload", extra={"payload": payload})
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if not await accept_webhook(session, KIRVANO, key, payload):
+        logger.info("kirvano_event_duplicate", extra={"key": key})
+        return {"status": "duplicate"}
 
+    logger.info("kirvano_event_queued", extra={"event": payload.get("event"), "key": key})
     return {"status": "success"}
@@ -7,12 +7,21 @@ import os
 from celery import Celery
 
 REDIS_URL = os.environ.get("CLIPADOR_REDIS_URL", "redis://localhost:6379/0")
+# O beat só verifica quem venceu; o intervalo real de cada streamer é adaptativo (services/polling.py).
+INGESTION_TICK_SECONDS = float(os.environ.get("CLIPADOR_INGESTION_TICK_SECONDS", "30"))
+# Intervalo entre drenagens da caixa de entrada de webhooks (services/webhook_inbox.py).
+WEBHOOK_DRAIN_SECONDS = float(os.environ.get("CLIPADOR_WEBHOOK_DRAIN_SECONDS", "5"))
 
 celery_app = Celery(
     "clipador",
     broker=REDIS_URL,
     backend=REDIS_URL,
-    include=["clipador_backend.tasks.ingestion"],
+    include=[
+        "clipador_backend.tasks.ingestion",
+        "clipador_backend.tasks.maintenance",
+        "clipador_backend.tasks.exports",
+        "clipador_backend.tasks.webhooks",
+    ],
 )
 
 celery_app.conf.update(
@@ -23,7 +32,34 @@ celery_app.conf.update(
     beat_schedule={
         "sync-clips": {
             "task": "clipador.ingestion.sync",
-            "schedule": 180.0,
-        }
+            "schedule": INGESTION_TICK_SECONDS,
+            # Ticks que ficarem presos na fila expiram em vez de se acumular.
+            "options": {"expires": INGESTION_TICK_SECONDS},
+        },
+        "drain-webhooks": {
+            "task": "clipador.webhooks.drain",
+            "schedule": WEBHOOK_DRAIN_SECONDS,
+            "options": {"expires": WEBHOOK_DRAIN_SECONDS},
+        },
+        "maintain-partitions": {
+            "task": "clipador.maintenance.partitions",
+            "schedule": 6 * 3600.0,
+        },
+        "retention-cleanup": {
+            "task": "clipador.maintenance.retention",
+            "schedule": 24 * 3600.0,
+        },
+        "revoke-expired-trials": {
+            "task": "clipador.maintenance.revoke_trials",
+            "schedule": 24 * 3600.0,
+        },
+        "sweep-exports": {
+            "task": "clipador.exports.sweep",
+            "schedule": 3600.0,
+        },
+        "plan-expiry-reminders": {
+            "task": "clipador.maintenance.expiry_reminders",
+            "schedule": 24 * 3600.0,
+        },
     },
 )
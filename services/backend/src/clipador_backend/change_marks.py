@@ -0,0 +1,79 @@
+"""Marcas de alteração por chave, compartilhadas entre processos pelo Redis.
+
+Os caches em processo (`cache.TTLCache`) não enxergam escritas feitas em outro
+processo: o worker Celery que troca o plano de um usuário, outro worker do uvicorn
+que altera a configuração. Quem altera o dado chama `touch`, que grava no Redis o
+horário (epoch) da alteração; quem lê compara esse horário com o de quando montou a
+sua cópia e a descarta se ela for mais antiga.
+
+Se o Redis estiver indisponível, `changed_at` responde "alterado agora": as cópias em
+cache deixam de valer e a leitura volta à origem, em vez de servir dado possivelmente
+velho.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from .metrics import metrics
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeMarks:
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl_seconds: Callable[[], float],
+        redis: Callable[[], Any] = get_redis,
+    ):
+        self.namespace = namespace
+        # a marca precisa sobreviver a qualquer cópia que ela invalida
+        self._ttl_seconds = ttl_seconds
+        self._redis = redis
+
+    def _key(self, key: object) -> str:
+        return f"clipador:changed:{self.namespace}:{key}"
+
+    async def touch(self, keys: Iterable[object]) -> None:
+        """Marca `keys` como alteradas agora; falhas do Redis são registradas e engolidas."""
+
+        keys = list(keys)
+        if not keys:
+            return
+        now = time.time()
+        ttl = max(1, int(self._ttl_seconds()))
+        try:
+            pipe = self._redis().pipeline(transaction=False)
+            for key in keys:
+                pipe.set(self._key(key), repr(now), ex=ttl)
+            await pipe.execute()
+        except RedisError as exc:
+            metrics.incr("change_marks_unavailable", namespace=self.namespace, op="touch")
+            logger.warning(
+                "change_marks_touch_failed",
+                extra={"namespace": self.namespace, "keys": len(keys), "error": str(exc)},
+            )
+
+    async def changed_at(self, key: object) -> float | None:
+        """Epoch da última alteração de `key`, ou `None` se não houve nenhuma recente."""
+
+        try:
+            raw = await self._redis().get(self._key(key))
+        except RedisError as exc:
+            metrics.incr("change_marks_unavailable", namespace=self.namespace, op="get")
+            logger.warning(
+                "change_marks_get_failed", extra={"namespace": self.namespace, "error": str(exc)}
+            )
+            return time.time()
+        return float(raw) if raw is not None else None
+
+
+__all__ = ["ChangeMarks"]
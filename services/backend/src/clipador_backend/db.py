@@ -2,28 +2,137 @@
 
 from __future__ import annotations
 
+import logging
+import time
 from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
 
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from .settings import get_settings
+from .settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
 
 _ENGINE: AsyncEngine | None = None
 _SESSION_FACTORY: async_sessionmaker[AsyncSession] | None = None
+# Engine de leitura (réplica). Sem réplica configurada aponta para o próprio writer.
+_READ_ENGINE: AsyncEngine | None = None
+_READ_SESSION_FACTORY: async_sessionmaker[AsyncSession] | None = None
+_LAG_MONITOR: ReplicaLagMonitor | None = None
+
+# Atraso de replay em segundos; 0 quando a réplica já aplicou todo o WAL recebido (ou é um primário).
+_REPLICA_LAG_SQL = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+
+
+def _normalize_url(database_url: str) -> str:
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return database_url
+
+
+def engine_options(database_url: str, settings: Settings) -> tuple[str, dict[str, Any]]:
+    """URL final e argumentos de `create_async_engine` para o perfil configurado."""
+
+    database_url = _normalize_url(database_url)
+    url = make_url(database_url)
+    options: dict[str, Any] = {"echo": settings.db_echo}
+    if url.get_backend_name() == "sqlite":
+        # SQLite (dev/testes) usa o pool padrão do dialeto; parâmetros de pool não se aplicam.
+        return database_url, options
+
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if url.get_driver_name() == "asyncpg":
+        # cache do asyncpg (por conexão) e o cache de prepared statements do dialeto
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+        )
+        connect_args: dict[str, Any] = {"statement_cache_size": settings.db_statement_cache_size}
+        if settings.db_statement_timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        options["connect_args"] = connect_args
+    return url.render_as_string(hide_password=False), options
+
+
+async def measure_replica_lag(engine: AsyncEngine) -> float:
+    """Atraso de replicação da réplica em segundos (0 em dialetos sem replicação)."""
+
+    query = _REPLICA_LAG_SQL.get(engine.dialect.name)
+    if query is None:
+        return 0.0
+    async with engine.connect() as conn:
+        lag = (await conn.execute(text(query))).scalar()
+    return float(lag or 0.0)
+
+
+class ReplicaLagMonitor:
+    """Decide se leituras podem ir para a réplica, consultando o atraso no máximo a cada `check_interval`."""
+
+    def __init__(self, engine: AsyncEngine, *, max_lag_seconds: float, check_interval: float):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._usable = True
+        self._checked_at: float | None = None
+
+    async def replica_usable(self) -> bool:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._usable
+
+        self._checked_at = now
+        try:
+            lag = await measure_replica_lag(self.engine)
+        except Exception as exc:
+            logger.warning("replica_probe_failed", extra={"error": str(exc)})
+            self._usable = False
+            return False
+
+        usable = lag <= self.max_lag_seconds
+        if usable != self._usable:
+            logger.warning("replica_routing_changed", extra={"lag_seconds": lag, "usable": usable})
+        self._usable = usable
+        return usable
+
+
+def _create_engine(database_url: str, settings: Settings) -> AsyncEngine:
+    url, options = engine_options(database_url, settings)
+    return create_async_engine(url, **options)
 
 
 def _ensure_engine() -> AsyncEngine:
-    global _ENGINE, _SESSION_FACTORY
+    global _ENGINE, _SESSION_FACTORY, _READ_ENGINE, _READ_SESSION_FACTORY, _LAG_MONITOR
     if _ENGINE is not None and _SESSION_FACTORY is not None:
         return _ENGINE
 
     settings = get_settings()
-    database_url = settings.database_url
-    if database_url.startswith("postgresql://"):
-        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-
-    _ENGINE = create_async_engine(database_url, echo=settings.app_env == "development")
+    _ENGINE = _create_engine(settings.database_url, settings)
     _SESSION_FACTORY = async_sessionmaker(_ENGINE, expire_on_commit=False)
+
+    if settings.database_replica_url:
+        _READ_ENGINE = _create_engine(settings.database_replica_url, settings)
+        _READ_SESSION_FACTORY = async_sessionmaker(_READ_ENGINE, expire_on_commit=False)
+        _LAG_MONITOR = ReplicaLagMonitor(
+            _READ_ENGINE,
+            max_lag_seconds=settings.replica_max_lag_seconds,
+            check_interval=settings.replica_lag_check_seconds,
+        )
+    else:
+        _READ_ENGINE = _ENGINE
+        _READ_SESSION_FACTORY = _SESSION_FACTORY
+        _LAG_MONITOR = None
     return _ENGINE
 
 
@@ -31,19 +140,74 @@ def get_engine() -> AsyncEngine:
     return _ensure_engine()
 
 
-def get_session_factory() -> async_sessionmaker[AsyncSession]:
+def get_read_engine() -> AsyncEngine:
+    _ensure_engine()
+    assert _READ_ENGINE is not None
+    return _READ_ENGINE
+
+
+def get_session_factory(*, readonly: bool = False) -> async_sessionmaker[AsyncSession]:
     _ensure_engine()
-    assert _SESSION_FACTORY is not None
-    return _SESSION_FACTORY
+    factory = _READ_SESSION_FACTORY if readonly else _SESSION_FACTORY
+    assert factory is not None
+    return factory
+
+
+async def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Fábrica da réplica, ou do primário se a réplica estiver atrasada/indisponível."""
+
+    _ensure_engine()
+    if _LAG_MONITOR is not None and not await _LAG_MONITOR.replica_usable():
+        return get_session_factory()
+    return get_session_factory(readonly=True)
+
+
+def reset_engine() -> None:
+    """Esquece o engine atual sem fechar conexões (ex.: após fork do worker)."""
+
+    global _ENGINE, _SESSION_FACTORY, _READ_ENGINE, _READ_SESSION_FACTORY, _LAG_MONITOR
+    _ENGINE = None
+    _SESSION_FACTORY = None
+    _READ_ENGINE = None
+    _READ_SESSION_FACTORY = None
+    _LAG_MONITOR = None
+
+
+async def dispose_engine() -> None:
+    """Fecha o pool de conexões dos engines atuais, se houver."""
+
+    engines = {engine for engine in (_ENGINE, _READ_ENGINE) if engine is not None}
+    reset_engine()
+    for engine in engines:
+        await engine.dispose()
 
 
 @asynccontextmanager
-async def session_scope():
-    session_factory = get_session_factory()
+async def session_scope(*, readonly: bool = False):
+    """Sessão transacional; com `readonly=True` usa a réplica (se em dia) e nunca faz commit."""
+
+    session_factory = await get_read_session_factory() if readonly else get_session_factory()
     async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if readonly:
+                await session.rollback()
+            else:
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependência FastAPI: uma sessão por requisição, compartilhada entre dependências."""
+
+    async with session_scope() as session:
+        yield session
+
+
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependência FastAPI somente leitura, roteada para a réplica quando configurada."""
+
+    async with session_scope(readonly=True) as session:
+        yield session
@@ -3,10 +3,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.routes import auth, clips, monitoring, streamers, public, webhooks, config
+from .api.routes import auth, clips, monitoring, streamers, public, webhooks, config, exports
 from .db import get_engine
+from .redis_client import close_redis
 from .models import Base
 from .celery_app import celery_app
+from .security.principal import clear_principal_cache, principal_cache
+from .services.webhook_inbox import seen_keys
 
 
 def create_app() -> FastAPI:
@@ -15,6 +18,11 @@ def create_app() -> FastAPI:
     from .settings import get_settings
 
     settings = get_settings()
+    clear_principal_cache()
+    principal_cache.ttl = settings.principal_cache_seconds
+    config.config_cache.clear()
+    config.config_cache.ttl = settings.config_cache_seconds
+    seen_keys.clear()
 
     app.add_middleware(
         CORSMiddleware,
@@ -34,6 +42,10 @@ def create_app() -> FastAPI:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+    @app.on_event("shutdown")
+    async def shutdown():
+        await close_redis()
+
     app.include_router(auth.router)
     app.include_router(clips.router)
     app.include_router(monitoring.router)
@@ -41,6 +53,7 @@ def create_app() -> FastAPI:
     app.include_router(public.router)
     app.include_router(webhooks.router)
     app.include_router(config.router)
+    app.include_router(exports.router)
 
     @app.get("/health/worker", tags=["support"], summary="Verifica saúde do worker Celery")
     async def worker_health() -> dict[str, object]:
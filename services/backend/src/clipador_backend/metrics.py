@@ -0,0 +1,105 @@
+"""Métricas leves em processo, emitidas também como logs estruturados.
+
+Sem dependência de um backend de métricas: cada ponto gera um log `metric` com
+nome, valor e tags (coletável pelo agregador de logs) e fica acumulado em memória
+para inspeção/testes via `snapshot()`. Observações guardam só agregados (contagem,
+soma, mínimo, máximo) e as últimas `RECENT_SAMPLES` amostras, então workers de longa
+duração não crescem sem limite.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Any
+
+logger = logging.getLogger("clipador.metrics")
+
+Tags = tuple[tuple[str, str], ...]
+
+RECENT_SAMPLES = 256
+
+
+def _key(name: str, tags: dict[str, Any]) -> tuple[str, Tags]:
+    return name, tuple(sorted((key, str(value)) for key, value in tags.items()))
+
+
+class _Summary:
+    __slots__ = ("count", "total", "minimum", "maximum", "recent")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.recent.append(value)
+
+    def as_dict(self) -> dict[str, float]:
+        return {"count": self.count, "sum": self.total, "min": self.minimum, "max": self.maximum}
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Tags], float] = defaultdict(float)
+        self._observations: dict[tuple[str, Tags], _Summary] = defaultdict(_Summary)
+
+    def incr(self, name: str, value: float = 1, **tags: Any) -> None:
+        with self._lock:
+            self._counters[_key(name, tags)] += value
+        logger.info(
+            "metric", extra={"metric": name, "kind": "counter", "value": value, "tags": tags}
+        )
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        with self._lock:
+            self._observations[_key(name, tags)].add(value)
+        logger.info(
+            "metric", extra={"metric": name, "kind": "observation", "value": value, "tags": tags}
+        )
+
+    def counter(self, name: str, **tags: Any) -> float:
+        with self._lock:
+            return self._counters.get(_key(name, tags), 0)
+
+    def observations(self, name: str, **tags: Any) -> list[float]:
+        """Últimas `RECENT_SAMPLES` amostras, da mais antiga para a mais recente."""
+
+        with self._lock:
+            summary = self._observations.get(_key(name, tags))
+            return list(summary.recent) if summary is not None else []
+
+    def summary(self, name: str, **tags: Any) -> dict[str, float] | None:
+        with self._lock:
+            summary = self._observations.get(_key(name, tags))
+            return summary.as_dict() if summary is not None else None
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": {
+                    f"{name}{dict(tags)}": value for (name, tags), value in self._counters.items()
+                },
+                "observations": {
+                    f"{name}{dict(tags)}": summary.as_dict()
+                    for (name, tags), summary in self._observations.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+
+metrics = Metrics()
+
+__all__ = ["Metrics", "metrics"]
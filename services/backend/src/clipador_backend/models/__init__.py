@@ -7,6 +7,9 @@ from .user import UserAccount, UserRole
 from .burst import BurstRecord, BurstClip
 from .purchase import PurchaseRecord
 from .channel import UserChannelConfig, UserStreamer, ClipDelivery, StreamerStatus
+from .maintenance import RetentionProgress
+from .export import ExportJob, ExportStatus
+from .webhook import WebhookEvent, WebhookStatus
 
 __all__ = [
     "Base",
@@ -21,4 +24,9 @@ __all__ = [
     "UserStreamer",
     "ClipDelivery",
     "StreamerStatus",
+    "RetentionProgress",
+    "ExportJob",
+    "ExportStatus",
+    "WebhookEvent",
+    "WebhookStatus",
 ]
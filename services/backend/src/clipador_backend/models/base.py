@@ -1,7 +1,16 @@
 """Modelos base do SQLAlchemy."""
 
+from sqlalchemy import DDL, event
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+# Os índices trigram (busca por substring) dependem da extensão no Postgres.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
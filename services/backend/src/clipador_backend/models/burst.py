@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -12,6 +12,10 @@ from .base import Base
 
 class BurstRecord(Base):
     __tablename__ = "bursts"
+    __table_args__ = (
+        Index("ix_bursts_start_time", "start_time"),
+        Index("ix_bursts_streamer_start_time", "streamer_id", "start_time"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     streamer_id: Mapped[int] = mapped_column(Integer, ForeignKey("streamers.id", ondelete="CASCADE"), nullable=False)
@@ -28,13 +32,22 @@ class BurstClip(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     burst_id: Mapped[int] = mapped_column(Integer, ForeignKey("bursts.id", ondelete="CASCADE"), nullable=False)
-    clip_id: Mapped[int] = mapped_column(Integer, ForeignKey("clips.id", ondelete="CASCADE"), nullable=False)
+    # sem FK: `clips` é particionada e `clips.id` não é único isoladamente (migração 0005)
+    clip_id: Mapped[int] = mapped_column(Integer, nullable=False)
     clip_external_id: Mapped[str] = mapped_column(String(64), nullable=False)
 
     burst = relationship("BurstRecord", back_populates="clips")
-    clip = relationship("ClipRecord", back_populates="burst_links")
-
-    __table_args__ = (UniqueConstraint("burst_id", "clip_external_id", name="uq_burst_clip"),)
+    clip = relationship(
+        "ClipRecord",
+        primaryjoin="foreign(BurstClip.clip_id) == ClipRecord.id",
+        back_populates="burst_links",
+    )
+
+    __table_args__ = (
+        UniqueConstraint("burst_id", "clip_external_id", name="uq_burst_clip"),
+        # cobre a busca de bursts por clipe já vinculado sem visitar a tabela
+        Index("ix_burst_clips_clip_external_id", "clip_external_id", postgresql_include=["burst_id"]),
+    )
 
 
 __all__ = ["BurstRecord", "BurstClip"]
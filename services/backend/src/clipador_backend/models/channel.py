@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -46,6 +46,7 @@ class UserStreamer(Base):
     __tablename__ = "user_streamers"
     __table_args__ = (
         UniqueConstraint("user_id", "streamer_id", name="uq_user_streamer"),
+        Index("ix_user_streamers_streamer_id", "streamer_id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -57,6 +58,8 @@ class UserStreamer(Base):
 
 
 class ClipDelivery(Base):
+    # No Postgres é particionada por mês em `burst_start` (migração 0005), com PK
+    # `(id, burst_start)`; o mapeamento mantém só `id` pelo mesmo motivo de `ClipRecord`.
     __tablename__ = "clip_deliveries"
     __table_args__ = (
         UniqueConstraint(
@@ -67,13 +70,15 @@ class ClipDelivery(Base):
             "clip_external_id",
             name="uq_clip_delivery_window",
         ),
+        Index("ix_clip_deliveries_user_delivered_at", "user_id", "delivered_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     streamer_id: Mapped[int] = mapped_column(ForeignKey("streamers.id", ondelete="CASCADE"), nullable=False)
     burst_id: Mapped[int | None] = mapped_column(ForeignKey("bursts.id", ondelete="SET NULL"), nullable=True)
-    clip_id: Mapped[int | None] = mapped_column(ForeignKey("clips.id", ondelete="SET NULL"), nullable=True)
+    # sem FK: `clips` é particionada e `clips.id` não é único isoladamente (migração 0005)
+    clip_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     clip_external_id: Mapped[str | None] = mapped_column(String(120), nullable=True)
     burst_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     burst_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -86,6 +91,7 @@ class StreamerStatus(Base):
     __tablename__ = "streamer_status"
     __table_args__ = (
         UniqueConstraint("user_id", "streamer_id", name="uq_streamer_status_user"),
+        Index("ix_streamer_status_user_updated_at", "user_id", "updated_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -4,17 +4,32 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
 
 
 class ClipRecord(Base):
+    """Clipe coletado da Helix.
+
+    No Postgres a tabela é particionada por mês em `created_at` (migração 0005): toda
+    constraint única precisa conter a chave de partição, por isso `clip_id` só é único
+    junto com `created_at` e nenhuma FK aponta para `clips.id`. A PK lá é
+    `(id, created_at)`; o mapeamento mantém só `id`, que vem da sequence e continua
+    único, para o SQLite (dev/testes) seguir gerando o autoincremento.
+    """
+
     __tablename__ = "clips"
+    __table_args__ = (
+        UniqueConstraint("clip_id", "created_at", name="uq_clips_clip_id_created_at"),
+        Index("ix_clips_created_at", "created_at"),
+        Index("ix_clips_streamer_created_at", "streamer_id", "created_at"),
+        Index("ix_clips_clip_id", "clip_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    clip_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    clip_id: Mapped[str] = mapped_column(String(64), nullable=False)
     streamer_id: Mapped[int] = mapped_column(Integer, ForeignKey("streamers.id", ondelete="CASCADE"), nullable=False)
     streamer_name: Mapped[str] = mapped_column(String(256), nullable=False)
     streamer_external_id: Mapped[str] = mapped_column(String(128), nullable=False)
@@ -25,7 +40,12 @@ class ClipRecord(Base):
     duration: Mapped[int | None] = mapped_column(Integer)
     fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     broadcaster_level: Mapped[int | None] = mapped_column(Integer)
-    burst_links = relationship("BurstClip", back_populates="clip", cascade="all, delete-orphan")
+    burst_links = relationship(
+        "BurstClip",
+        primaryjoin="ClipRecord.id == foreign(BurstClip.clip_id)",
+        back_populates="clip",
+        cascade="all, delete-orphan",
+    )
 
     def to_domain(self) -> dict[str, object]:
         return {
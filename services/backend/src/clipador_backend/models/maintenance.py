@@ -0,0 +1,30 @@
+"""Estado persistido dos jobs de manutenção."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RetentionProgress(Base):
+    """Checkpoint da limpeza por tabela, permitindo retomar um ciclo interrompido."""
+
+    __tablename__ = "retention_progress"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_pk: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cutoff: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    rows_deleted: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    runs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+__all__ = ["RetentionProgress"]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -12,6 +12,28 @@ from .base import Base
 
 class Streamer(Base):
     __tablename__ = "streamers"
+    __table_args__ = (
+        # parcial: só os ativos entram no índice consultado a cada tick da ingestão
+        Index(
+            "ix_streamers_active_id",
+            "id",
+            postgresql_where=text("is_active = true"),
+            sqlite_where=text("is_active = true"),
+        ),
+        # busca por substring (`ILIKE '%termo%'`) via pg_trgm; ver repositories/search.py
+        Index(
+            "ix_streamers_display_name_trgm",
+            "display_name",
+            postgresql_using="gin",
+            postgresql_ops={"display_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_streamers_twitch_user_id_trgm",
+            "twitch_user_id",
+            postgresql_using="gin",
+            postgresql_ops={"twitch_user_id": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     twitch_user_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -18,6 +18,21 @@ class UserRole(str, Enum):
 
 class UserAccount(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # busca por substring (`ILIKE '%termo%'`) via pg_trgm; ver repositories/search.py
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
@@ -38,4 +53,9 @@ class UserAccount(Base):
     )
 
 
+# `func.lower(UserAccount.email) == ...` nos webhooks de cobrança (services/billing.py)
+Index("ix_users_email_lower", func.lower(UserAccount.email))
+
+
 __all__ = ["UserAccount", "UserRole"]
+
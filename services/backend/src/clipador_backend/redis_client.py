@@ -0,0 +1,38 @@
+"""Cliente Redis async compartilhado pelo processo (API ou worker).
+
+Criado sob demanda a partir de `redis_url`. As conexões do cliente ficam presas ao
+event loop em que foram abertas, então cada processo deve usá-lo a partir de um loop
+só: o do uvicorn na API, o do `WorkerRuntime` no worker.
+"""
+
+from __future__ import annotations
+
+from redis import asyncio as redis_asyncio
+
+from .settings import get_settings
+
+_CLIENT: redis_asyncio.Redis | None = None
+
+
+def get_redis() -> redis_asyncio.Redis:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = redis_asyncio.from_url(get_settings().redis_url)
+    return _CLIENT
+
+
+def reset_redis() -> None:
+    """Esquece o cliente atual sem fechá-lo (ex.: após fork do worker)."""
+
+    global _CLIENT
+    _CLIENT = None
+
+
+async def close_redis() -> None:
+    global _CLIENT
+    client, _CLIENT = _CLIENT, None
+    if client is not None:
+        await client.aclose()
+
+
+__all__ = ["close_redis", "get_redis", "reset_redis"]
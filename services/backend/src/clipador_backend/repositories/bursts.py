@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from clipador_core import ClipGroup
 
-from ..models import BurstClip, BurstRecord
+from ..models import BurstClip, BurstRecord, Streamer
+
+
+@dataclass(slots=True)
+class BurstUpsert:
+    """Resultado de `upsert_from_group`: o burst persistido e os clipes recém-vinculados."""
+
+    burst: BurstRecord
+    created: bool
+    new_clip_external_ids: set[str] = field(default_factory=set)
 
 
 class BurstRepository:
@@ -26,40 +37,107 @@ class BurstRepository:
         )
         return result.scalar_one_or_none()
 
-    async def create_from_group(
+    async def find_matching(
+        self,
+        streamer_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        clip_external_ids: list[str],
+    ) -> BurstRecord | None:
+        """Burst do streamer que já contém algum dos clipes ou cuja janela se sobrepõe à informada."""
+
+        shares_clip = BurstRecord.id.in_(
+            select(BurstClip.burst_id).where(BurstClip.clip_external_id.in_(clip_external_ids))
+        )
+        overlaps = and_(BurstRecord.start_time <= end_time, BurstRecord.end_time >= start_time)
+        result = await self.session.execute(
+            select(BurstRecord)
+            .where(BurstRecord.streamer_id == streamer_id, or_(shares_clip, overlaps))
+            .order_by(BurstRecord.start_time, BurstRecord.id)
+            .limit(1)
+            .with_for_update()
+        )
+        return result.scalar_one_or_none()
+
+    async def upsert_from_group(
         self,
         streamer_id: int,
         group: ClipGroup,
         clip_ids: list[int],
         clip_external_ids: list[str],
-    ) -> BurstRecord:
-        existing = await self.find_by_time(streamer_id, group.start, group.end)
-        if existing:
-            return existing
-
-        burst = BurstRecord(
-            streamer_id=streamer_id,
-            start_time=group.start,
-            end_time=group.end,
-            clip_count=len(clip_ids),
-        )
-        self.session.add(burst)
-        await self.session.flush()
+    ) -> BurstUpsert:
+        """Cria o burst do grupo ou estende o existente, vinculando só os clipes novos.
 
-        for clip_db_id, clip_external_id in zip(clip_ids, clip_external_ids):
-            self.session.add(
-                BurstClip(
-                    burst_id=burst.id,
-                    clip_id=clip_db_id,
-                    clip_external_id=clip_external_id,
-                )
+        A chave natural é (streamer, clipes/janela): um burst que cresceu entre ciclos
+        atualiza a própria linha em vez de gerar um burst quase duplicado. Como a
+        sobreposição de janelas não cabe numa constraint única, a linha do streamer é
+        travada (`FOR UPDATE`) antes da busca: ciclos concorrentes do mesmo streamer
+        passam um de cada vez e o segundo já enxerga o burst criado pelo primeiro.
+        """
+
+        await self.session.execute(
+            select(Streamer.id).where(Streamer.id == streamer_id).with_for_update()
+        )
+        burst = await self.find_matching(streamer_id, group.start, group.end, clip_external_ids)
+        created = burst is None
+        if burst is None:
+            burst = BurstRecord(
+                streamer_id=streamer_id,
+                start_time=group.start,
+                end_time=group.end,
+                clip_count=0,
             )
+            self.session.add(burst)
+            await self.session.flush()
+            linked: set[str] = set()
+        else:
+            result = await self.session.execute(
+                select(BurstClip.clip_external_id).where(BurstClip.burst_id == burst.id)
+            )
+            linked = set(result.scalars().all())
+            burst.start_time = min(burst.start_time, group.start, key=_as_comparable)
+            burst.end_time = max(burst.end_time, group.end, key=_as_comparable)
 
+        new_links = [
+            {"burst_id": burst.id, "clip_id": clip_db_id, "clip_external_id": clip_external_id}
+            for clip_db_id, clip_external_id in zip(clip_ids, clip_external_ids)
+            if clip_external_id not in linked
+        ]
+        inserted: set[str] = set()
+        if new_links:
+            # uq_burst_clip descarta vínculos já gravados; RETURNING traz só os inseridos
+            dialect = postgresql if self.session.get_bind().dialect.name == "postgresql" else sqlite
+            result = await self.session.execute(
+                dialect.insert(BurstClip)
+                .values(new_links)
+                .on_conflict_do_nothing(index_elements=["burst_id", "clip_external_id"])
+                .returning(BurstClip.clip_external_id)
+            )
+            inserted = set(result.scalars().all())
+        burst.clip_count = len(linked) + len(inserted)
         await self.session.flush()
-        return burst
+        return BurstUpsert(burst=burst, created=created, new_clip_external_ids=inserted)
+
+    async def create_from_group(
+        self,
+        streamer_id: int,
+        group: ClipGroup,
+        clip_ids: list[int],
+        clip_external_ids: list[str],
+    ) -> BurstRecord:
+        result = await self.upsert_from_group(streamer_id, group, clip_ids, clip_external_ids)
+        return result.burst
 
     async def list_recent(self, since: datetime) -> list[BurstRecord]:
         result = await self.session.execute(
             select(BurstRecord).where(BurstRecord.start_time >= since).order_by(BurstRecord.start_time.desc())
         )
         return result.scalars().all()
+
+
+def _as_comparable(value: datetime) -> datetime:
+    # SQLite devolve datetimes sem tzinfo; o grupo vem sempre em UTC.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+__all__ = ["BurstRepository", "BurstUpsert"]
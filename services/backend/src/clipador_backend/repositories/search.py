@@ -0,0 +1,132 @@
+"""Busca por substring em nomes de streamers e usuários.
+
+No Postgres, `ILIKE '%termo%'` nessas colunas é atendido pelos índices GIN `pg_trgm`
+(migração 0007), sem varrer a tabela. Em outros bancos (SQLite em dev/testes) a busca
+cai num índice de trigramas em memória montado a partir de uma leitura estreita
+`(id, texto)`, com a mesma semântica de correspondência: substring, sem diferenciar
+maiúsculas de minúsculas.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Streamer, UserAccount
+
+NGRAM_SIZE = 3
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(term: str) -> str:
+    """Escapa os curingas de LIKE para que o termo seja tratado literalmente."""
+
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def ilike_contains(column: Any, term: str) -> Any:
+    """`column ILIKE '%termo%'` com o termo escapado (elegível para índice trigram)."""
+
+    return column.ilike(f"%{escape_like(term.strip())}%", escape=LIKE_ESCAPE)
+
+
+def _ngrams(text: str) -> set[str]:
+    if len(text) < NGRAM_SIZE:
+        return set()
+    return {text[index : index + NGRAM_SIZE] for index in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class NgramIndex:
+    """Índice invertido de trigramas: filtra candidatos e confirma por substring."""
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._texts: dict[int, list[str]] = defaultdict(list)
+
+    @classmethod
+    def build(cls, rows: Iterable[Sequence[Any]]) -> NgramIndex:
+        index = cls()
+        for row in rows:
+            index.add(row[0], *row[1:])
+        return index
+
+    def add(self, doc_id: int, *texts: str | None) -> None:
+        for text in texts:
+            if not text:
+                continue
+            folded = text.casefold()
+            self._texts[doc_id].append(folded)
+            for gram in _ngrams(folded):
+                self._postings[gram].add(doc_id)
+
+    def search(self, term: str) -> set[int]:
+        needle = term.strip().casefold()
+        if not needle:
+            return set()
+        grams = _ngrams(needle)
+        if grams:
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            # termos curtos não formam trigramas: confere todos os documentos
+            candidates = set(self._texts)
+        return {
+            doc_id for doc_id in candidates if any(needle in text for text in self._texts[doc_id])
+        }
+
+
+async def _matching_ids(
+    session: AsyncSession, id_column: Any, columns: Sequence[Any], term: str
+) -> set[int]:
+    rows = await session.execute(select(id_column, *columns))
+    return NgramIndex.build(rows.all()).search(term)
+
+
+async def search_streamers(session: AsyncSession, term: str, *, limit: int = 20) -> list[Streamer]:
+    stmt = select(Streamer)
+    if session.bind.dialect.name == "postgresql":
+        stmt = stmt.where(
+            or_(
+                ilike_contains(Streamer.display_name, term),
+                ilike_contains(Streamer.twitch_user_id, term),
+            )
+        )
+    else:
+        columns = (Streamer.display_name, Streamer.twitch_user_id)
+        ids = await _matching_ids(session, Streamer.id, columns, term)
+        stmt = stmt.where(Streamer.id.in_(ids))
+    result = await session.execute(stmt.order_by(Streamer.display_name, Streamer.id).limit(limit))
+    return list(result.scalars().all())
+
+
+async def search_users(session: AsyncSession, term: str, *, limit: int = 20) -> list[UserAccount]:
+    stmt = select(UserAccount)
+    if session.bind.dialect.name == "postgresql":
+        stmt = stmt.where(
+            or_(ilike_contains(UserAccount.username, term), ilike_contains(UserAccount.email, term))
+        )
+    else:
+        columns = (UserAccount.username, UserAccount.email)
+        ids = await _matching_ids(session, UserAccount.id, columns, term)
+        stmt = stmt.where(UserAccount.id.in_(ids))
+    result = await session.execute(
+        stmt.order_by(UserAccount.username, UserAccount.id).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+__all__ = [
+    "NgramIndex",
+    "escape_like",
+    "ilike_contains",
+    "search_streamers",
+    "search_users",
+]
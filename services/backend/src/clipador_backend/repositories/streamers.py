@@ -2,27 +2,43 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import Streamer
+from .search import search_streamers
 
 
 class StreamerRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def list_streamers(self) -> list[Streamer]:
-        result = await self.session.execute(select(Streamer).order_by(Streamer.display_name))
+    async def list_streamers(self, *, limit: int | None = None) -> list[Streamer]:
+        stmt = select(Streamer).order_by(Streamer.display_name, Streamer.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def list_active_streamers(self) -> list[Streamer]:
+    async def search(self, term: str, *, limit: int = 20) -> list[Streamer]:
+        return await search_streamers(self.session, term, limit=limit)
+
+    async def list_active_streamers(self, ids: Sequence[int] | None = None) -> list[Streamer]:
+        stmt = select(Streamer).where(Streamer.is_active.is_(True))
+        if ids is not None:
+            stmt = stmt.where(Streamer.id.in_(ids))
+        result = await self.session.execute(stmt.order_by(Streamer.display_name))
+        return result.scalars().all()
+
+    async def list_active_streamer_ids(self) -> list[int]:
         result = await self.session.execute(
-            select(Streamer).where(Streamer.is_active.is_(True)).order_by(Streamer.display_name)
+            select(Streamer.id).where(Streamer.is_active.is_(True)).order_by(Streamer.id)
         )
-        return result.scalars().all()
+        return list(result.scalars().all())
 
     async def create_streamer(
         self,
@@ -60,6 +76,26 @@ class StreamerRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_many_by_twitch_ids(self, twitch_user_ids: Sequence[str]) -> dict[str, Streamer]:
+        if not twitch_user_ids:
+            return {}
+        result = await self.session.execute(
+            select(Streamer).where(Streamer.twitch_user_id.in_(twitch_user_ids))
+        )
+        return {streamer.twitch_user_id: streamer for streamer in result.scalars()}
+
+    async def create_streamers(self, rows: Sequence[dict[str, Any]]) -> list[Streamer]:
+        """Insere vários streamers num INSERT em lote com RETURNING (sem garantia de ordem)."""
+
+        if not rows:
+            return []
+        now = datetime.now(timezone.utc)
+        stmt = insert(Streamer).returning(Streamer)
+        result = await self.session.scalars(
+            stmt, [{"created_at": now, "updated_at": now, **row} for row in rows]
+        )
+        return list(result.all())
+
     async def delete_streamer(self, streamer_id: int) -> None:
         streamer = await self.session.get(Streamer, streamer_id)
         if streamer:
@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Sequence
+from typing import Iterable, Mapping, Sequence
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import (
+    Integer,
+    Select,
+    String,
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..change_marks import ChangeMarks
 from ..models import (
     ClipDelivery,
     Streamer,
@@ -16,12 +31,74 @@ from ..models import (
     UserChannelConfig,
     UserStreamer,
 )
+from ..settings import get_settings
+
+# marca por user_id: snapshots de `/config/me` montados antes dela estão vencidos
+config_changes = ChangeMarks("config", ttl_seconds=lambda: get_settings().config_cache_seconds)
+
+
+async def invalidate_configs(user_ids: Iterable[int]) -> None:
+    """Descarta, em todos os processos, o snapshot em cache dos usuários; chamar após o commit."""
+
+    await config_changes.touch(user_ids)
+
+
+@dataclass(slots=True)
+class ConfigSnapshot:
+    """Configuração do usuário com os streamers anexados e seus status."""
+
+    config: UserChannelConfig
+    streamers: list[tuple[UserStreamer, Streamer, StreamerStatus | None]] = field(
+        default_factory=list
+    )
+
+
+@dataclass(slots=True)
+class StreamerSetDiff:
+    added: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    updated: list[int] = field(default_factory=list)
 
 
 class UserConfigRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def load_snapshot(self, user_id: int) -> ConfigSnapshot:
+        """Config, streamers e status numa única consulta (LEFT JOINs a partir da config)."""
+
+        stmt = (
+            select(UserChannelConfig, UserStreamer, Streamer, StreamerStatus)
+            .outerjoin(UserStreamer, UserStreamer.user_id == UserChannelConfig.user_id)
+            .outerjoin(Streamer, Streamer.id == UserStreamer.streamer_id)
+            .outerjoin(
+                StreamerStatus,
+                and_(
+                    StreamerStatus.user_id == UserStreamer.user_id,
+                    StreamerStatus.streamer_id == UserStreamer.streamer_id,
+                ),
+            )
+            .where(UserChannelConfig.user_id == user_id)
+            .order_by(UserStreamer.order_index, Streamer.display_name)
+            # escritas em lote (Core) não passam pelo identity map: sempre reflete o banco
+            .execution_options(populate_existing=True)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            config = UserChannelConfig(user_id=user_id)
+            self.session.add(config)
+            await self.session.flush()
+            return ConfigSnapshot(config=config)
+
+        snapshot = ConfigSnapshot(config=rows[0][0])
+        for _, mapping, streamer, status in rows:
+            if mapping is not None and streamer is not None:
+                snapshot.streamers.append((mapping, streamer, status))
+        return snapshot
+
     async def get_config(self, user_id: int) -> UserChannelConfig | None:
         stmt = select(UserChannelConfig).where(UserChannelConfig.user_id == user_id)
         result = await self.session.execute(stmt)
@@ -100,14 +177,113 @@ class UserConfigRepository:
         await self.session.execute(stmt)
 
     async def set_streamer_order(self, user_id: int, streamer_order: Sequence[int]) -> None:
-        existing = await self.session.execute(
-            select(UserStreamer).where(UserStreamer.user_id == user_id)
+        await self._update_positions(
+            user_id, {streamer_id: index for index, streamer_id in enumerate(streamer_order)}
         )
-        mapping = {item.streamer_id: item for item in existing.scalars()}
-        for index, streamer_id in enumerate(streamer_order):
-            if streamer_id in mapping:
-                mapping[streamer_id].order_index = index
-        await self.session.flush()
+
+    async def replace_streamers(
+        self,
+        user_id: int,
+        desired: Sequence[tuple[int, str | None]],
+        *,
+        current: Mapping[int, tuple[int, str | None]] | None = None,
+    ) -> StreamerSetDiff:
+        """Deixa o usuário com exatamente `desired` (streamer_id, label), nessa ordem.
+
+        Calcula a diferença contra o estado atual (`current`: streamer_id ->
+        (order_index, label), lido do banco se omitido) e aplica com no máximo um
+        DELETE, um INSERT em lote e um UPDATE em lote.
+        """
+
+        if current is None:
+            stmt = select(
+                UserStreamer.streamer_id, UserStreamer.order_index, UserStreamer.label
+            ).where(UserStreamer.user_id == user_id)
+            rows = await self.session.execute(stmt)
+            current = {streamer_id: (order, label) for streamer_id, order, label in rows.all()}
+
+        wanted = {streamer_id: (index, label) for index, (streamer_id, label) in enumerate(desired)}
+        diff = StreamerSetDiff(
+            added=[streamer_id for streamer_id in wanted if streamer_id not in current],
+            removed=[streamer_id for streamer_id in current if streamer_id not in wanted],
+            updated=[
+                streamer_id
+                for streamer_id, position in wanted.items()
+                if streamer_id in current and current[streamer_id] != position
+            ],
+        )
+
+        if diff.removed:
+            await self.session.execute(
+                delete(UserStreamer)
+                .where(UserStreamer.user_id == user_id, UserStreamer.streamer_id.in_(diff.removed))
+                .execution_options(synchronize_session=False)
+            )
+        if diff.added:
+            await self.session.execute(
+                insert(UserStreamer),
+                [
+                    {
+                        "user_id": user_id,
+                        "streamer_id": streamer_id,
+                        "order_index": wanted[streamer_id][0],
+                        "label": wanted[streamer_id][1],
+                    }
+                    for streamer_id in diff.added
+                ],
+            )
+        if diff.updated:
+            await self._update_positions(
+                user_id,
+                {streamer_id: wanted[streamer_id][0] for streamer_id in diff.updated},
+                labels={streamer_id: wanted[streamer_id][1] for streamer_id in diff.updated},
+            )
+        return diff
+
+    async def _update_positions(
+        self,
+        user_id: int,
+        orders: Mapping[int, int],
+        *,
+        labels: Mapping[int, str | None] | None = None,
+    ) -> None:
+        """Um único UPDATE para várias linhas: `unnest` + `UPDATE ... FROM` no Postgres,
+        `CASE streamer_id WHEN ...` nos demais bancos."""
+
+        if not orders:
+            return
+        ids = list(orders)
+        if self.session.bind.dialect.name == "postgresql":
+            columns = [
+                bindparam("ids", ids, type_=ARRAY(Integer)),
+                bindparam("orders", [orders[key] for key in ids], type_=ARRAY(Integer)),
+            ]
+            names = ["streamer_id", "order_index"]
+            if labels is not None:
+                columns.append(
+                    bindparam("labels", [labels[key] for key in ids], type_=ARRAY(String))
+                )
+                names.append("label")
+            source = func.unnest(*columns).table_valued(*names).render_derived(name="positions")
+            values = {"order_index": source.c.order_index}
+            if labels is not None:
+                values["label"] = source.c.label
+            stmt = (
+                update(UserStreamer)
+                .where(UserStreamer.user_id == user_id)
+                .where(UserStreamer.streamer_id == source.c.streamer_id)
+                .values(**values)
+            )
+        else:
+            values = {"order_index": case(orders, value=UserStreamer.streamer_id)}
+            if labels is not None:
+                values["label"] = case(labels, value=UserStreamer.streamer_id)
+            stmt = (
+                update(UserStreamer)
+                .where(UserStreamer.user_id == user_id, UserStreamer.streamer_id.in_(ids))
+                .values(**values)
+            )
+        await self.session.execute(stmt.execution_options(synchronize_session=False))
 
     async def list_users_for_streamer(self, streamer_id: int) -> list[tuple[UserStreamer, UserChannelConfig | None]]:
         stmt = (
@@ -165,13 +341,21 @@ class UserConfigRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    def delivery_history_query(user_id: int) -> Select[tuple[ClipDelivery, Streamer]]:
+        """Entregas do usuário com o streamer, sem ordem nem limite (para paginar)."""
+
+        return (
+            select(ClipDelivery, Streamer)
+            .join(Streamer, Streamer.id == ClipDelivery.streamer_id)
+            .where(ClipDelivery.user_id == user_id)
+        )
+
     async def recent_deliveries_with_streamer(
         self, user_id: int, limit: int = 50
     ) -> list[tuple[ClipDelivery, Streamer]]:
         stmt = (
-            select(ClipDelivery, Streamer)
-            .join(Streamer, Streamer.id == ClipDelivery.streamer_id)
-            .where(ClipDelivery.user_id == user_id)
+            self.delivery_history_query(user_id)
             .order_by(ClipDelivery.delivered_at.desc())
             .limit(limit)
         )
@@ -222,4 +406,10 @@ class UserConfigRepository:
         return result.scalars().all()
 
 
-__all__ = ["UserConfigRepository"]
+__all__ = [
+    "ConfigSnapshot",
+    "StreamerSetDiff",
+    "UserConfigRepository",
+    "config_changes",
+    "invalidate_configs",
+]
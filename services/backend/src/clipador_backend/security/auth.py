@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
@@ -12,7 +14,29 @@ from ..settings import get_settings
 
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# argon2id para hashes novos (parâmetros mínimos recomendados pela OWASP: 19 MiB, t=2, p=1);
+# pbkdf2_sha256 segue verificável e é regravado no próximo login.
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated=["pbkdf2_sha256"],
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__rounds=2,
+    argon2__parallelism=1,
+)
+
+# Hash/verificação custam dezenas de ms de CPU: rodam fora do event loop, num pool limitado.
+_HASH_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def _hash_executor() -> ThreadPoolExecutor:
+    global _HASH_EXECUTOR
+    if _HASH_EXECUTOR is None:
+        _HASH_EXECUTOR = ThreadPoolExecutor(
+            max_workers=get_settings().password_hash_workers,
+            thread_name_prefix="password-hash",
+        )
+    return _HASH_EXECUTOR
 
 
 def hash_password(password: str) -> str:
@@ -23,6 +47,15 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
+async def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """Verifica a senha fora do loop; devolve um hash novo se o atual usa esquema/custo antigo."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor(), pwd_context.verify_and_update, password, hashed
+    )
+
+
 def create_access_token(subject: str, *, extra: Dict[str, Any] | None = None) -> str:
     settings = get_settings()
     now = datetime.now(timezone.utc)
@@ -5,10 +5,12 @@ from __future__ import annotations
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import session_scope
+from ..db import get_db_session
 from ..models import UserAccount
 from .auth import decode_token
+from .principal import Principal, resolve_principal
 
 http_bearer = HTTPBearer(auto_error=False)
 
@@ -28,14 +30,27 @@ async def get_current_user_credentials(
     return payload
 
 
-async def get_current_user(payload: dict = Depends(get_current_user_credentials)) -> UserAccount:
-    user_id = payload.get("sub")
-    if user_id is None:
+async def get_current_principal(
+    payload: dict = Depends(get_current_user_credentials),
+    session: AsyncSession = Depends(get_db_session),
+) -> Principal:
+    if payload.get("sub") is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid payload")
 
-    async with session_scope() as session:
-        result = await session.execute(select(UserAccount).where(UserAccount.username == user_id))
-        user = result.scalar_one_or_none()
-        if user is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-        return user
+    principal = await resolve_principal(payload, session)
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return principal
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> UserAccount:
+    """Linha completa do usuário, para rotas que precisam de mais que o principal."""
+
+    result = await session.execute(select(UserAccount).where(UserAccount.id == principal.id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
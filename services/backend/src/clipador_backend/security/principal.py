@@ -0,0 +1,123 @@
+"""Resolução do usuário autenticado sem consultar o banco a cada requisição.
+
+O access token carrega `uid`, `role`, `plan` e `status`; com eles o principal é
+montado direto das claims. Alterações de plano/cobrança chamam `invalidate_principal`,
+que grava uma marca de alteração no Redis (`ChangeMarks`), visível para todos os
+processos: tokens emitidos antes da marca voltam a ser conferidos no banco até
+expirarem, e principais em cache montados antes dela são descartados. Cada resolução
+custa uma leitura no Redis; o banco só é consultado quando a marca exige.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..cache import TTLCache
+from ..change_marks import ChangeMarks
+from ..models import UserAccount
+from ..settings import get_settings
+
+PRINCIPAL_CLAIMS = ("uid", "role", "plan", "status")
+
+# username -> (principal, epoch de quando foi montado)
+principal_cache: TTLCache[str, tuple["Principal", float]] = TTLCache(maxsize=10_000, ttl=60.0)
+# username -> epoch da última alteração relevante (plano, status, papel); a marca dura
+# o tempo de vida de um access token, o mais antigo que ela pode precisar barrar
+principal_changes = ChangeMarks(
+    "principal", ttl_seconds=lambda: get_settings().jwt_access_minutes * 60
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    username: str
+    role: str
+    plan: str
+    status: str
+
+    @classmethod
+    def from_user(cls, user: UserAccount) -> Principal:
+        return cls(user.id, user.username, user.role, user.plan, user.status)
+
+    @classmethod
+    def from_claims(cls, payload: dict[str, Any]) -> Principal | None:
+        if any(payload.get(claim) is None for claim in PRINCIPAL_CLAIMS):
+            return None
+        return cls(
+            int(payload["uid"]),
+            str(payload["sub"]),
+            str(payload["role"]),
+            str(payload["plan"]),
+            str(payload["status"]),
+        )
+
+    def claims(self) -> dict[str, Any]:
+        return {"uid": self.id, "role": self.role, "plan": self.plan, "status": self.status}
+
+
+def principal_claims(user: UserAccount) -> dict[str, Any]:
+    """Claims extras gravadas no access token do usuário."""
+
+    return Principal.from_user(user).claims()
+
+
+async def invalidate_principals(usernames: Iterable[str | None]) -> None:
+    """Marca os usuários como alterados para todos os processos; chamar após o commit."""
+
+    usernames = [username for username in usernames if username]
+    for username in usernames:
+        principal_cache.invalidate(username)
+    await principal_changes.touch(usernames)
+
+
+async def invalidate_principal(username: str | None) -> None:
+    await invalidate_principals([username])
+
+
+def clear_principal_cache() -> None:
+    principal_cache.clear()
+
+
+async def resolve_principal(payload: dict[str, Any], session: AsyncSession) -> Principal | None:
+    """Principal do token: cache, depois claims (se ainda válidas) e por fim o banco."""
+
+    username = payload["sub"]
+    started = time.time()
+    changed_at = await principal_changes.changed_at(username)
+
+    cached = principal_cache.get(username)
+    if cached is not None and (changed_at is None or cached[1] > changed_at):
+        return cached[0]
+
+    claims_current = changed_at is None or int(payload.get("iat", 0)) > changed_at
+    principal = Principal.from_claims(payload) if claims_current else None
+    if principal is None:
+        result = await session.execute(
+            select(UserAccount).where(UserAccount.username == username)
+        )
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+
+    principal_cache.set(username, (principal, started))
+    return principal
+
+
+__all__ = [
+    "Principal",
+    "clear_principal_cache",
+    "invalidate_principal",
+    "invalidate_principals",
+    "principal_cache",
+    "principal_changes",
+    "principal_claims",
+    "resolve_principal",
+]
@@ -8,49 +8,18 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..db import session_scope
+from ..db import get_session_factory
 from ..models import PurchaseRecord, UserAccount
+from ..security.principal import invalidate_principals
+from .plan_catalog import plan_spec
 
 logger = logging.getLogger(__name__)
 
-TEST_TRIAL_DAYS = 3
-PLAN_DURATIONS = {
-    "teste gratuito": TEST_TRIAL_DAYS,
-    "mensal solo": 31,
-    "mensal plus": 31,
-    "parceiro": 365,
-    "anual pro": 365,
-    "super": 365,
-}
-
-
-def _normalize_name(plan: str | None) -> str:
-    if not plan:
-        return "free"
-    normalized = plan.strip().lower()
-    translations = {
-        "á": "a",
-        "à": "a",
-        "â": "a",
-        "ã": "a",
-        "é": "e",
-        "ê": "e",
-        "í": "i",
-        "ó": "o",
-        "ô": "o",
-        "õ": "o",
-        "ú": "u",
-        "ç": "c",
-    }
-    for src, dst in translations.items():
-        normalized = normalized.replace(src, dst)
-    return normalized
-
 
 def _calculate_expiration(plan_name: str, base: datetime | None = None) -> datetime:
-    normalized = _normalize_name(plan_name)
-    days = PLAN_DURATIONS.get(normalized, 31)
+    days = plan_spec(plan_name).duration_days
     now = datetime.now(timezone.utc)
     if base:
         if base.tzinfo is None:
@@ -61,36 +30,86 @@ def _calculate_expiration(plan_name: str, base: datetime | None = None) -> datet
     return current + timedelta(days=days)
 
 
-async def _find_user_by_email(email: str) -> UserAccount | None:
-    async with session_scope() as session:
-        result = await session.execute(
-            select(UserAccount).where(func.lower(UserAccount.email) == email.strip().lower())
+class BillingUnitOfWork:
+    """Uma sessão e uma transação para todas as leituras e escritas de um evento de cobrança.
+
+    Os principais alterados só são invalidados depois do commit, para nenhuma requisição
+    concorrente recolocar o estado antigo no cache.
+
+    Com `session`, a unidade entra na transação de quem chamou (ex.: o `InboxDrainer`,
+    que marca o evento como processado no mesmo commit): não faz commit, rollback nem
+    invalidação, e quem chamou invalida `changed` depois do próprio commit.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        *,
+        session: AsyncSession | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._joined = session is not None
+        self._changed: list[str] = []
+        if session is not None:
+            self.session = session
+
+    @property
+    def changed(self) -> list[str]:
+        """Usernames cujo plano ou status foi alterado nesta unidade."""
+
+        return list(self._changed)
+
+    async def __aenter__(self) -> BillingUnitOfWork:
+        if not self._joined:
+            self.session = (self._session_factory or get_session_factory())()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._joined:
+            return
+        try:
+            if exc_type is None:
+                await self.session.commit()
+            else:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+        if exc_type is None:
+            await invalidate_principals(self._changed)
+
+    async def find_user_by_email(self, email: str) -> UserAccount | None:
+        # `lower(email)` usa o índice funcional ix_users_email_lower; a trava serializa
+        # eventos simultâneos do mesmo cliente
+        result = await self.session.execute(
+            select(UserAccount)
+            .where(func.lower(UserAccount.email) == email.strip().lower())
+            .with_for_update()
         )
         return result.scalar_one_or_none()
 
-
-async def register_purchase(email: str, plan: str, status: str, sale_id: str, payload: Dict[str, Any]) -> None:
-    async with session_scope() as session:
-        existing = await session.execute(select(PurchaseRecord).where(PurchaseRecord.sale_id == sale_id))
-        if existing.scalar_one_or_none():
+    async def register_purchase(
+        self, email: str, plan: str, status: str, sale_id: str, payload: Dict[str, Any]
+    ) -> None:
+        existing = await self.session.execute(
+            select(PurchaseRecord.id).where(PurchaseRecord.sale_id == sale_id)
+        )
+        if existing.scalar_one_or_none() is not None:
             logger.info("purchase_already_recorded", extra={"sale_id": sale_id})
             return
 
         customer = payload.get("customer", {})
-        purchase = PurchaseRecord(
-            sale_id=sale_id,
-            email=email,
-            plan=plan,
-            status=status,
-            payment_method=payload.get("payment", {}).get("method"),
-            raw_payload=json.dumps(payload, ensure_ascii=False),
+        self.session.add(
+            PurchaseRecord(
+                sale_id=sale_id,
+                email=email,
+                plan=plan,
+                status=status,
+                payment_method=payload.get("payment", {}).get("method"),
+                raw_payload=json.dumps(payload, ensure_ascii=False),
+            )
         )
-        session.add(purchase)
 
-        user_result = await session.execute(
-            select(UserAccount).where(func.lower(UserAccount.email) == email.strip().lower())
-        )
-        user = user_result.scalar_one_or_none()
+        user = await self.find_user_by_email(email)
         if not user:
             logger.warning("purchase_without_user", extra={"email": email, "sale_id": sale_id})
             return
@@ -104,8 +123,9 @@ async def register_purchase(email: str, plan: str, status: str, sale_id: str, pa
             user.email = email
         if customer.get("id"):
             user.kirvano_customer_id = customer.get("id")
-        if "teste" in plan.lower():
+        if plan_spec(plan).trial:
             user.trial_used = True
+        self._changed.append(user.username)
 
         logger.info(
             "plan_assigned",
@@ -116,13 +136,8 @@ async def register_purchase(email: str, plan: str, status: str, sale_id: str, pa
             },
         )
 
-
-async def mark_subscription_ended(email: str, status: str) -> None:
-    async with session_scope() as session:
-        result = await session.execute(
-            select(UserAccount).where(func.lower(UserAccount.email) == email.strip().lower())
-        )
-        user = result.scalar_one_or_none()
+    async def mark_subscription_ended(self, email: str, status: str) -> None:
+        user = await self.find_user_by_email(email)
         if not user:
             logger.warning("cancel_without_user", extra={"email": email})
             return
@@ -130,15 +145,11 @@ async def mark_subscription_ended(email: str, status: str) -> None:
         user.plan = "free"
         user.plan_expires_at = None
         user.status = status or "inactive"
+        self._changed.append(user.username)
         logger.info("plan_revoked", extra={"email": email, "status": status})
 
-
-async def mark_subscription_renewed(email: str, plan: str) -> None:
-    async with session_scope() as session:
-        result = await session.execute(
-            select(UserAccount).where(func.lower(UserAccount.email) == email.strip().lower())
-        )
-        user = result.scalar_one_or_none()
+    async def mark_subscription_renewed(self, email: str, plan: str) -> None:
+        user = await self.find_user_by_email(email)
         if not user:
             logger.warning("renew_without_user", extra={"email": email})
             return
@@ -147,6 +158,7 @@ async def mark_subscription_renewed(email: str, plan: str) -> None:
         user.plan = plan
         user.plan_expires_at = expires_at
         user.status = "active"
+        self._changed.append(user.username)
         logger.info(
             "plan_renewed",
             extra={
@@ -155,3 +167,26 @@ async def mark_subscription_renewed(email: str, plan: str) -> None:
                 "expires_at": expires_at.isoformat() if expires_at else None,
             },
         )
+
+
+async def register_purchase(email: str, plan: str, status: str, sale_id: str, payload: Dict[str, Any]) -> None:
+    async with BillingUnitOfWork() as uow:
+        await uow.register_purchase(email, plan, status, sale_id, payload)
+
+
+async def mark_subscription_ended(email: str, status: str) -> None:
+    async with BillingUnitOfWork() as uow:
+        await uow.mark_subscription_ended(email, status)
+
+
+async def mark_subscription_renewed(email: str, plan: str) -> None:
+    async with BillingUnitOfWork() as uow:
+        await uow.mark_subscription_renewed(email, plan)
+
+
+__all__ = [
+    "BillingUnitOfWork",
+    "mark_subscription_ended",
+    "mark_subscription_renewed",
+    "register_purchase",
+]
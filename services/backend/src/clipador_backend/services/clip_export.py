@@ -0,0 +1,209 @@
+"""Exportação de clipes em streaming (CSV, NDJSON ou array JSON).
+
+As linhas chegam de um cursor do banco (`yield_per` / `stream_results`) e são
+serializadas em blocos de ~64 KiB que vão direto para a resposta, então a memória
+por requisição fica constante independentemente do período exportado. Com `gzip`
+os blocos passam por um compressor incremental antes de sair.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Mapping
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import ClipRecord, UserStreamer
+from ..repositories.search import ilike_contains
+
+ExportFormat = Literal["csv", "ndjson", "json"]
+
+EXPORT_FORMATS: tuple[str, ...] = ("csv", "ndjson", "json")
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+EXTENSIONS: dict[str, str] = {"csv": "csv", "ndjson": "ndjson", "json": "json"}
+
+CHUNK_BYTES = 64 * 1024
+YIELD_PER = 1000
+
+CLIP_RECORD_FIELDS: tuple[str, ...] = (
+    "id",
+    "title",
+    "streamer",
+    "streamer_external_id",
+    "views",
+    "duration",
+    "video_id",
+    "createdAt",
+)
+
+
+def _jsonable(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def csv_cell(value: Any) -> Any:
+    value = _jsonable(value)
+    return "" if value is None else value
+
+
+class _Encoder:
+    """Serializa linhas no formato pedido, acumulando até `CHUNK_BYTES` por bloco."""
+
+    def __init__(self, fmt: str, fields: tuple[str, ...]) -> None:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+        self.fmt = fmt
+        self.fields = fields
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._first = True
+
+    def start(self) -> None:
+        if self.fmt == "csv":
+            self._writer.writerow(self.fields)
+        elif self.fmt == "json":
+            self._buffer.write("[")
+
+    def write(self, row: Mapping[str, Any]) -> bytes | None:
+        if self.fmt == "csv":
+            self._writer.writerow([csv_cell(row.get(field)) for field in self.fields])
+        else:
+            payload = {field: _jsonable(row.get(field)) for field in self.fields}
+            encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+            if self.fmt == "ndjson":
+                self._buffer.write(encoded + "\n")
+            else:
+                self._buffer.write(encoded if self._first else "," + encoded)
+        self._first = False
+        if self._buffer.tell() >= CHUNK_BYTES:
+            return self.flush()
+        return None
+
+    def finish(self) -> bytes:
+        if self.fmt == "json":
+            self._buffer.write("]")
+        return self.flush()
+
+    def flush(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+async def aencode_rows(
+    rows: AsyncIterable[Mapping[str, Any]], fmt: str, fields: tuple[str, ...]
+) -> AsyncIterator[bytes]:
+    encoder = _Encoder(fmt, fields)
+    encoder.start()
+    async for row in rows:
+        chunk = encoder.write(row)
+        if chunk:
+            yield chunk
+    tail = encoder.finish()
+    if tail:
+        yield tail
+
+
+def _gzip_compressor() -> Any:
+    # wbits=31: cabeçalho e rodapé gzip, compatível com `Content-Encoding: gzip`
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+async def agzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    compressor = _gzip_compressor()
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_headers(fmt: str, *, filename: str = "clipes", gzip: bool = False) -> dict[str, str]:
+    headers = {"Content-Disposition": f"attachment; filename={filename}.{EXTENSIONS[fmt]}"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+def clip_record_row(clip: ClipRecord) -> dict[str, Any]:
+    return {
+        "id": clip.clip_id,
+        "title": clip.title,
+        "streamer": clip.streamer_name,
+        "streamer_external_id": clip.streamer_external_id,
+        "views": clip.viewer_count,
+        "duration": clip.duration,
+        "video_id": clip.video_id,
+        "createdAt": clip.created_at,
+    }
+
+
+def clip_export_query(
+    *,
+    user_id: int | None,
+    since: datetime,
+    until: datetime | None = None,
+    streamer: str | None = None,
+) -> Select[tuple[ClipRecord]]:
+    """Clipes do período, restritos aos streamers monitorados por `user_id`.
+
+    `user_id=None` exporta todos os clipes; cabe ao chamador garantir que só um
+    admin chegue aqui assim. O parâmetro é obrigatório para que ninguém esqueça o
+    escopo.
+    """
+
+    stmt = select(ClipRecord).where(ClipRecord.created_at >= since)
+    if user_id is not None:
+        monitored = select(UserStreamer.streamer_id).where(UserStreamer.user_id == user_id)
+        stmt = stmt.where(ClipRecord.streamer_id.in_(monitored))
+    if until is not None:
+        stmt = stmt.where(ClipRecord.created_at < until)
+    if streamer:
+        stmt = stmt.where(ilike_contains(ClipRecord.streamer_name, streamer))
+    return stmt.order_by(ClipRecord.created_at.desc(), ClipRecord.id.desc()).execution_options(
+        yield_per=YIELD_PER
+    )
+
+
+async def stream_clip_rows(
+    session: AsyncSession,
+    stmt: Select[tuple[ClipRecord]],
+    row: Callable[[ClipRecord], Mapping[str, Any]] = clip_record_row,
+) -> AsyncIterator[Mapping[str, Any]]:
+    """Percorre `stmt` por um cursor do servidor, `YIELD_PER` linhas por vez.
+
+    O identity map guarda referências fracas, então as instâncias já serializadas
+    são descartadas a cada lote.
+    """
+
+    result = await session.stream_scalars(stmt)
+    async for partition in result.partitions():
+        for clip in partition:
+            yield row(clip)
+
+
+__all__ = [
+    "CLIP_RECORD_FIELDS",
+    "EXPORT_FORMATS",
+    "ExportFormat",
+    "MEDIA_TYPES",
+    "aencode_rows",
+    "agzip_chunks",
+    "clip_export_query",
+    "clip_record_row",
+    "csv_cell",
+    "export_headers",
+    "stream_clip_rows",
+]
@@ -0,0 +1,285 @@
+"""Exportações assíncronas: o worker grava o arquivo, a API só enfileira e consulta.
+
+O job lê os clipes pelo mesmo cursor em lotes de `services/clip_export.py` e grava um
+row group por lote — Parquet colunar quando `pyarrow` está instalado (extra `export`),
+ou CSV comprimido com gzip. O arquivo é escrito num `.part` e renomeado ao final, e o
+progresso (`rows_written`) é gravado no job a cada row group, em transações curtas.
+`sweep_exports` apaga os arquivos vencidos, encerra jobs presos e remove os registros
+antigos.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Protocol
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..metrics import metrics
+from ..models import ExportJob, ExportStatus, UserAccount, UserRole
+from .clip_export import CLIP_RECORD_FIELDS, clip_export_query, csv_cell, stream_clip_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende do extra `export`
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+PARQUET = "parquet"
+CSV_GZ = "csv.gz"
+JOB_FORMATS: tuple[str, ...] = (PARQUET, CSV_GZ)
+MEDIA_TYPES: dict[str, str] = {
+    PARQUET: "application/vnd.apache.parquet",
+    CSV_GZ: "application/gzip",
+}
+
+
+def available_formats() -> tuple[str, ...]:
+    return JOB_FORMATS if pq is not None else (CSV_GZ,)
+
+
+class _RowGroupWriter(Protocol):
+    def write(self, rows: list[dict[str, Any]]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _CsvGzipWriter:
+    def __init__(self, path: Path, fields: tuple[str, ...]) -> None:
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="")
+        self._fields = fields
+        self._writer = csv.writer(self._file, lineterminator="\n")
+        self._writer.writerow(fields)
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows([csv_cell(row.get(field)) for field in self._fields] for row in rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _parquet_schema() -> Any:
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("title", pa.string()),
+            ("streamer", pa.string()),
+            ("streamer_external_id", pa.string()),
+            ("views", pa.int64()),
+            ("duration", pa.int32()),
+            ("video_id", pa.string()),
+            ("createdAt", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path, fields: tuple[str, ...]) -> None:
+        self._schema = _parquet_schema()
+        self._fields = fields
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        columns = {field: [row.get(field) for row in rows] for field in self._fields}
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _open_writer(fmt: str, path: Path) -> _RowGroupWriter:
+    if fmt == PARQUET:
+        if pq is None:
+            raise RuntimeError("Exportação Parquet requer o extra `export` (pyarrow)")
+        return _ParquetWriter(path, CLIP_RECORD_FIELDS)
+    return _CsvGzipWriter(path, CLIP_RECORD_FIELDS)
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+def export_path(export_dir: str | os.PathLike[str], job: ExportJob) -> Path:
+    return Path(export_dir) / f"{job.id}.{job.fmt}"
+
+
+def _remove_files(export_dir: str | os.PathLike[str], job: ExportJob) -> None:
+    target = Path(job.file_path) if job.file_path else export_path(export_dir, job)
+    target.unlink(missing_ok=True)
+    target.with_name(target.name + ".part").unlink(missing_ok=True)
+
+
+@dataclass(slots=True)
+class ExportRunner:
+    """Executa um job de exportação, gravando um row group por lote lido."""
+
+    session_factory: async_sessionmaker[AsyncSession]
+    read_session_factory: async_sessionmaker[AsyncSession]
+    export_dir: str
+    row_group_size: int = 50_000
+
+    async def run(self, job_id: str) -> ExportJob | None:
+        async with self.session_factory() as session:
+            job = await session.get(ExportJob, job_id)
+            if job is None or job.status == ExportStatus.COMPLETED.value:
+                return job
+            job.status = ExportStatus.RUNNING.value
+            job.started_at = datetime.now(timezone.utc)
+            job.rows_written = 0
+            job.error = None
+            await session.commit()
+
+            target = export_path(self.export_dir, job)
+            partial = target.with_name(target.name + ".part")
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                rows_written = await self._write(job, partial, session)
+                os.replace(partial, target)
+            except Exception as exc:
+                partial.unlink(missing_ok=True)
+                job.status = ExportStatus.FAILED.value
+                job.error = str(exc)[:2000]
+                job.finished_at = datetime.now(timezone.utc)
+                await session.commit()
+                metrics.incr("export_jobs", status="failed", fmt=job.fmt)
+                logger.exception("export_job_failed", extra={"job_id": job_id})
+                return job
+
+            job.status = ExportStatus.COMPLETED.value
+            job.rows_written = rows_written
+            job.file_path = str(target)
+            job.file_size = target.stat().st_size
+            job.finished_at = datetime.now(timezone.utc)
+            await session.commit()
+            metrics.incr("export_jobs", status="completed", fmt=job.fmt)
+            metrics.incr("export_rows_written", rows_written, fmt=job.fmt)
+            return job
+
+    async def _scope(self, job: ExportJob, session: AsyncSession) -> int | None:
+        """`user_id` do filtro de clipes; `None` (todos) só se o dono ainda for admin."""
+
+        if (job.params or {}).get("all_streamers"):
+            owner = await session.get(UserAccount, job.user_id)
+            if owner is not None and owner.role == UserRole.ADMIN.value:
+                return None
+        return job.user_id
+
+    async def _write(self, job: ExportJob, path: Path, session: AsyncSession) -> int:
+        params = job.params or {}
+        since = datetime.now(timezone.utc) - timedelta(days=int(params.get("days", 30)))
+        stmt = clip_export_query(
+            user_id=await self._scope(job, session), since=since, streamer=params.get("streamer")
+        )
+
+        writer = _open_writer(job.fmt, path)
+        batch: list[dict[str, Any]] = []
+        rows_written = 0
+        try:
+            async with self.read_session_factory() as read_session:
+                async for row in stream_clip_rows(read_session, stmt):
+                    batch.append(dict(row))
+                    if len(batch) >= self.row_group_size:
+                        writer.write(batch)
+                        rows_written += len(batch)
+                        batch = []
+                        job.rows_written = rows_written
+                        await session.commit()
+                if batch:
+                    writer.write(batch)
+                    rows_written += len(batch)
+        finally:
+            writer.close()
+        return rows_written
+
+
+@dataclass(slots=True)
+class ExportSweep:
+    expired: int = 0
+    interrupted: int = 0
+    deleted: int = 0
+
+
+async def sweep_exports(
+    session_factory: async_sessionmaker[AsyncSession],
+    export_dir: str,
+    *,
+    ttl: timedelta,
+    stuck_after: timedelta,
+    keep_jobs: timedelta,
+    now: datetime | None = None,
+) -> ExportSweep:
+    """Limpeza periódica dos jobs de exportação.
+
+    - concluídos há mais de `ttl`: o arquivo é apagado e o job vira `expired` (o
+      download passa a responder 410);
+    - `pending`/`running` há mais de `stuck_after`: o worker caiu ou a task se perdeu,
+      então o job vira `failed` e o `.part` é removido;
+    - `failed`/`expired` encerrados há mais de `keep_jobs`: o registro é apagado.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    sweep = ExportSweep()
+    async with session_factory() as session, session.begin():
+        stuck = await session.scalars(
+            select(ExportJob).where(
+                ExportJob.status.in_((ExportStatus.PENDING.value, ExportStatus.RUNNING.value)),
+                func.coalesce(ExportJob.started_at, ExportJob.created_at) < now - stuck_after,
+            )
+        )
+        for job in stuck:
+            _remove_files(export_dir, job)
+            job.status = ExportStatus.FAILED.value
+            job.error = "Exportação interrompida"
+            job.finished_at = now
+            sweep.interrupted += 1
+
+        completed = await session.scalars(
+            select(ExportJob).where(
+                ExportJob.status == ExportStatus.COMPLETED.value,
+                ExportJob.finished_at < now - ttl,
+            )
+        )
+        for job in completed:
+            _remove_files(export_dir, job)
+            job.status = ExportStatus.EXPIRED.value
+            job.file_path = None
+            sweep.expired += 1
+
+        result = await session.execute(
+            delete(ExportJob).where(
+                ExportJob.status.in_((ExportStatus.FAILED.value, ExportStatus.EXPIRED.value)),
+                ExportJob.finished_at < now - keep_jobs,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        sweep.deleted = result.rowcount or 0
+
+    for outcome in ("expired", "interrupted", "deleted"):
+        if getattr(sweep, outcome):
+            metrics.incr("export_jobs_swept", getattr(sweep, outcome), outcome=outcome)
+    return sweep
+
+
+__all__ = [
+    "CSV_GZ",
+    "ExportRunner",
+    "ExportSweep",
+    "JOB_FORMATS",
+    "MEDIA_TYPES",
+    "PARQUET",
+    "available_formats",
+    "export_path",
+    "new_job_id",
+    "sweep_exports",
+]
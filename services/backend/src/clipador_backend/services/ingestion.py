@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+from collections.abc import Callable, Sequence
 from datetime import datetime, timedelta, timezone
 
 import logging
@@ -16,6 +17,7 @@ from ..repositories.bursts import BurstRepository
 from ..repositories.clips import ClipRepository
 from ..repositories.streamers import StreamerRepository
 from ..services.delivery import DeliveryService
+from ..services.polling import PollOutcome
 
 DEFAULT_LOOKBACK_MINUTES = 60
 DEFAULT_SYNC_INTERVAL = 180  # seconds
@@ -23,20 +25,41 @@ DEFAULT_SYNC_INTERVAL = 180  # seconds
 logger = logging.getLogger(__name__)
 
 
+def _no_checkpoint() -> None:
+    return None
+
+
 class ClipIngestionService:
     def __init__(self, twitch_client: TwitchAPI):
         self._twitch = twitch_client
         self._task: asyncio.Task | None = None
         self._running = False
 
-    async def sync_once(self) -> None:
+    async def sync_once(
+        self,
+        streamer_ids: Sequence[int] | None = None,
+        *,
+        checkpoint: Callable[[], None] | None = None,
+    ) -> dict[int, PollOutcome]:
+        """Sincroniza os streamers ativos; `streamer_ids` restringe a um shard.
+
+        `checkpoint` roda antes das escritas de cada streamer e antes do commit; se ele
+        levantar (ex.: `RedisLease.check` com o lease perdido), a transação inteira é
+        desfeita e nenhum clipe ou burst do ciclo é gravado.
+
+        Retorna o desfecho por streamer consultado, usado pelo agendador adaptativo.
+        """
+
+        checkpoint = checkpoint or _no_checkpoint
+
+        outcomes: dict[int, PollOutcome] = {}
         async with session_scope() as session:
             streamer_repo = StreamerRepository(session)
             clip_repo = ClipRepository(session)
             burst_repo = BurstRepository(session)
             delivery_service = DeliveryService(session)
 
-            streamers = await streamer_repo.list_active_streamers()
+            streamers = await streamer_repo.list_active_streamers(streamer_ids)
             now = datetime.now(timezone.utc)
             for streamer in streamers:
                 since = streamer.last_clip_synced_at or now - timedelta(minutes=DEFAULT_LOOKBACK_MINUTES)
@@ -64,6 +87,10 @@ class ClipIngestionService:
                     # modo desconhecido, pula
                     continue
 
+                outcome = outcomes[streamer.id] = PollOutcome(
+                    streamer.id,
+                    base_interval=streamer.monitor_interval_seconds,
+                )
                 logger.info(
                     "ingestion_fetching",
                     extra={
@@ -81,6 +108,7 @@ class ClipIngestionService:
                         client_secret=client_secret,
                     )
                 except RuntimeError as exc:
+                    outcome.failed = True
                     logger.warning(
                         "ingestion_credentials_missing",
                         extra={
@@ -91,6 +119,7 @@ class ClipIngestionService:
                     )
                     continue
                 except Exception as exc:
+                    outcome.failed = True
                     logger.exception(
                         "ingestion_fetch_failed",
                         extra={
@@ -100,6 +129,7 @@ class ClipIngestionService:
                     )
                     continue
 
+                checkpoint()
                 if not clips_data:
                     await streamer_repo.update_last_synced(streamer)
                     continue
@@ -122,6 +152,7 @@ class ClipIngestionService:
                         duration=int(float(clip.get("duration", 0)) or 0),
                         broadcaster_level=None,
                     )
+                    outcome.new_clips += 1
 
                 await streamer_repo.update_last_synced(streamer)
 
@@ -144,23 +175,34 @@ class ClipIngestionService:
                     clip_db_records = [record for record in clip_db_records if record is not None]
                     if not clip_db_records:
                         continue
-                    burst_record = await burst_repo.create_from_group(
+                    upsert = await burst_repo.upsert_from_group(
                         streamer.id,
                         burst,
                         [record.id for record in clip_db_records],
                         [record.clip_id for record in clip_db_records],
                     )
-                    await delivery_service.dispatch_burst(streamer, burst_record, clip_db_records)
+                    # Só os clipes recém-vinculados geram entregas; o restante já foi entregue.
+                    new_records = [
+                        record for record in clip_db_records if record.clip_id in upsert.new_clip_external_ids
+                    ]
+                    if not new_records:
+                        continue
+                    await delivery_service.dispatch_burst(streamer, upsert.burst, new_records)
+                    outcome.bursts += 1
                     logger.info(
-                        "ingestion_burst_created",
+                        "ingestion_burst_created" if upsert.created else "ingestion_burst_extended",
                         extra={
                             "streamer": streamer.twitch_user_id,
                             "start": burst.start.isoformat(),
                             "end": burst.end.isoformat(),
-                            "count": len(clip_db_records),
+                            "count": upsert.burst.clip_count,
+                            "new": len(new_records),
                         },
                     )
 
+            checkpoint()
+        return outcomes
+
     async def run_loop(self, interval_seconds: int = DEFAULT_SYNC_INTERVAL) -> None:
         self._running = True
         while self._running:
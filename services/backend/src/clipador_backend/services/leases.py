@@ -0,0 +1,119 @@
+"""Leases distribuídos no Redis para evitar processamento concorrente."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import secrets
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Só remove a chave se ela ainda pertence a quem adquiriu o lease.
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Só estende a expiração se o lease ainda é nosso.
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class LeaseLostError(RuntimeError):
+    """O lease expirou e foi tomado por outro processo enquanto o trabalho rodava."""
+
+
+class RedisLease:
+    """Lease exclusivo com expiração (`SET NX PX`), renovação e liberação seguras por token."""
+
+    def __init__(self, redis: Any, key: str, ttl_seconds: float):
+        self._redis = redis
+        self.key = key
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token = secrets.token_hex(16)
+        self.acquired = False
+        self.lost = False
+        self.wait_seconds = 0.0
+
+    async def acquire(self, *, wait_seconds: float = 0, retry_interval: float = 0.2) -> bool:
+        """Tenta adquirir o lease, insistindo por até `wait_seconds`.
+
+        O tempo gasto fica em `self.wait_seconds` para ser reportado como métrica.
+        """
+
+        started = time.monotonic()
+        deadline = started + wait_seconds
+        while True:
+            self.acquired = bool(await self._redis.set(self.key, self.token, nx=True, px=self.ttl_ms))
+            if self.acquired or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(retry_interval)
+        self.wait_seconds = time.monotonic() - started
+        return self.acquired
+
+    async def renew(self) -> bool:
+        if not self.acquired:
+            return False
+        renewed = bool(await self._redis.eval(_RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+        if not renewed:
+            self.lost = True
+        return renewed
+
+    def check(self) -> None:
+        """Checkpoint para trabalho longo: `LeaseLostError` se a renovação já falhou."""
+
+        if self.lost:
+            raise LeaseLostError(self.key)
+
+    async def release(self) -> bool:
+        if not self.acquired:
+            return False
+        self.acquired = False
+        return bool(await self._redis.eval(_RELEASE_SCRIPT, 1, self.key, self.token))
+
+    @contextlib.asynccontextmanager
+    async def keepalive(self, interval_seconds: float | None = None) -> AsyncIterator["RedisLease"]:
+        """Renova o lease em segundo plano enquanto o bloco executa.
+
+        Se a renovação falhar (lease expirado e tomado por outro), `self.lost` vira True;
+        o chamador deve chamar `check()` antes de cada escrita para abortar cedo.
+        """
+
+        interval = interval_seconds or self.ttl_ms / 3000
+
+        async def _renew_forever() -> None:
+            while self.acquired and not self.lost:
+                await asyncio.sleep(interval)
+                try:
+                    if not await self.renew():
+                        logger.warning("lease_lost", extra={"key": self.key})
+                except Exception:  # pragma: no cover - tenta novamente no próximo ciclo
+                    logger.exception("lease_renew_failed", extra={"key": self.key})
+
+        task = asyncio.create_task(_renew_forever())
+        try:
+            yield self
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def __aenter__(self) -> "RedisLease":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.release()
+
+
+__all__ = ["LeaseLostError", "RedisLease"]
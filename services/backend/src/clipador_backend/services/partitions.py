@@ -0,0 +1,177 @@
+"""Manutenção das partições mensais de `clips` e `clip_deliveries` (somente Postgres).
+
+As tabelas são particionadas por intervalo mensal (ver migração 0005). Este módulo
+calcula quais partições faltam (mês corrente + `months_ahead`) e quais já passaram da
+retenção, e aplica as mudanças: criar partições futuras é DDL barato e remover uma
+partição expirada é um `DETACH` + `DROP`, sem varrer linhas.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# tabela -> coluna usada como chave de partição
+PARTITIONED_TABLES: dict[str, str] = {
+    "clips": "created_at",
+    "clip_deliveries": "burst_start",
+}
+
+_PARTITION_RE = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+@dataclass(frozen=True, slots=True)
+class MonthPartition:
+    table: str
+    start: date
+    end: date
+
+    @property
+    def name(self) -> str:
+        return partition_name(self.table, self.start)
+
+    def create_sql(self) -> str:
+        return (
+            f'CREATE TABLE IF NOT EXISTS "{self.name}" PARTITION OF "{self.table}" '
+            f"FOR VALUES FROM ('{self.start.isoformat()}') TO ('{self.end.isoformat()}')"
+        )
+
+
+@dataclass(slots=True)
+class PartitionPlan:
+    to_create: list[MonthPartition]
+    to_drop: list[str]
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    match = _PARTITION_RE.search(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def month_partitions(table: str, first: date, last: date) -> list[MonthPartition]:
+    """Partições mensais de `first` até `last` (inclusive)."""
+
+    partitions = []
+    current = month_start(first)
+    while current <= last:
+        following = add_months(current, 1)
+        partitions.append(MonthPartition(table, current, following))
+        current = following
+    return partitions
+
+
+def plan_partitions(
+    table: str,
+    existing: list[str],
+    *,
+    today: date,
+    months_ahead: int,
+    retention_months: int,
+) -> PartitionPlan:
+    """Decide quais partições criar e quais remover, sem tocar no banco."""
+
+    current = month_start(today)
+    wanted = month_partitions(table, current, add_months(current, months_ahead))
+    existing_set = set(existing)
+    to_create = [partition for partition in wanted if partition.name not in existing_set]
+
+    # uma partição expira quando todo o seu intervalo ficou antes do corte de retenção
+    cutoff = add_months(current, -retention_months)
+    to_drop = sorted(
+        name
+        for name in existing
+        if (month := partition_month(name)) is not None and add_months(month, 1) <= cutoff
+    )
+    return PartitionPlan(to_create=to_create, to_drop=to_drop)
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> list[str]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
+
+
+async def maintain_partitions(
+    conn: AsyncConnection,
+    retention_months: dict[str, int],
+    *,
+    months_ahead: int = 3,
+    drop_detached: bool = True,
+    today: date | None = None,
+) -> dict[str, PartitionPlan]:
+    """Cria partições futuras e desanexa/remove as expiradas de cada tabela particionada.
+
+    Em bancos que não são Postgres (dev/testes com SQLite) não faz nada.
+    """
+
+    if conn.dialect.name != "postgresql":
+        return {}
+
+    today = today or datetime.now(timezone.utc).date()
+    plans: dict[str, PartitionPlan] = {}
+    for table in PARTITIONED_TABLES:
+        existing = await list_partitions(conn, table)
+        plan = plan_partitions(
+            table,
+            existing,
+            today=today,
+            months_ahead=months_ahead,
+            retention_months=retention_months[table],
+        )
+        for partition in plan.to_create:
+            await conn.execute(text(partition.create_sql()))
+            logger.info("partition_created", extra={"table": table, "partition": partition.name})
+        for name in plan.to_drop:
+            await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            if drop_detached:
+                await conn.execute(text(f'DROP TABLE "{name}"'))
+            logger.info(
+                "partition_expired",
+                extra={"table": table, "partition": name, "dropped": drop_detached},
+            )
+        plans[table] = plan
+    return plans
+
+
+__all__ = [
+    "PARTITIONED_TABLES",
+    "MonthPartition",
+    "PartitionPlan",
+    "add_months",
+    "maintain_partitions",
+    "month_partitions",
+    "partition_name",
+    "plan_partitions",
+]
@@ -6,47 +6,11 @@ from datetime import datetime, timezone
 
 from ..models.user import UserAccount
 from ..models.channel import UserChannelConfig
-
-PLAN_SLOT_MAP = {
-    "teste gratuito": 3,
-    "gratuito": 3,
-    "mensal solo": 3,
-    "mensal plus": 8,
-    "anual pro": 15,
-    "parceiro": 1,
-    "super": 999,
-}
-
-
-def _normalize(plan: str | None) -> str:
-    if not plan:
-        return "free"
-    normalized = plan.strip().lower()
-    replacements = {
-        "á": "a",
-        "à": "a",
-        "â": "a",
-        "ã": "a",
-        "é": "e",
-        "ê": "e",
-        "í": "i",
-        "ó": "o",
-        "ô": "o",
-        "õ": "o",
-        "ú": "u",
-        "ç": "c",
-    }
-    for src, dst in replacements.items():
-        normalized = normalized.replace(src, dst)
-    return normalized
+from .plan_catalog import plan_spec
 
 
 def base_slots(plan: str | None) -> int:
-    normalized = _normalize(plan)
-    for key, slots in PLAN_SLOT_MAP.items():
-        if key in normalized:
-            return slots
-    return 1
+    return plan_spec(plan).slots
 
 
 def resolve_total_slots(user: UserAccount, config: UserChannelConfig | None) -> int:
@@ -0,0 +1,78 @@
+"""Catálogo de planos: um único normalizador e a especificação de cada plano.
+
+O nome do plano chega em várias grafias ("Anual Pró", "anual pro", "Plano Mensal
+Plus"...). A normalização é um `str.translate` só, e o resultado da busca por
+palavra-chave fica memorizado por string de plano: depois do primeiro acesso,
+resolver o plano de um usuário é uma consulta a um dicionário.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+FREE_PLAN = "free"
+
+_ACCENTS = str.maketrans("áàâãéêíóôõúç", "aaaaeeiooouc")
+
+
+@dataclass(frozen=True, slots=True)
+class PlanSpec:
+    key: str
+    slots: int
+    duration_days: int
+    trial: bool = False
+
+
+TRIAL_DAYS = 3
+
+PLANS: dict[str, PlanSpec] = {
+    spec.key: spec
+    for spec in (
+        PlanSpec("teste gratuito", slots=3, duration_days=TRIAL_DAYS, trial=True),
+        PlanSpec("mensal solo", slots=3, duration_days=31),
+        PlanSpec("mensal plus", slots=8, duration_days=31),
+        PlanSpec("anual pro", slots=15, duration_days=365),
+        PlanSpec("parceiro", slots=1, duration_days=365),
+        PlanSpec("super", slots=999, duration_days=365),
+    )
+}
+DEFAULT_PLAN = PlanSpec(FREE_PLAN, slots=1, duration_days=31)
+
+# Ordem importa: o primeiro trecho contido no nome normalizado decide o plano.
+_KEYWORDS: tuple[tuple[str, str], ...] = (
+    ("mensal solo", "mensal solo"),
+    ("mensal plus", "mensal plus"),
+    ("anual pro", "anual pro"),
+    ("parceiro", "parceiro"),
+    ("teste", "teste gratuito"),
+    ("gratuito", "teste gratuito"),
+    ("gratis", "teste gratuito"),
+    ("super", "super"),
+)
+
+
+def normalize_plan_name(plan: str | None) -> str:
+    if not plan:
+        return FREE_PLAN
+    return plan.strip().lower().translate(_ACCENTS)
+
+
+@lru_cache(maxsize=1024)
+def plan_spec(plan: str | None) -> PlanSpec:
+    normalized = normalize_plan_name(plan)
+    for keyword, key in _KEYWORDS:
+        if keyword in normalized:
+            return PLANS[key]
+    return DEFAULT_PLAN
+
+
+__all__ = [
+    "DEFAULT_PLAN",
+    "FREE_PLAN",
+    "PLANS",
+    "PlanSpec",
+    "TRIAL_DAYS",
+    "normalize_plan_name",
+    "plan_spec",
+]
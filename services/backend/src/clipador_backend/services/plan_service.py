@@ -1,6 +1,6 @@
 """Serviços de gerenciamento de planos - migrado do legado"""
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
 from enum import Enum
 
@@ -9,6 +9,8 @@ from sqlalchemy import and_, or_, func, select, update
 
 from clipador_backend.models.user import UserAccount
 from clipador_backend.models.config import ConfiguracaoCanal, Transacao
+from clipador_backend.services.plan_catalog import plan_spec
+from clipador_backend.services.plan_sweeps import expiry_reminder_query
 
 
 class PlanName(str, Enum):
@@ -42,35 +44,10 @@ class PlanService:
         if plano is None:
             return 1
         
-        # Normaliza para string
         name = plano.value if isinstance(plano, PlanName) else str(plano)
-        
-        # Normalização simples de acentos/espacos/caixa
-        s = name.strip().lower()
-        # Remoção leve de acentos comuns
-        for a, b in [
-            ("á", "a"), ("à", "a"), ("â", "a"), ("ã", "a"),
-            ("é", "e"), ("ê", "e"), ("í", "i"),
-            ("ó", "o"), ("ô", "o"), ("õ", "o"),
-            ("ú", "u"), ("ç", "c"),
-        ]:
-            s = s.replace(a, b)
-        
-        if s == "mensal solo" or "mensal solo" in s:
-            return 3
-        if s == "mensal plus" or "mensal plus" in s:
-            return 8
-        if s == "anual pro" or "anual pro" in s:
-            return 15
-        if s == "parceiro" or "parceiro" in s:
-            return 1
-        # Teste gratuito se comporta como Mensal Solo (3 slots)
-        if s == "teste gratuito" or "teste" in s or "gratis" in s or "gratuito" in s:
-            return 3
-        if s == "super" or "super" in s:
-            return 999
-        return 1
-    
+        # Teste gratuito se comporta como Mensal Solo (3 slots); ver services/plan_catalog.py
+        return plan_spec(name).slots
+
     def calcular_slots_base_e_extras(
         self, plano: Optional[str], slots_configurados: Optional[int]
     ) -> Dict[str, int]:
@@ -93,9 +70,7 @@ class PlanService:
         """Vincula compra aprovada ao usuário e ativa o plano."""
         TESTE_GRATUITO_DURACAO_DIAS = 7  # Configurável
         
-        is_trial_plan = any(
-            keyword in plano.lower() for keyword in ["gratuito", "grátis", "teste"]
-        )
+        is_trial_plan = plan_spec(plano).trial
         
         if is_trial_plan and self.usuario_ja_usou_teste(user_id):
             raise ValueError("Você já utilizou o período de teste gratuito.")
@@ -222,32 +197,16 @@ class PlanService:
         self.db.commit()
     
     def verificar_expiracao_planos(self) -> list:
-        """Retorna usuários com planos próximos do vencimento."""
-        dias_alerta = [7, 3, 1, 0]  # Avisos em 7, 3, 1 dias e no vencimento
-        usuarios_para_notificar = []
-        
-        for dias in dias_alerta:
-            data_limite = datetime.now() + timedelta(days=dias)
-            
-            users = (
-                self.db.query(UserAccount)
-                .filter(
-                    and_(
-                        UserAccount.status == "active",
-                        UserAccount.plan_expires_at <= data_limite,
-                        UserAccount.plan_expires_at > datetime.now(),
-                    )
-                )
-                .all()
+        """Retorna usuários com planos vencendo em 7, 3, 1 ou 0 dias (uma consulta só)."""
+        agora = datetime.now(timezone.utc)
+        return [
+            {
+                "user_id": user_id,
+                "email": email,
+                "plan": plan,
+                "dias_restantes": dias_restantes,
+            }
+            for user_id, email, plan, _, dias_restantes in self.db.execute(
+                expiry_reminder_query(agora)
             )
-            
-            for user in users:
-                dias_restantes = (user.plan_expires_at - datetime.now()).days
-                usuarios_para_notificar.append({
-                    "user_id": user.id,
-                    "email": user.email,
-                    "plan": user.plan,
-                    "dias_restantes": dias_restantes,
-                })
-        
-        return usuarios_para_notificar
\ No newline at end of file
+        ]
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""Varreduras diárias de planos feitas em conjunto, sem percorrer usuários em Python.
+
+- revogação de testes vencidos: as grafias de plano dos vencidos (`SELECT DISTINCT`,
+  poucas) passam por `plan_spec`, e as que o catálogo marca como teste entram num
+  `UPDATE users ... WHERE id IN (SELECT ... LIMIT n) RETURNING id, username` em lotes,
+  seguido de um UPDATE nas configurações dos ids devolvidos; cada lote é uma
+  transação curta;
+- lembretes de expiração: uma consulta só, com cada usuário classificado no balde
+  (7, 3, 1 ou 0 dias) cuja faixa de `plan_expires_at` contém o vencimento.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import Select, and_, case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..metrics import metrics
+from ..models import UserAccount, UserChannelConfig
+from ..repositories.user_config import invalidate_configs
+from ..security.principal import invalidate_principals
+from .plan_catalog import FREE_PLAN, plan_spec
+
+logger = logging.getLogger(__name__)
+
+REMINDER_DAYS: tuple[int, ...] = (7, 3, 1, 0)
+TRIAL_EXPIRED_STATUS = "trial_expired"
+DISABLED_MONITOR_MODE = "DESATIVADO"
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class ExpiryReminder:
+    user_id: int
+    email: str | None
+    plan: str
+    expires_at: datetime
+    days_left: int
+
+
+def _expired_clause(now: datetime):
+    return and_(
+        UserAccount.plan_expires_at.is_not(None),
+        UserAccount.plan_expires_at < now,
+        UserAccount.status == "active",
+    )
+
+
+async def _trial_plans(
+    session_factory: async_sessionmaker[AsyncSession], now: datetime
+) -> list[str]:
+    """Grafias de plano, entre os planos vencidos, que o catálogo classifica como teste.
+
+    A classificação é a mesma de `plan_spec` (acentos, ordem das palavras-chave), e não
+    um ILIKE que divergiria dela.
+    """
+
+    async with session_factory() as session:
+        plans = await session.scalars(
+            select(UserAccount.plan).where(_expired_clause(now)).distinct()
+        )
+        return [plan for plan in plans if plan is not None and plan_spec(plan).trial]
+
+
+async def revoke_expired_trials(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    now: datetime | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[int]:
+    """Revoga todos os testes vencidos em lotes de `chunk_size`; devolve os ids revogados."""
+
+    now = now or datetime.now(timezone.utc)
+    trial_plans = await _trial_plans(session_factory, now)
+    revoked: list[int] = []
+    while trial_plans:
+        batch = (
+            select(UserAccount.id)
+            .where(UserAccount.plan.in_(trial_plans), _expired_clause(now))
+            .order_by(UserAccount.id)
+            .limit(chunk_size)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(UserAccount)
+            .where(UserAccount.id.in_(batch))
+            .values(
+                plan=FREE_PLAN,
+                status=TRIAL_EXPIRED_STATUS,
+                plan_expires_at=None,
+                updated_at=now,
+            )
+            .returning(UserAccount.id, UserAccount.username)
+            .execution_options(synchronize_session=False)
+        )
+        async with session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+            ids = [user_id for user_id, _ in rows]
+            if ids:
+                # configuração fica desativada, sem apagar streamers nem histórico
+                await session.execute(
+                    update(UserChannelConfig)
+                    .where(UserChannelConfig.user_id.in_(ids))
+                    .values(monitor_mode=DISABLED_MONITOR_MODE, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
+        await invalidate_principals(username for _, username in rows)
+        await invalidate_configs(ids)
+        revoked.extend(ids)
+        if len(ids) < chunk_size:
+            break
+
+    metrics.incr("trials_revoked", len(revoked))
+    logger.info("trials_revoked", extra={"count": len(revoked)})
+    return revoked
+
+
+def expiry_reminder_query(
+    now: datetime, days: Sequence[int] = REMINDER_DAYS
+) -> Select[tuple[int, str | None, str, datetime, int]]:
+    """Usuários ativos cujo plano vence em exatamente `d` dias (faixa `[now+d, now+d+1)`),
+    já com o balde calculado pelo banco."""
+
+    ranges = [
+        (day, now + timedelta(days=day), now + timedelta(days=day + 1)) for day in sorted(days)
+    ]
+    bucket = case(
+        *(
+            (and_(UserAccount.plan_expires_at >= start, UserAccount.plan_expires_at < end), day)
+            for day, start, end in ranges
+        )
+    )
+    in_any_range = or_(
+        *(
+            and_(UserAccount.plan_expires_at >= start, UserAccount.plan_expires_at < end)
+            for _, start, end in ranges
+        )
+    )
+    return (
+        select(
+            UserAccount.id,
+            UserAccount.email,
+            UserAccount.plan,
+            UserAccount.plan_expires_at,
+            bucket.label("days_left"),
+        )
+        .where(UserAccount.status == "active", UserAccount.plan_expires_at > now, in_any_range)
+        .order_by(UserAccount.plan_expires_at, UserAccount.id)
+    )
+
+
+async def expiring_plans(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    now: datetime | None = None,
+    days: Sequence[int] = REMINDER_DAYS,
+) -> list[ExpiryReminder]:
+    now = now or datetime.now(timezone.utc)
+    async with session_factory() as session:
+        rows = (await session.execute(expiry_reminder_query(now, days))).all()
+    return [ExpiryReminder(*row) for row in rows]
+
+
+__all__ = [
+    "ExpiryReminder",
+    "REMINDER_DAYS",
+    "expiring_plans",
+    "expiry_reminder_query",
+    "revoke_expired_trials",
+]
@@ -0,0 +1,146 @@
+"""Agendamento adaptativo do polling de clipes por streamer.
+
+Cada streamer ativo vive num ZSET do Redis com score = próximo horário (epoch) em que
+deve ser consultado na Helix. O beat só dispara um tick curto; a cada tick o coordenador
+reivindica os streamers vencidos e, após sincronizá-los, reagenda cada um conforme o
+resultado: bursts aceleram o polling, clipes novos mantêm o intervalo base e streamers
+ociosos recuam exponencialmente até um teto.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+DUE_KEY = "clipador:ingestion:due"
+INTERVALS_KEY = "clipador:ingestion:interval"
+
+# Reivindica atomicamente os membros vencidos empurrando o score para `claim_until`,
+# assim outro tick não pega o mesmo streamer enquanto ele está sendo processado.
+_CLAIM_SCRIPT = """
+local due = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[3])
+for _, member in ipairs(due) do
+    redis.call("ZADD", KEYS[1], "XX", ARGV[2], member)
+end
+return due
+"""
+
+
+@dataclass(slots=True)
+class PollOutcome:
+    """Resultado da sincronização de um streamer, usado para reagendá-lo."""
+
+    streamer_id: int
+    new_clips: int = 0
+    bursts: int = 0
+    failed: bool = False
+    base_interval: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PollingPolicy:
+    min_interval: int = 30
+    base_interval: int = 180
+    max_interval: int = 1800
+    backoff_factor: float = 2.0
+
+    def next_interval(self, previous: int | None, outcome: PollOutcome) -> int:
+        base = outcome.base_interval or self.base_interval
+        if outcome.bursts and not outcome.failed:
+            return self.min_interval
+        if outcome.new_clips and not outcome.failed:
+            return max(self.min_interval, min(base, self.max_interval))
+        # ocioso ou com erro: recua a partir do intervalo anterior (nunca abaixo do base)
+        current = max(previous or base, base)
+        return max(self.min_interval, min(int(current * self.backoff_factor), self.max_interval))
+
+
+class PollingScheduler:
+    """Fila de prioridade de streamers a consultar, mantida num ZSET do Redis."""
+
+    def __init__(
+        self,
+        redis: Any,
+        policy: PollingPolicy | None = None,
+        *,
+        due_key: str = DUE_KEY,
+        intervals_key: str = INTERVALS_KEY,
+    ):
+        self._redis = redis
+        self.policy = policy or PollingPolicy()
+        self.due_key = due_key
+        self.intervals_key = intervals_key
+
+    async def sync_members(self, streamer_ids: Iterable[int], *, now: float | None = None) -> None:
+        """Inclui streamers novos (vencidos imediatamente) e remove os inativos."""
+
+        now = time.time() if now is None else now
+        wanted = {str(streamer_id) for streamer_id in streamer_ids}
+        current = {_decode(member) for member in await self._redis.zrange(self.due_key, 0, -1)}
+
+        pipe = self._redis.pipeline(transaction=False)
+        added = wanted - current
+        if added:
+            pipe.zadd(self.due_key, {member: now for member in added}, nx=True)
+        stale = current - wanted
+        if stale:
+            pipe.zrem(self.due_key, *stale)
+            pipe.hdel(self.intervals_key, *stale)
+        if added or stale:
+            await pipe.execute()
+
+    async def claim_due(
+        self, *, now: float | None = None, claim_seconds: float = 600, limit: int = 500
+    ) -> list[int]:
+        now = time.time() if now is None else now
+        members = await self._redis.eval(
+            _CLAIM_SCRIPT, 1, self.due_key, now, now + claim_seconds, limit
+        )
+        return [int(_decode(member)) for member in members]
+
+    async def release(self, streamer_ids: Iterable[int], *, now: float | None = None) -> None:
+        """Devolve streamers reivindicados e não sincronizados, vencidos a partir de `now`."""
+
+        now = time.time() if now is None else now
+        members = {str(streamer_id): now for streamer_id in streamer_ids}
+        if members:
+            await self._redis.zadd(self.due_key, members, xx=True)
+
+    async def reschedule(
+        self, outcomes: Iterable[PollOutcome], *, now: float | None = None
+    ) -> dict[int, int]:
+        """Grava o próximo horário de cada streamer e devolve os intervalos escolhidos."""
+
+        outcomes = list(outcomes)
+        if not outcomes:
+            return {}
+        now = time.time() if now is None else now
+        members = [str(outcome.streamer_id) for outcome in outcomes]
+        previous = await self._redis.hmget(self.intervals_key, members)
+
+        intervals: dict[int, int] = {}
+        pipe = self._redis.pipeline(transaction=False)
+        for outcome, member, prev in zip(outcomes, members, previous, strict=True):
+            interval = self.policy.next_interval(int(prev) if prev else None, outcome)
+            intervals[outcome.streamer_id] = interval
+            pipe.zadd(self.due_key, {member: now + interval}, xx=True)
+        pipe.hset(self.intervals_key, mapping={str(sid): value for sid, value in intervals.items()})
+        await pipe.execute()
+        return intervals
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def outcomes_for(
+    streamer_ids: Iterable[int], results: Mapping[int, PollOutcome]
+) -> list[PollOutcome]:
+    """Completa `results` com desfechos ociosos para streamers que não foram consultados."""
+
+    return [results.get(streamer_id) or PollOutcome(streamer_id) for streamer_id in streamer_ids]
+
+
+__all__ = ["PollOutcome", "PollingPolicy", "PollingScheduler", "outcomes_for"]
@@ -0,0 +1,209 @@
+"""Limpeza de retenção em lotes para as tabelas append-only.
+
+Cada política apaga linhas mais antigas que `max_age_days` em lotes ordenados pela PK:
+seleciona até `chunk_size` ids acima do último checkpoint, apaga por `id IN (...)` e
+grava o checkpoint na mesma transação curta. Entre lotes há uma pausa para não disputar
+I/O e WAL com o tráfego normal. Um ciclo interrompido retoma do checkpoint (e com o
+mesmo corte de data) na próxima execução.
+
+Tabelas particionadas por mês no Postgres (`PARTITIONED_TABLES`) não entram aqui: lá a
+retenção é um `DETACH`/`DROP` da partição inteira em `maintain_partitions`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..metrics import metrics
+from ..models import RetentionProgress, WebhookStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    table: str
+    max_age_days: int
+    time_column: str | None = "created_at"
+    pk: str = "id"
+    timezone_aware: bool = True
+    # Tabelas sem coluna de tempo própria expiram junto com a linha pai:
+    # (tabela pai, fk local, coluna de tempo do pai)
+    parent: tuple[str, str, str] | None = None
+    # Só expiram linhas com `status` nesta lista (vazia: todas)
+    statuses: tuple[str, ...] = ()
+
+    def cutoff(self, now: datetime) -> datetime:
+        cutoff = now - timedelta(days=self.max_age_days)
+        return cutoff if self.timezone_aware else cutoff.replace(tzinfo=None)
+
+    def expired_clause(self, table: sa.TableClause, cutoff: datetime) -> sa.ColumnElement[bool]:
+        time_type = sa.DateTime(timezone=self.timezone_aware)
+        if self.parent is not None:
+            parent_name, fk, parent_time = self.parent
+            parent = sa.table(parent_name, sa.column("id"), sa.column(parent_time, time_type))
+            return table.c[fk].in_(sa.select(parent.c.id).where(parent.c[parent_time] < cutoff))
+        assert self.time_column is not None
+        expired = sa.column(self.time_column, time_type) < cutoff
+        if self.statuses:
+            expired = sa.and_(expired, sa.column("status").in_(self.statuses))
+        return expired
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    table: str
+    deleted: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    completed: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.deleted / self.elapsed if self.elapsed else 0.0
+
+
+def default_policies(
+    *,
+    historico_days: int = 90,
+    deliveries_days: int = 180,
+    clips_days: int = 365,
+    webhook_days: int = 30,
+    partitioned: Collection[str] = (),
+) -> list[RetentionPolicy]:
+    """Políticas padrão, filhos antes dos pais para não depender de cascatas grandes.
+
+    Tabelas em `partitioned` expiram por partição e ficam fora da limpeza por linha. Da
+    caixa de entrada de webhooks só saem eventos já encerrados (`processed`/`failed`);
+    os pendentes ficam para o worker.
+    """
+
+    policies = [
+        RetentionPolicy("historico_envio", historico_days, "criado_em", timezone_aware=False),
+        RetentionPolicy("clip_deliveries", deliveries_days, "burst_start"),
+        RetentionPolicy(
+            "burst_clips", clips_days, None, parent=("bursts", "burst_id", "start_time")
+        ),
+        RetentionPolicy("bursts", clips_days, "start_time"),
+        RetentionPolicy("clips", clips_days, "created_at"),
+        RetentionPolicy(
+            "webhook_inbox",
+            webhook_days,
+            "received_at",
+            statuses=(WebhookStatus.PROCESSED.value, WebhookStatus.FAILED.value),
+        ),
+    ]
+    return [policy for policy in policies if policy.table not in partitioned]
+
+
+class RetentionService:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        policies: list[RetentionPolicy],
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sleep_seconds: float = 0.1,
+        max_chunks: int | None = None,
+    ):
+        self._session_factory = session_factory
+        self.policies = policies
+        self.chunk_size = chunk_size
+        self.sleep_seconds = sleep_seconds
+        self.max_chunks = max_chunks
+
+    async def run(self, *, now: datetime | None = None) -> list[RetentionReport]:
+        now = now or datetime.now(timezone.utc)
+        reports = []
+        for policy in self.policies:
+            if not await self._table_exists(policy.table):
+                logger.info("retention_table_missing", extra={"table": policy.table})
+                continue
+            reports.append(await self.run_policy(policy, now=now))
+        return reports
+
+    async def run_policy(self, policy: RetentionPolicy, *, now: datetime) -> RetentionReport:
+        report = RetentionReport(policy.table)
+        table = sa.table(policy.table, sa.column(policy.pk))
+        if policy.parent is not None:
+            table.append_column(sa.column(policy.parent[1]))
+        pk = table.c[policy.pk]
+        started = time.monotonic()
+
+        while self.max_chunks is None or report.chunks < self.max_chunks:
+            async with self._session_factory() as session, session.begin():
+                progress = await session.get(RetentionProgress, policy.table)
+                if progress is None:
+                    progress = RetentionProgress(
+                        table_name=policy.table, last_pk=0, rows_deleted=0, runs=0
+                    )
+                    session.add(progress)
+                if not progress.last_pk or progress.cutoff is None:
+                    progress.cutoff = policy.cutoff(now)
+                cutoff = progress.cutoff
+                if policy.timezone_aware and cutoff.tzinfo is None:
+                    cutoff = cutoff.replace(tzinfo=timezone.utc)
+                elif not policy.timezone_aware:
+                    cutoff = cutoff.replace(tzinfo=None)
+
+                ids = (
+                    await session.execute(
+                        sa.select(pk)
+                        .select_from(table)
+                        .where(pk > progress.last_pk, policy.expired_clause(table, cutoff))
+                        .order_by(pk)
+                        .limit(self.chunk_size)
+                    )
+                ).scalars().all()
+
+                if not ids:
+                    # ciclo completo: o próximo começa do zero com um corte novo
+                    progress.last_pk = 0
+                    progress.cutoff = None
+                    progress.runs = (progress.runs or 0) + 1
+                    report.completed = True
+                    break
+
+                await session.execute(sa.delete(table).where(pk.in_(ids)))
+                progress.last_pk = ids[-1]
+                progress.rows_deleted = (progress.rows_deleted or 0) + len(ids)
+
+            report.deleted += len(ids)
+            report.chunks += 1
+            metrics.incr("retention_rows_deleted", len(ids), table=policy.table)
+            if self.sleep_seconds:
+                await asyncio.sleep(self.sleep_seconds)
+
+        report.elapsed = time.monotonic() - started
+        metrics.observe("retention_rows_per_second", report.rows_per_second, table=policy.table)
+        logger.info(
+            "retention_table_done",
+            extra={
+                "table": policy.table,
+                "deleted": report.deleted,
+                "chunks": report.chunks,
+                "completed": report.completed,
+                "rows_per_second": round(report.rows_per_second, 1),
+            },
+        )
+        return report
+
+    async def _table_exists(self, name: str) -> bool:
+        async with self._session_factory() as session:
+            connection = await session.connection()
+            return await connection.run_sync(
+                lambda sync_conn: sa.inspect(sync_conn).has_table(name)
+            )
+
+
+__all__ = ["RetentionPolicy", "RetentionReport", "RetentionService", "default_policies"]
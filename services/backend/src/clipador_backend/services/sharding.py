@@ -0,0 +1,50 @@
+"""Particionamento consistente de streamers entre shards de ingestão."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from collections.abc import Iterable, Hashable
+
+DEFAULT_VIRTUAL_NODES = 64
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Anel de hash consistente com nós virtuais.
+
+    Mudar o número de shards só move a fração de chaves que cai nos shards
+    adicionados/removidos, então leases e caches por shard continuam majoritariamente válidos.
+    """
+
+    def __init__(self, shards: int, *, virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self.shards = shards
+        points = sorted(
+            (_hash(f"shard-{shard}#{replica}"), shard)
+            for shard in range(shards)
+            for replica in range(virtual_nodes)
+        )
+        self._keys = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard_for(self, key: Hashable) -> int:
+        if self.shards == 1:
+            return 0
+        index = bisect.bisect(self._keys, _hash(str(key))) % len(self._keys)
+        return self._owners[index]
+
+    def partition(self, keys: Iterable[Hashable]) -> dict[int, list]:
+        """Agrupa `keys` por shard, omitindo shards vazios."""
+
+        shards: dict[int, list] = {}
+        for key in keys:
+            shards.setdefault(self.shard_for(key), []).append(key)
+        return shards
+
+
+__all__ = ["HashRing"]
@@ -0,0 +1,269 @@
+"""Caixa de entrada dos webhooks da Kirvano.
+
+A rota só confere o token, calcula a chave de idempotência e grava o payload bruto em
+`webhook_inbox` (um INSERT), respondendo 200 na hora — a Kirvano reenvia quando a
+resposta demora, e cada reenvio repetiria todo o processamento de cobrança. O worker
+(`clipador.webhooks.drain`) consome a fila em lotes, na ordem de chegada, e aplica cada
+evento numa `BillingUnitOfWork` (`services/billing.py`) que participa da transação do
+próprio evento: a cobrança e o status na caixa de entrada são gravados no mesmo commit,
+então um worker que cai no meio não reaplica (nem renova duas vezes) um evento já feito.
+
+As chaves já aceitas ficam num cache em processo: reenvios do mesmo evento voltam sem
+tocar no banco, e a restrição única da tabela cobre o que o cache ainda não viu. Os
+eventos encerrados saem da tabela pela retenção (`services/retention.py`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..cache import TTLCache
+from ..metrics import metrics
+from ..models import WebhookEvent, WebhookStatus
+from ..security.principal import invalidate_principals
+from .billing import BillingUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+KIRVANO = "kirvano"
+SALE_APPROVED = "SALE_APPROVED"
+RENEWED_EVENT = "subscription.renewed"
+ENDED_EVENTS = frozenset(
+    {
+        "subscription.canceled",
+        "subscription.expired",
+        "purchase.refunded",
+        "purchase.chargeback",
+        "subscription.late",
+    }
+)
+_MAX_KEY_LENGTH = 160
+
+seen_keys: TTLCache[tuple[str, str], bool] = TTLCache(maxsize=10_000, ttl=24 * 3600.0)
+
+# aplica o payload na sessão recebida, sem commit; devolve os usernames a invalidar
+WebhookHandler = Callable[[dict[str, Any], AsyncSession], Awaitable[Sequence[str]]]
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def kirvano_idempotency_key(
+    payload: dict[str, Any], *, received_at: datetime | None = None
+) -> str:
+    """Chave que identifica um evento entre reenvios; `ValueError` se faltar dado obrigatório.
+
+    Uma venda é aprovada uma vez só, então `SALE_APPROVED` usa o `sale_id`. Os demais
+    eventos (renovação, atraso, cancelamento...) se repetem legitimamente para a mesma
+    venda: a chave leva o instante do evento (`created_at` do payload) ou, sem ele, o dia
+    do recebimento — a unicidade vale só dentro dessa janela, e um reenvio de outro dia
+    passa como evento novo.
+    """
+
+    if not (payload.get("customer") or {}).get("email"):
+        raise ValueError("Email missing")
+    event_type = payload.get("event") or ""
+    sale_id = payload.get("sale_id")
+    if event_type == SALE_APPROVED:
+        if not sale_id:
+            raise ValueError("sale_id missing")
+        key = f"sale:{sale_id}"
+    else:
+        if not sale_id:
+            # sem sale_id, o próprio conteúdo identifica o reenvio
+            body = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+            sale_id = _digest(body)
+        occurred = payload.get("created_at") or (
+            (received_at or datetime.now(timezone.utc)).date().isoformat()
+        )
+        key = f"{event_type}:{sale_id}:{occurred}"
+    return key if len(key) <= _MAX_KEY_LENGTH else _digest(key)
+
+
+async def accept_webhook(
+    session: AsyncSession, source: str, key: str, payload: dict[str, Any]
+) -> bool:
+    """Grava o evento na caixa de entrada; `False` se a chave já tinha sido recebida."""
+
+    if seen_keys.get((source, key)):
+        metrics.incr("webhook_duplicates", source=source, layer="cache")
+        return False
+
+    session.add(
+        WebhookEvent(
+            source=source,
+            idempotency_key=key,
+            event_type=(payload.get("event") or None),
+            payload=payload,
+            status=WebhookStatus.PENDING.value,
+            attempts=0,
+        )
+    )
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        seen_keys.set((source, key), True)
+        metrics.incr("webhook_duplicates", source=source, layer="db")
+        return False
+    seen_keys.set((source, key), True)
+    metrics.incr("webhook_received", source=source)
+    return True
+
+
+async def apply_kirvano_event(
+    payload: dict[str, Any], session: AsyncSession | None = None
+) -> list[str]:
+    """Aplica o evento; com `session`, dentro da transação de quem chamou, sem commit.
+
+    Sem `session`, abre a própria unidade (uma sessão e um commit por evento).
+    Devolve os usernames alterados.
+    """
+
+    event_type = payload.get("event")
+    email = payload["customer"]["email"]
+    status_value = payload.get("status")
+
+    async with BillingUnitOfWork(session=session) as uow:
+        if event_type in ENDED_EVENTS:
+            await uow.mark_subscription_ended(email, status_value or "canceled")
+        elif event_type == RENEWED_EVENT:
+            plan = payload.get("plan", {}).get("name", "")
+            await uow.mark_subscription_renewed(email, plan)
+        elif event_type == SALE_APPROVED:
+            product = (payload.get("products") or [{}])[0]
+            plan = product.get("offer_name") or payload.get("plan", {}).get("name", "")
+            await uow.register_purchase(
+                email, plan, status_value or "approved", payload["sale_id"], payload
+            )
+        else:
+            logger.info("kirvano_event_unhandled", extra={"event": event_type})
+    return uow.changed
+
+
+@dataclass(frozen=True, slots=True)
+class DrainReport:
+    processed: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+@dataclass(slots=True)
+class InboxDrainer:
+    """Aplica os eventos pendentes em lotes de `batch_size`, do mais antigo ao mais novo.
+
+    Cada evento é uma transação: a linha é travada com `FOR UPDATE SKIP LOCKED` (no
+    Postgres), o handler aplica a cobrança na mesma sessão e o status `processed` sai
+    no mesmo commit — vários workers podem drenar ao mesmo tempo sem aplicar um evento
+    duas vezes. Um evento que falha tem a transação desfeita, continua pendente e é
+    tentado de novo na próxima drenagem, até `max_attempts`.
+    """
+
+    session_factory: async_sessionmaker[AsyncSession]
+    handler: WebhookHandler = apply_kirvano_event
+    source: str = KIRVANO
+    batch_size: int = 100
+    max_attempts: int = 5
+
+    def _claim(self, event_id: int):
+        return (
+            select(WebhookEvent)
+            .where(
+                WebhookEvent.id == event_id,
+                WebhookEvent.status == WebhookStatus.PENDING.value,
+            )
+            .with_for_update(skip_locked=True)
+        )
+
+    async def _apply(self, session: AsyncSession, event_id: int) -> str | None:
+        """Aplica um evento; devolve o status final, ou `None` se outro worker o pegou."""
+
+        event = (await session.scalars(self._claim(event_id))).one_or_none()
+        if event is None:
+            return None
+        try:
+            changed = await self.handler(event.payload, session)
+            event.attempts += 1
+            event.status = WebhookStatus.PROCESSED.value
+            event.processed_at = datetime.now(timezone.utc)
+            event.error = None
+            await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            logger.exception("webhook_event_failed", extra={"event_id": event_id})
+            return await self._record_failure(session, event_id, exc)
+        await invalidate_principals(changed)
+        return WebhookStatus.PROCESSED.value
+
+    async def _record_failure(
+        self, session: AsyncSession, event_id: int, exc: Exception
+    ) -> str | None:
+        # transação nova: nada do que o handler escreveu sobrevive ao rollback
+        event = (await session.scalars(self._claim(event_id))).one_or_none()
+        if event is None:
+            return None
+        event.attempts += 1
+        event.error = str(exc)[:2000]
+        outcome = WebhookStatus.PENDING.value
+        if event.attempts >= self.max_attempts:
+            outcome = event.status = WebhookStatus.FAILED.value
+        await session.commit()
+        return outcome
+
+    async def drain(self) -> DrainReport:
+        processed = retried = failed = 0
+        last_id = 0
+        while True:
+            async with self.session_factory() as session:
+                event_ids = (
+                    await session.scalars(
+                        select(WebhookEvent.id)
+                        .where(
+                            WebhookEvent.source == self.source,
+                            WebhookEvent.status == WebhookStatus.PENDING.value,
+                            WebhookEvent.id > last_id,
+                        )
+                        .order_by(WebhookEvent.id)
+                        .limit(self.batch_size)
+                    )
+                ).all()
+                await session.rollback()
+                for event_id in event_ids:
+                    outcome = await self._apply(session, event_id)
+                    if outcome == WebhookStatus.PROCESSED.value:
+                        processed += 1
+                    elif outcome == WebhookStatus.FAILED.value:
+                        failed += 1
+                    elif outcome == WebhookStatus.PENDING.value:
+                        retried += 1
+            if event_ids:
+                last_id = event_ids[-1]
+            if len(event_ids) < self.batch_size:
+                break
+
+        metrics.incr("webhook_events", processed, source=self.source, status="processed")
+        metrics.incr("webhook_events", retried, source=self.source, status="retried")
+        metrics.incr("webhook_events", failed, source=self.source, status="failed")
+        return DrainReport(processed=processed, retried=retried, failed=failed)
+
+
+__all__ = [
+    "DrainReport",
+    "InboxDrainer",
+    "KIRVANO",
+    "accept_webhook",
+    "apply_kirvano_event",
+    "kirvano_idempotency_key",
+    "seen_keys",
+]
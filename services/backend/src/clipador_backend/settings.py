@@ -12,13 +12,50 @@ class Settings(BaseSettings):
 
     app_env: str = "development"
     database_url: str
+    database_replica_url: Optional[str] = None
+    # leituras voltam ao primário quando a réplica atrasa mais que isso (ou não responde)
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_seconds: float = 2.0
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    # 0 desliga o cache de prepared statements (necessário atrás de PgBouncer em modo transaction)
+    db_statement_cache_size: int = 100
+    db_statement_timeout_ms: Optional[int] = 30000
     twitch_client_id: Optional[str] = None
     twitch_client_secret: Optional[str] = None
+    twitch_api_base_url: str = "https://api.twitch.tv/helix"
+    twitch_auth_url: str = "https://id.twitch.tv/oauth2/token"
     jwt_secret: str = "change-me"
     jwt_access_minutes: int = 60
     jwt_refresh_days: int = 14
+    principal_cache_seconds: float = 60.0
+    # snapshot de /config/me por usuário; status vindos dos workers aparecem ao expirar
+    config_cache_seconds: float = 10.0
+    password_hash_workers: int = 4
     redis_url: str = "redis://localhost:6379/0"
+    ingestion_shards: int = 1
+    ingestion_lease_seconds: int = 600
+    partition_months_ahead: int = 3
+    clips_retention_months: int = 12
+    deliveries_retention_months: int = 6
+    partition_drop_detached: bool = True
+    historico_retention_days: int = 90
+    retention_chunk_size: int = 5000
+    retention_sleep_seconds: float = 0.1
+    trial_sweep_chunk_size: int = 1000
+    export_dir: str = "var/exports"
+    export_row_group_size: int = 50_000
+    export_ttl_hours: int = 72
+    export_stuck_minutes: int = 360
+    export_job_retention_days: int = 30
     kirvano_token: Optional[str] = None
+    webhook_drain_batch_size: int = 100
+    webhook_max_attempts: int = 5
+    webhook_inbox_retention_days: int = 30
     cors_origins: list[str] = Field(
         default_factory=lambda: [
             "http://localhost:3000",
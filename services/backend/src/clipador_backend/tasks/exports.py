@@ -0,0 +1,65 @@
+"""Celery tasks de exportação assíncrona de clipes."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+from datetime import timedelta
+
+from ..celery_app import celery_app
+from ..db import get_read_session_factory, get_session_factory
+from ..services.exports import ExportRunner, sweep_exports
+from ..settings import get_settings
+from .runtime import run_coroutine
+
+logger = logging.getLogger(__name__)
+
+
+async def run_export(job_id: str) -> str:
+    settings = get_settings()
+    runner = ExportRunner(
+        get_session_factory(),
+        await get_read_session_factory(),
+        settings.export_dir,
+        row_group_size=settings.export_row_group_size,
+    )
+    job = await runner.run(job_id)
+    return job.status if job is not None else "missing"
+
+
+@celery_app.task(name="clipador.exports.run")
+def run_export_task(job_id: str) -> str:
+    """Gera o arquivo de um `ExportJob`; o progresso fica gravado no próprio job."""
+
+    try:
+        status = run_coroutine(run_export(job_id))
+        logger.info("export_job_finished", extra={"job_id": job_id, "status": status})
+        return status
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("export_job_crashed", extra={"job_id": job_id, "error": str(exc)})
+        raise
+
+
+async def run_export_sweep() -> dict[str, int]:
+    settings = get_settings()
+    sweep = await sweep_exports(
+        get_session_factory(),
+        settings.export_dir,
+        ttl=timedelta(hours=settings.export_ttl_hours),
+        stuck_after=timedelta(minutes=settings.export_stuck_minutes),
+        keep_jobs=timedelta(days=settings.export_job_retention_days),
+    )
+    return asdict(sweep)
+
+
+@celery_app.task(name="clipador.exports.sweep")
+def sweep_exports_task() -> dict[str, int]:
+    """Apaga arquivos vencidos, encerra jobs presos e remove registros antigos."""
+
+    try:
+        swept = run_coroutine(run_export_sweep())
+        logger.info("export_sweep_completed", extra={"swept": swept})
+        return swept
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("export_sweep_failed", extra={"error": str(exc)})
+        raise
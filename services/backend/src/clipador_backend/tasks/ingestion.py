@@ -2,30 +2,151 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
 
 from ..celery_app import celery_app
-from ..adapters.twitch import TwitchAPI
+from ..db import session_scope
+from ..metrics import metrics
+from ..repositories.streamers import StreamerRepository
 from ..services.ingestion import ClipIngestionService
+from ..services.leases import LeaseLostError, RedisLease
+from ..services.polling import PollingScheduler, outcomes_for
+from ..services.sharding import HashRing
+from ..settings import get_settings
+from .runtime import run_coroutine, runtime
+
+T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
+COORDINATOR_LEASE_KEY = "clipador:ingestion:coordinator"
+SHARD_LEASE_KEY = "clipador:ingestion:shard:{shard}"
+
+
+async def _run_leased(
+    key: str, scope: str, work: Callable[[RedisLease], Awaitable[T]]
+) -> tuple[bool, T | None]:
+    """Executa `work(lease)` somente se o lease de `key` estiver livre, renovando-o enquanto roda.
+
+    Ticks que encontram o lease ocupado não esperam nem enfileiram: são coalescidos
+    com o ciclo em andamento e contabilizados em `ingestion_ticks_skipped`. `work` deve
+    chamar `lease.check()` antes de escrever; se a renovação falhou, o ciclo é
+    abortado com `LeaseLostError` em vez de correr junto com o novo dono do lease.
+    """
+
+    lease = RedisLease(runtime.redis(), key, get_settings().ingestion_lease_seconds)
+    acquired = await lease.acquire()
+    metrics.observe("ingestion_lock_wait_seconds", lease.wait_seconds, scope=scope)
+    if not acquired:
+        metrics.incr("ingestion_ticks_skipped", scope=scope)
+        return False, None
+    try:
+        async with lease.keepalive():
+            result = await work(lease)
+        return True, result
+    except LeaseLostError:
+        metrics.incr("ingestion_lease_lost", scope=scope)
+        logger.warning("ingestion_lease_lost", extra={"key": key, "scope": scope})
+        raise
+    finally:
+        await lease.release()
+
+
+async def _sync(streamer_ids: list[int], lease: RedisLease) -> dict[int, int]:
+    # Cliente Twitch e pool do engine pertencem ao runtime do worker; não fechar aqui.
+    service = ClipIngestionService(runtime.twitch())
+    scheduler = PollingScheduler(runtime.redis())
+    try:
+        results = await service.sync_once(streamer_ids, checkpoint=lease.check)
+    except Exception:
+        # sem isso os streamers ficariam reivindicados até o fim de `ingestion_lease_seconds`
+        await scheduler.release(streamer_ids)
+        raise
+    # Streamers pulados (inativos, sem credenciais) também recuam no agendamento.
+    return await scheduler.reschedule(outcomes_for(streamer_ids, results))
+
+
+async def _claim_due_streamers() -> list[int]:
+    async with session_scope() as session:
+        active_ids = await StreamerRepository(session).list_active_streamer_ids()
+    scheduler = PollingScheduler(runtime.redis())
+    await scheduler.sync_members(active_ids)
+    return await scheduler.claim_due(claim_seconds=get_settings().ingestion_lease_seconds)
+
+
+async def _coordinate(shards: int, lease: RedisLease) -> list[int]:
+    due = await _claim_due_streamers()
+    if not due:
+        return due
+    if shards <= 1:
+        intervals = await _sync(due, lease)
+        logger.info(
+            "ingestion_task_completed",
+            extra={
+                "task": "clipador.ingestion.sync",
+                "streamers": len(due),
+                "intervals": intervals,
+            },
+        )
+        return due
+
+    partitions = HashRing(shards).partition(due)
+    lease.check()
+    for shard, streamer_ids in sorted(partitions.items()):
+        run_ingestion_shard_task.delay(shard, streamer_ids)
+    logger.info(
+        "ingestion_shards_enqueued",
+        extra={"shards": len(partitions), "streamers": len(due)},
+    )
+    return due
+
 
 @celery_app.task(name="clipador.ingestion.sync")
 def run_ingestion_task() -> None:
-    """Task executed periodicamente pelo Celery Beat para sincronizar clipes."""
+    """Tick do Celery Beat: consulta apenas os streamers cujo polling venceu.
 
-    async def _run() -> None:
-        service = ClipIngestionService(TwitchAPI())
-        try:
-            await service.sync_once()
-        finally:
-            await service.aclose()
+    Apenas um coordenador roda por vez (lease no Redis). Com `ingestion_shards > 1`
+    ele distribui os streamers vencidos entre shards por hash consistente e enfileira
+    um `sync_shard` por shard não vazio.
+    """
 
+    shards = get_settings().ingestion_shards
     try:
-        asyncio.run(_run())
-        logger.info("ingestion_task_completed", extra={"task": "clipador.ingestion.sync"})
+        ran, _ = run_coroutine(
+            _run_leased(
+                COORDINATOR_LEASE_KEY, "coordinator", lambda lease: _coordinate(shards, lease)
+            )
+        )
+        if not ran:
+            logger.info("ingestion_tick_coalesced", extra={"task": "clipador.ingestion.sync"})
     except Exception as exc:  # pragma: no cover - logged for monitoring
         logger.exception("ingestion_task_failed", extra={"error": str(exc)})
         raise
+
+
+@celery_app.task(name="clipador.ingestion.sync_shard")
+def run_ingestion_shard_task(shard: int, streamer_ids: list[int]) -> None:
+    """Sincroniza um shard de streamers sob um lease exclusivo no Redis."""
+
+    try:
+        ran, _ = run_coroutine(
+            _run_leased(
+                SHARD_LEASE_KEY.format(shard=shard),
+                "shard",
+                lambda lease: _sync(streamer_ids, lease),
+            )
+        )
+        if ran:
+            logger.info(
+                "ingestion_shard_completed",
+                extra={"shard": shard, "streamers": len(streamer_ids)},
+            )
+        else:
+            # o shard está ocupado: devolve os streamers para o próximo tick reivindicá-los
+            run_coroutine(PollingScheduler(runtime.redis()).release(streamer_ids))
+            logger.info("ingestion_shard_locked", extra={"shard": shard})
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("ingestion_shard_failed", extra={"shard": shard, "error": str(exc)})
+        raise
@@ -0,0 +1,130 @@
+"""Celery tasks de manutenção do banco."""
+
+from __future__ import annotations
+
+import logging
+
+from ..celery_app import celery_app
+from ..db import get_engine, get_read_session_factory, get_session_factory
+from ..services.partitions import PARTITIONED_TABLES, maintain_partitions
+from ..services.plan_sweeps import ExpiryReminder, expiring_plans, revoke_expired_trials
+from ..services.retention import RetentionService, default_policies
+from ..settings import get_settings
+from .runtime import run_coroutine
+
+logger = logging.getLogger(__name__)
+
+
+async def _maintain() -> dict[str, dict[str, list[str]]]:
+    settings = get_settings()
+    async with get_engine().begin() as conn:
+        plans = await maintain_partitions(
+            conn,
+            {
+                "clips": settings.clips_retention_months,
+                "clip_deliveries": settings.deliveries_retention_months,
+            },
+            months_ahead=settings.partition_months_ahead,
+            drop_detached=settings.partition_drop_detached,
+        )
+    return {
+        table: {
+            "created": [partition.name for partition in plan.to_create],
+            "expired": plan.to_drop,
+        }
+        for table, plan in plans.items()
+    }
+
+
+@celery_app.task(name="clipador.maintenance.partitions")
+def maintain_partitions_task() -> None:
+    """Cria as partições mensais futuras e remove as que saíram da retenção."""
+
+    try:
+        summary = run_coroutine(_maintain())
+        logger.info("partition_maintenance_completed", extra={"summary": summary})
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("partition_maintenance_failed", extra={"error": str(exc)})
+        raise
+
+
+async def run_retention() -> dict[str, int]:
+    """Executa um ciclo do motor de retenção e devolve as linhas apagadas por tabela.
+
+    No Postgres as tabelas particionadas ficam com `maintain_partitions`.
+    """
+
+    settings = get_settings()
+    partitioned = PARTITIONED_TABLES if get_engine().dialect.name == "postgresql" else ()
+    service = RetentionService(
+        get_session_factory(),
+        default_policies(
+            historico_days=settings.historico_retention_days,
+            deliveries_days=settings.deliveries_retention_months * 30,
+            clips_days=settings.clips_retention_months * 30,
+            webhook_days=settings.webhook_inbox_retention_days,
+            partitioned=partitioned,
+        ),
+        chunk_size=settings.retention_chunk_size,
+        sleep_seconds=settings.retention_sleep_seconds,
+    )
+    reports = await service.run()
+    return {report.table: report.deleted for report in reports}
+
+
+@celery_app.task(name="clipador.maintenance.retention")
+def retention_task() -> dict[str, int]:
+    """Apaga em lotes as linhas que passaram da retenção em cada tabela append-only."""
+
+    try:
+        deleted = run_coroutine(run_retention())
+        logger.info("retention_completed", extra={"deleted": deleted})
+        return deleted
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("retention_failed", extra={"error": str(exc)})
+        raise
+
+
+async def _revoke_trials() -> list[int]:
+    return await revoke_expired_trials(
+        get_session_factory(), chunk_size=get_settings().trial_sweep_chunk_size
+    )
+
+
+@celery_app.task(name="clipador.maintenance.revoke_trials")
+def revoke_trials_task() -> int:
+    """Revoga, em lotes de UPDATE ... RETURNING, os testes gratuitos vencidos."""
+
+    try:
+        revoked = run_coroutine(_revoke_trials())
+        logger.info("trial_revocation_completed", extra={"revoked": len(revoked)})
+        return len(revoked)
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("trial_revocation_failed", extra={"error": str(exc)})
+        raise
+
+
+async def _expiry_reminders() -> list[ExpiryReminder]:
+    return await expiring_plans(await get_read_session_factory())
+
+
+@celery_app.task(name="clipador.maintenance.expiry_reminders")
+def expiry_reminders_task() -> int:
+    """Seleciona numa consulta só os planos que vencem em 7, 3, 1 ou 0 dias."""
+
+    try:
+        reminders = run_coroutine(_expiry_reminders())
+        for reminder in reminders:
+            # Placeholder: enviar notificação por e-mail/in-app
+            logger.info(
+                "plan_expiry_reminder",
+                extra={
+                    "user_id": reminder.user_id,
+                    "days_left": reminder.days_left,
+                    "plan": reminder.plan,
+                },
+            )
+        return len(reminders)
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("expiry_reminders_failed", extra={"error": str(exc)})
+        raise
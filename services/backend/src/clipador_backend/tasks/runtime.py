@@ -0,0 +1,136 @@
+"""Runtime assíncrono compartilhado por processo de worker Celery.
+
+Cada processo do worker mantém um único event loop rodando numa thread dedicada.
+As tasks (síncronas para o Celery) submetem corrotinas a esse loop, reaproveitando
+o pool do engine async e o cliente HTTP da Twitch entre execuções em vez de recriá-los
+a cada `asyncio.run`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from redis import asyncio as redis_asyncio
+
+from .. import db as db_module
+from .. import redis_client
+from ..adapters.twitch import TwitchAPI
+from ..settings import get_settings
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """Event loop de longa duração com recursos async compartilhados."""
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._twitch: TwitchAPI | None = None
+        self._redis: redis_asyncio.Redis | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        assert self._loop is not None
+        return self._loop
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_serve, name="clipador-worker-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+            logger.info("worker_runtime_started")
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Executa `coro` no loop do worker e bloqueia até o resultado."""
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+    def twitch(self) -> TwitchAPI:
+        """Cliente Twitch do processo; deve ser usado apenas dentro do loop do runtime."""
+
+        if self._twitch is None:
+            self._twitch = TwitchAPI()
+        return self._twitch
+
+    def redis(self) -> redis_asyncio.Redis:
+        """Cliente Redis async do processo (leases de ingestão)."""
+
+        if self._redis is None:
+            self._redis = redis_asyncio.from_url(get_settings().redis_url)
+        return self._redis
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            self._loop = self._thread = None
+
+        twitch, self._twitch = self._twitch, None
+        redis, self._redis = self._redis, None
+
+        async def _close() -> None:
+            if twitch is not None:
+                await twitch.aclose()
+            if redis is not None:
+                await redis.aclose()
+            await redis_client.close_redis()
+            await db_module.dispose_engine()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout)
+        except Exception:  # pragma: no cover - best effort no desligamento
+            logger.exception("worker_runtime_close_failed")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+            logger.info("worker_runtime_stopped")
+
+
+runtime = WorkerRuntime()
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Atalho para `runtime.run`; inicia o loop sob demanda fora de um worker."""
+
+    return runtime.run(coro, timeout)
+
+
+@worker_process_init.connect
+def _start_runtime(**_: Any) -> None:
+    # O processo filho herda os globais do pai no fork; conexões abertas lá não servem aqui.
+    db_module.reset_engine()
+    redis_client.reset_redis()
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _stop_runtime(**_: Any) -> None:
+    runtime.shutdown()
@@ -1,4 +1,8 @@
-"""Tasks Celery para alertas, lembretes e automações recorrentes"""
+"""Tasks Celery para alertas, lembretes e automações recorrentes
+
+O monitoramento de clipes não mora mais aqui: roda em `clipador.ingestion.sync`
+(`tasks/ingestion.py`), agendado pelo beat.
+"""
 
 import logging
 from datetime import datetime, timedelta
@@ -7,42 +11,21 @@ from celery import shared_task
 from sqlalchemy.orm import Session
 
 from clipador_backend.db import get_db_session
-from clipador_backend.services.monitoring_service import MonitoringService
-from clipador_backend.services.plan_service import PlanService
+from clipador_backend.tasks.runtime import run_coroutine
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name="monitoramento:executar")
-def executar_monitoramento_clipes():
-    """Executa ciclo de monitoramento para todos os usuários ativos (a cada 15min)."""
-    try:
-        with get_db_session() as db:
-            service = MonitoringService(db)
-            import asyncio
-            asyncio.run(service.executar_ciclo_monitoramento())
-        logger.info("✅ Monitoramento concluído")
-    except Exception:
-        logger.exception("Falha no monitoramento")
-        raise
-
-
 @shared_task(name="assinaturas:verificar-expiracoes")
 def verificar_expiracoes_planos():
-    """Envia lembretes de expiração em 7/3/1/0 dias e atualiza ultimo_aviso_expiracao."""
+    """Envia lembretes de expiração em 7/3/1/0 dias.
+
+    Delegado a `clipador.maintenance.expiry_reminders` (uma consulta com os baldes).
+    """
     try:
-        with get_db_session() as db:
-            plan = PlanService(db)
-            usuarios = plan.verificar_expiracao_planos()
-            enviados = 0
-            for u in usuarios:
-                # Placeholder: enviar notificação por e-mail/in-app
-                logger.info(
-                    "Aviso de expiração: user=%s dias_restantes=%s plano=%s",
-                    u["user_id"], u["dias_restantes"], u["plan"],
-                )
-                enviados += 1
-            logger.info("✅ %d avisos de expiração enviados", enviados)
+        from clipador_backend.tasks.maintenance import expiry_reminders_task
+        enviados = expiry_reminders_task()
+        logger.info("✅ %d avisos de expiração enviados", enviados)
     except Exception:
         logger.exception("Falha ao verificar expirações")
         raise
@@ -50,25 +33,14 @@ def verificar_expiracoes_planos():
 
 @shared_task(name="assinaturas:revogar-testes")
 def revogar_testes_expirados():
-    """Revoga testes gratuitos expirados diariamente."""
+    """Revoga testes gratuitos expirados diariamente.
+
+    Delegado a `clipador.maintenance.revoke_trials` (UPDATE ... RETURNING em lotes).
+    """
     try:
-        from clipador_backend.services._plan_helpers import revogar_acesso_teste_expirado_impl
-        with get_db_session() as db:
-            from clipador_backend.models.user import UserAccount
-            now = datetime.now()
-            expirados = (
-                db.query(UserAccount)
-                .filter(
-                    UserAccount.plan.ilike("%teste%"),
-                    UserAccount.plan_expires_at.isnot(None),
-                    UserAccount.plan_expires_at < now,
-                    UserAccount.status == "active",
-                )
-                .all()
-            )
-            for user in expirados:
-                revogar_acesso_teste_expirado_impl(db, user.id)
-            logger.info("✅ Testes revogados: %d", len(expirados))
+        from clipador_backend.tasks.maintenance import revoke_trials_task
+        revogados = revoke_trials_task()
+        logger.info("✅ Testes revogados: %d", revogados)
     except Exception:
         logger.exception("Falha ao revogar testes")
         raise
@@ -76,18 +48,14 @@ def revogar_testes_expirados():
 
 @shared_task(name="sistema:limpeza-diaria")
 def limpeza_diaria_dados():
-    """Remove históricos muito antigos e dados temporários (diário)."""
+    """Remove históricos muito antigos e dados temporários (diário).
+
+    Delegado ao motor de retenção em lotes (`clipador.maintenance.retention`).
+    """
     try:
-        with get_db_session() as db:
-            from clipador_backend.models.config import HistoricoEnvio
-            limite = datetime.now() - timedelta(days=90)
-            removidos = (
-                db.query(HistoricoEnvio)
-                .filter(HistoricoEnvio.criado_em < limite)
-                .delete()
-            )
-            db.commit()
-            logger.info("✅ Limpeza concluída, removidos: %d", removidos)
+        from clipador_backend.tasks.maintenance import run_retention
+        removidos = run_coroutine(run_retention())
+        logger.info("✅ Limpeza concluída, removidos: %s", removidos)
     except Exception:
         logger.exception("Falha na limpeza diária")
         raise
@@ -0,0 +1,44 @@
+"""Celery tasks que drenam a caixa de entrada de webhooks."""
+
+from __future__ import annotations
+
+import logging
+
+from ..celery_app import celery_app
+from ..db import get_session_factory
+from ..services.webhook_inbox import DrainReport, InboxDrainer
+from ..settings import get_settings
+from .runtime import run_coroutine
+
+logger = logging.getLogger(__name__)
+
+
+async def drain_webhooks() -> DrainReport:
+    settings = get_settings()
+    drainer = InboxDrainer(
+        get_session_factory(),
+        batch_size=settings.webhook_drain_batch_size,
+        max_attempts=settings.webhook_max_attempts,
+    )
+    return await drainer.drain()
+
+
+@celery_app.task(name="clipador.webhooks.drain")
+def drain_webhooks_task() -> dict[str, int]:
+    """Aplica, em lotes, os eventos da Kirvano que ainda estão pendentes."""
+
+    try:
+        report = run_coroutine(drain_webhooks())
+        if report.processed or report.retried or report.failed:
+            logger.info(
+                "webhook_drain_completed",
+                extra={
+                    "processed": report.processed,
+                    "retried": report.retried,
+                    "failed": report.failed,
+                },
+            )
+        return {"processed": report.processed, "retried": report.retried, "failed": report.failed}
+    except Exception as exc:  # pragma: no cover - logged for monitoring
+        logger.exception("webhook_drain_failed", extra={"error": str(exc)})
+        raise
@@ -0,0 +1,5 @@
+"""Ferramentas de teste e carga que não dependem de serviços externos."""
+
+from .fake_helix import FakeHelix, FakeHelixConfig, PoissonBursts, SteadyRate
+
+__all__ = ["FakeHelix", "FakeHelixConfig", "PoissonBursts", "SteadyRate"]
@@ -0,0 +1,414 @@
+"""Servidor falso da Helix (e do OAuth da Twitch) para testes e carga de ingestão.
+
+O mesmo núcleo atende de duas formas:
+
+- `FakeHelix.transport()` devolve um `httpx.MockTransport`, para ligar o `TwitchAPI`
+  ao servidor falso dentro do mesmo processo;
+- `FakeHelix.app` é uma app ASGI, servida com uvicorn num processo à parte
+  (`uvicorn clipador_backend.testing.fake_helix:app --port 8900`), apontando
+  `CLIPADOR_TWITCH_API_BASE_URL=http://127.0.0.1:8900/helix` e
+  `CLIPADOR_TWITCH_AUTH_URL=http://127.0.0.1:8900/oauth2/token`.
+
+Os clipes não ficam guardados: cada minuto de cada streamer é sorteado de forma
+determinística (semente + streamer + minuto) por um processo de chegada — por padrão
+`PoissonBursts`, um fundo de Poisson com rajadas esporádicas —, então consultas
+repetidas à mesma janela devolvem os mesmos clipes e só o relógio faz surgir novos.
+Latência, erros e limite de requisições (`Ratelimit-*`, 429) são configuráveis.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import secrets
+import time
+from collections import Counter
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Protocol
+from urllib.parse import parse_qs
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+Params = Mapping[str, list[str]]
+
+
+def _rng(*parts: object) -> random.Random:
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    # Knuth: suficiente para as taxas pequenas (por minuto) usadas aqui
+    if lam <= 0:
+        return 0
+    threshold, count, product = math.exp(-lam), 0, rng.random()
+    while product > threshold:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def _iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class ClipArrivals(Protocol):
+    """Instantes de criação dos clipes de um streamer dentro de um minuto."""
+
+    def arrivals(self, broadcaster_id: str, minute: int) -> list[float]: ...
+
+
+@dataclass(frozen=True, slots=True)
+class PoissonBursts:
+    """Fundo de Poisson (`background_per_hour`) mais rajadas: cada minuto inicia uma
+    rajada com taxa `bursts_per_hour`, com ~`burst_size` clipes espalhados em
+    `burst_span_seconds` — o padrão que o agrupador de bursts precisa detectar."""
+
+    background_per_hour: float = 2.0
+    bursts_per_hour: float = 0.5
+    burst_size: float = 6.0
+    burst_span_seconds: float = 90.0
+    seed: int = 0
+
+    def arrivals(self, broadcaster_id: str, minute: int) -> list[float]:
+        rng = _rng(self.seed, broadcaster_id, minute)
+        start = minute * 60.0
+        times = [
+            start + rng.uniform(0, 60)
+            for _ in range(_poisson(rng, self.background_per_hour / 60))
+        ]
+        if rng.random() < self.bursts_per_hour / 60:
+            size = 2 + _poisson(rng, max(self.burst_size - 2, 0))
+            burst_start = start + rng.uniform(0, 60)
+            times.extend(burst_start + rng.uniform(0, self.burst_span_seconds) for _ in range(size))
+        return sorted(times)
+
+
+@dataclass(frozen=True, slots=True)
+class SteadyRate:
+    """Um clipe a cada `interval_seconds`, com fase fixa por streamer."""
+
+    interval_seconds: float = 300.0
+
+    def arrivals(self, broadcaster_id: str, minute: int) -> list[float]:
+        phase = _rng("steady", broadcaster_id).uniform(0, self.interval_seconds)
+        start, end = minute * 60.0, (minute + 1) * 60.0
+        first = math.ceil((start - phase) / self.interval_seconds)
+        times = []
+        moment = phase + first * self.interval_seconds
+        while moment < end:
+            times.append(moment)
+            moment += self.interval_seconds
+        return times
+
+
+@dataclass(slots=True)
+class FakeHelixConfig:
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit: int = 800
+    rate_window_seconds: float = 60.0
+    token_ttl_seconds: int = 3600
+    live_fraction: float = 0.3
+    max_page_size: int = 100
+    seed: int = 0
+
+
+class HelixResponse:
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    def encode(self) -> bytes:
+        return json.dumps(self.body, separators=(",", ":")).encode()
+
+
+@dataclass
+class FakeHelix:
+    """Estado do servidor falso: tokens emitidos, cotas e contadores de requisição."""
+
+    config: FakeHelixConfig = field(default_factory=FakeHelixConfig)
+    arrivals: ClipArrivals = field(default_factory=PoissonBursts)
+    clock: Callable[[], float] = time.time
+    requests: Counter[str] = field(default_factory=Counter)
+    _tokens: dict[str, tuple[str, float]] = field(default_factory=dict, repr=False)
+    _quota: dict[str, tuple[float, int]] = field(default_factory=dict, repr=False)
+    _forced: list[int] = field(default_factory=list, repr=False)
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.config.seed)
+        self.app = Starlette(
+            routes=[Route("/{path:path}", self._asgi_endpoint, methods=["GET", "POST"])]
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            result = await self.handle(
+                request.method,
+                request.url.path,
+                parse_qs(request.url.query.decode()),
+                request.headers,
+                request.content,
+            )
+            return httpx.Response(result.status, content=result.encode(), headers=_json(result))
+
+        return httpx.MockTransport(handler)
+
+    async def _asgi_endpoint(self, request: Request) -> Response:
+        result = await self.handle(
+            request.method,
+            request.url.path,
+            parse_qs(request.url.query),
+            request.headers,
+            await request.body(),
+        )
+        return Response(result.encode(), status_code=result.status, headers=_json(result))
+
+    def fail_next(self, count: int = 1, status: int = 503) -> None:
+        """Força as próximas `count` requisições à Helix a responderem `status`."""
+
+        self._forced.extend([status] * count)
+
+    async def handle(
+        self, method: str, path: str, params: Params, headers: Mapping[str, str], body: bytes
+    ) -> HelixResponse:
+        self.requests[path] += 1
+        delay = self.config.latency_seconds
+        if self.config.latency_jitter_seconds:
+            delay += self._rng.uniform(0, self.config.latency_jitter_seconds)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if path.endswith("/oauth2/token") and method == "POST":
+            return self._token(parse_qs(body.decode()))
+        if not path.startswith("/helix/"):
+            return _error(404, "Not Found")
+
+        client_id = headers.get("client-id", "")
+        token = headers.get("authorization", "").removeprefix("Bearer ")
+        issued = self._tokens.get(token)
+        if not issued or issued[0] != client_id or issued[1] <= self.clock():
+            return _error(401, "Invalid OAuth token")
+
+        limit_headers = self._consume(client_id)
+        if limit_headers is None:
+            return _error(429, "Too Many Requests", self._limit_headers(client_id))
+        if self._forced:
+            return _error(self._forced.pop(0), "Injected failure", limit_headers)
+        if self.config.error_rate and self._rng.random() < self.config.error_rate:
+            return _error(self.config.error_status, "Injected failure", limit_headers)
+
+        handler = {
+            "/helix/clips": self._clips,
+            "/helix/streams": self._streams,
+            "/helix/videos": self._videos,
+            "/helix/users": self._users,
+        }.get(path)
+        if handler is None:
+            return _error(404, "Not Found", limit_headers)
+        try:
+            result = handler(params)
+        except (KeyError, ValueError) as exc:
+            return _error(400, f"Bad Request: {exc}", limit_headers)
+        result.headers.update(limit_headers)
+        return result
+
+    def _token(self, form: Params) -> HelixResponse:
+        client_id = (form.get("client_id") or [""])[0]
+        if not client_id or not (form.get("client_secret") or [""])[0]:
+            return _error(400, "missing client credentials")
+        token = secrets.token_hex(15)
+        self._tokens[token] = (client_id, self.clock() + self.config.token_ttl_seconds)
+        return HelixResponse(
+            200,
+            {
+                "access_token": token,
+                "expires_in": self.config.token_ttl_seconds,
+                "token_type": "bearer",
+            },
+        )
+
+    def _consume(self, client_id: str) -> dict[str, str] | None:
+        now = self.clock()
+        window_start, used = self._quota.get(client_id, (now, 0))
+        if now - window_start >= self.config.rate_window_seconds:
+            window_start, used = now, 0
+        if used >= self.config.rate_limit:
+            self._quota[client_id] = (window_start, used)
+            return None
+        self._quota[client_id] = (window_start, used + 1)
+        return self._limit_headers(client_id)
+
+    def _limit_headers(self, client_id: str) -> dict[str, str]:
+        window_start, used = self._quota[client_id]
+        return {
+            "Ratelimit-Limit": str(self.config.rate_limit),
+            "Ratelimit-Remaining": str(max(self.config.rate_limit - used, 0)),
+            "Ratelimit-Reset": str(int(window_start + self.config.rate_window_seconds)),
+        }
+
+    def clips_between(self, broadcaster_id: str, start: datetime, end: datetime) -> list[dict]:
+        """Clipes criados em `[start, end)`, nunca depois do relógio do servidor."""
+
+        end = min(end, datetime.fromtimestamp(self.clock(), timezone.utc))
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        found: list[tuple[float, int, int]] = []
+        # rajadas que começaram antes de `start` podem ter clipes dentro da janela
+        for minute in range(int(start_ts // 60) - 5, int(end_ts // 60) + 1):
+            for index, moment in enumerate(self.arrivals.arrivals(broadcaster_id, minute)):
+                if start_ts <= moment < end_ts:
+                    found.append((moment, minute, index))
+        found.sort()
+        return [
+            self._clip(broadcaster_id, minute, index, moment) for moment, minute, index in found
+        ]
+
+    def _clip(self, broadcaster_id: str, minute: int, index: int, moment: float) -> dict:
+        rng = _rng(self.config.seed, "clip", broadcaster_id, minute, index)
+        clip_id = f"Fake{broadcaster_id}M{minute}N{index}"
+        return {
+            "id": clip_id,
+            "url": f"https://clips.twitch.tv/{clip_id}",
+            "embed_url": f"https://clips.twitch.tv/embed?clip={clip_id}",
+            "broadcaster_id": broadcaster_id,
+            "broadcaster_name": f"Streamer {broadcaster_id}",
+            "creator_id": str(rng.randint(1, 10**8)),
+            "creator_name": f"viewer{rng.randint(1, 9999)}",
+            "video_id": f"v{broadcaster_id}-{minute // 240}",
+            "game_id": "509658",
+            "language": "pt",
+            "title": f"Clip {index} @ {minute}",
+            "view_count": rng.randint(1, 5000),
+            "created_at": _iso(datetime.fromtimestamp(moment, timezone.utc)),
+            "thumbnail_url": f"https://clips-media.example/{clip_id}-preview-480x272.jpg",
+            "duration": round(rng.uniform(5, 60), 1),
+            "vod_offset": rng.randint(0, 14_400),
+        }
+
+    def _clips(self, params: Params) -> HelixResponse:
+        broadcaster_id = params["broadcaster_id"][0]
+        now = datetime.fromtimestamp(self.clock(), timezone.utc)
+        started_at = now - timedelta(days=7)
+        if "started_at" in params:
+            started_at = _parse_iso(params["started_at"][0])
+        ended_at = _parse_iso(params["ended_at"][0]) if "ended_at" in params else now
+        first = min(int((params.get("first") or ["20"])[0]), self.config.max_page_size)
+        offset = _decode_cursor(params["after"][0]) if "after" in params else 0
+
+        clips = self.clips_between(broadcaster_id, started_at, ended_at)
+        page = clips[offset : offset + first]
+        pagination = {}
+        if offset + first < len(clips):
+            pagination["cursor"] = _encode_cursor(offset + first)
+        return HelixResponse(200, {"data": page, "pagination": pagination})
+
+    def _is_live(self, user_id: str) -> bool:
+        hour = int(self.clock() // 3600)
+        return _rng(self.config.seed, "live", user_id, hour).random() < self.config.live_fraction
+
+    def _streams(self, params: Params) -> HelixResponse:
+        now = self.clock()
+        data = [
+            {
+                "id": f"s{user_id}{int(now // 3600)}",
+                "user_id": user_id,
+                "user_login": f"streamer{user_id}",
+                "user_name": f"Streamer {user_id}",
+                "game_id": "509658",
+                "type": "live",
+                "title": f"Live {user_id}",
+                "viewer_count": _rng(self.config.seed, "viewers", user_id).randint(10, 50_000),
+                "started_at": _iso(datetime.fromtimestamp(now - now % 3600, timezone.utc)),
+                "language": "pt",
+            }
+            for user_id in params.get("user_id", [])
+            if self._is_live(user_id)
+        ]
+        return HelixResponse(200, {"data": data, "pagination": {}})
+
+    def _videos(self, params: Params) -> HelixResponse:
+        data = []
+        for video_id in params.get("id", []):
+            rng = _rng(self.config.seed, "video", video_id)
+            hours, minutes = rng.randint(1, 8), rng.randint(0, 59)
+            data.append(
+                {
+                    "id": video_id,
+                    "user_id": video_id.removeprefix("v").partition("-")[0],
+                    "title": f"VOD {video_id}",
+                    "created_at": _iso(datetime.fromtimestamp(self.clock() - 86_400, timezone.utc)),
+                    "url": f"https://www.twitch.tv/videos/{video_id}",
+                    "type": "archive",
+                    "duration": f"{hours}h{minutes}m0s",
+                }
+            )
+        return HelixResponse(200, {"data": data, "pagination": {}})
+
+    def _users(self, params: Params) -> HelixResponse:
+        # logins seguem o padrão `streamer<id>` usado pelas demais respostas
+        ids = params.get("id", []) + [
+            login.removeprefix("streamer") for login in params.get("login", [])
+        ]
+        data = [
+            {
+                "id": user_id,
+                "login": f"streamer{user_id}",
+                "display_name": f"Streamer {user_id}",
+                "type": "",
+                "broadcaster_type": "partner",
+                "profile_image_url": f"https://static-cdn.example/{user_id}.png",
+                "created_at": "2016-01-01T00:00:00Z",
+            }
+            for user_id in ids
+        ]
+        return HelixResponse(200, {"data": data})
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["o"])
+
+
+def _json(result: HelixResponse) -> dict[str, str]:
+    return {"Content-Type": "application/json", **result.headers}
+
+
+def _error(status: int, message: str, headers: dict[str, str] | None = None) -> HelixResponse:
+    return HelixResponse(status, {"error": message, "status": status, "message": message}, headers)
+
+
+# `uvicorn clipador_backend.testing.fake_helix:app`
+app = FakeHelix().app
+
+
+__all__ = [
+    "ClipArrivals",
+    "FakeHelix",
+    "FakeHelixConfig",
+    "PoissonBursts",
+    "SteadyRate",
+    "app",
+]
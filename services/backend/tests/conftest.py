@@ -1,6 +1,11 @@
+import asyncio
+import os
+import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 
 def _ensure_paths_on_sys_path() -> None:
     repo_root = Path(__file__).resolve().parents[2]
@@ -16,3 +21,99 @@ def _ensure_paths_on_sys_path() -> None:
 
 
 _ensure_paths_on_sys_path()
+
+
+class FakeRedis:
+    """Subconjunto em memória dos comandos Redis usados por leases e marcas, sem expiração real."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.ttls[key] = px if ex is None else ex * 1000
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def eval(self, script, numkeys, key, token, *args):
+        from clipador_backend.services import leases
+
+        if self.data.get(key) != token:
+            return 0
+        if script == leases._RELEASE_SCRIPT:
+            del self.data[key]
+        elif script == leases._RENEW_SCRIPT:
+            self.ttls[key] = args[0]
+        return 1
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def set(self, *args, **kwargs):
+        self._commands.append(self._redis.set(*args, **kwargs))
+        return self
+
+    async def execute(self):
+        return [await command for command in self._commands]
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def shared_redis(monkeypatch):
+    """Redis do processo (`redis_client.get_redis`) trocado por um em memória."""
+
+    from clipador_backend import redis_client
+
+    redis = FakeRedis()
+    monkeypatch.setattr(redis_client, "_CLIENT", redis)
+    return redis
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+async def _reset_public_schema(url: str) -> None:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def migrated_postgres_url():
+    """Postgres descartável de `CLIPADOR_TEST_POSTGRES_URL` recriado com `alembic upgrade head`.
+
+    O schema sai das migrações (partições, índices parciais, trigramas) e não do
+    `Base.metadata`, para que os testes vejam o mesmo banco que produção.
+    """
+
+    url = os.environ.get("CLIPADOR_TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("CLIPADOR_TEST_POSTGRES_URL não definido (requer Postgres descartável)")
+    asyncio.run(_reset_public_schema(url))
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "CLIPADOR_DATABASE_URL": url, "PYTHONPATH": os.pathsep.join(sys.path)},
+        check=True,
+    )
+    return url
@@ -3,6 +3,8 @@ from datetime import datetime, timezone
 import jwt
 import pytest
 from httpx import ASGITransport, AsyncClient
+from passlib.hash import pbkdf2_sha256
+from sqlalchemy import select
 
 from clipador_backend import db as db_module
 from clipador_backend.db import get_engine, session_scope
@@ -13,6 +15,7 @@ from clipador_backend.security.auth import (
     create_refresh_token,
     decode_token,
     hash_password,
+    verify_and_update_password,
     verify_password,
 )
 from clipador_backend.settings import Settings
@@ -46,10 +49,23 @@ def test_create_and_decode_access_token(monkeypatch):
 def test_password_hashing():
     hashed = hash_password("super-secret")
     assert hashed != "super-secret"
+    assert hashed.startswith("$argon2id$")
     assert verify_password("super-secret", hashed) is True
     assert verify_password("wrong", hashed) is False
 
 
+@pytest.mark.asyncio
+async def test_legacy_pbkdf2_hash_is_upgraded_on_verify():
+    legacy = pbkdf2_sha256.hash("super-secret")
+
+    valid, new_hash = await verify_and_update_password("super-secret", legacy)
+    assert valid is True
+    assert new_hash is not None and new_hash.startswith("$argon2id$")
+
+    assert await verify_and_update_password("wrong", legacy) == (False, None)
+    assert await verify_and_update_password("super-secret", new_hash) == (True, None)
+
+
 @pytest.mark.asyncio
 async def test_login_route_authenticates(monkeypatch):
     test_settings = Settings(
@@ -69,7 +85,7 @@ async def test_login_route_authenticates(monkeypatch):
         await conn.run_sync(Base.metadata.create_all)
 
     async with session_scope() as session:
-        user = UserAccount(username="admin", hashed_password=hash_password("123456"))
+        user = UserAccount(username="admin", hashed_password=pbkdf2_sha256.hash("123456"))
         session.add(user)
         await session.flush()
 
@@ -84,6 +100,13 @@ async def test_login_route_authenticates(monkeypatch):
         assert "refresh_token" in payload
         assert payload["token_type"] == "bearer"
 
+        # hash legado regravado como argon2id no login
+        async with session_scope() as session:
+            stored = (await session.execute(select(UserAccount.hashed_password))).scalar_one()
+        assert stored.startswith("$argon2id$")
+        wrong = await client.post("/auth/login", json={"username": "admin", "password": "nope"})
+        assert wrong.status_code == 401
+
         refresh_resp = await client.post("/auth/refresh", json={"refresh_token": payload["refresh_token"]})
         assert refresh_resp.status_code == 200
         new_tokens = refresh_resp.json()
@@ -3,13 +3,16 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event, func, select
 
 from clipador_backend import db as db_module
 from clipador_backend.db import get_engine, session_scope
-from clipador_backend.models import Base, UserAccount
+from clipador_backend.models import Base, PurchaseRecord, UserAccount
 from clipador_backend.security.auth import hash_password
 from clipador_backend.services import billing
-from clipador_backend.services.billing import _calculate_expiration
+from clipador_backend.services.billing import BillingUnitOfWork, _calculate_expiration
+from clipador_backend.services.plan import base_slots
+from clipador_backend.services.plan_catalog import DEFAULT_PLAN, PLANS, normalize_plan_name, plan_spec
 from clipador_backend.settings import Settings
 
 
@@ -119,3 +122,79 @@ async def test_renewal_extends_existing_period(monkeypatch):
     await engine.dispose()
     db_module._ENGINE = None
     db_module._SESSION_FACTORY = None
+
+
+def test_plan_catalog_normalizes_once_and_memoizes() -> None:
+    plan_spec.cache_clear()
+
+    assert normalize_plan_name("  Anual PRÓ ") == "anual pro"
+    assert plan_spec("Anual Pró") is PLANS["anual pro"]
+    assert plan_spec("Plano Mensal Plus").slots == 8
+    assert plan_spec("Teste Grátis").trial is True
+    assert plan_spec(None) is DEFAULT_PLAN and plan_spec("free").slots == 1
+    assert plan_spec("Anual Pró") is plan_spec("Anual Pró")
+    assert plan_spec.cache_info().hits >= 1
+
+    assert base_slots("Super") == 999
+    extended = _calculate_expiration("Teste Gratuito", base=None)
+    assert 2 <= (extended - datetime.now(timezone.utc)).days <= 3
+
+
+@pytest.mark.asyncio
+async def test_billing_event_runs_in_one_transaction(monkeypatch):
+    test_settings = _make_settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: test_settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: test_settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        session.add(
+            UserAccount(
+                username="member",
+                hashed_password=hash_password("secret"),
+                email="Member@Example.com",
+                plan="free",
+            )
+        )
+
+    async with engine.connect() as conn:
+        plan = await conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT id FROM users WHERE lower(email) = 'member@example.com'"
+        )
+        assert "ix_users_email_lower" in " ".join(str(row[-1]) for row in plan)
+
+    transactions: list[str] = []
+    event.listen(engine.sync_engine, "begin", lambda conn: transactions.append("begin"))
+    event.listen(engine.sync_engine, "commit", lambda conn: transactions.append("commit"))
+
+    payload = {"customer": {"email": "member@example.com", "id": "cust-1"}}
+    async with BillingUnitOfWork() as uow:
+        await uow.register_purchase(
+            "member@example.com", "Mensal Plus", "approved", "sale-9", payload
+        )
+        await uow.mark_subscription_renewed("member@example.com", "Mensal Plus")
+    assert transactions == ["begin", "commit"]
+
+    transactions.clear()
+    with pytest.raises(RuntimeError):
+        async with BillingUnitOfWork() as uow:
+            await uow.mark_subscription_ended("member@example.com", "canceled")
+            raise RuntimeError("falha no meio do evento")
+    assert "commit" not in transactions
+
+    async with session_scope() as session:
+        user = await session.get(UserAccount, 1)
+        assert user.plan == "Mensal Plus"
+        assert user.status == "active"
+        assert user.kirvano_last_sale_id == "sale-9"
+        assert await session.scalar(select(func.count()).select_from(PurchaseRecord)) == 1
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from clipador_core import Clip, ClipGroup
+
+from clipador_backend.models import Base, BurstClip, BurstRecord, ClipRecord, Streamer
+from clipador_backend.repositories.bursts import BurstRepository
+
+
+def _group(clips: list[ClipRecord]) -> ClipGroup:
+    core_clips = [Clip(id=clip.clip_id, created_at=clip.created_at) for clip in clips]
+    return ClipGroup(
+        clips=core_clips,
+        start=min(clip.created_at for clip in core_clips),
+        end=max(clip.created_at for clip in core_clips),
+    )
+
+
+@pytest.mark.asyncio
+async def test_extended_burst_updates_row_and_links_only_new_clips():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        now = datetime.now(timezone.utc)
+        streamer = Streamer(twitch_user_id="streamer1", display_name="Streamer 1", avatar_url=None)
+        session.add(streamer)
+        await session.flush()
+
+        clips = [
+            ClipRecord(
+                clip_id=external_id,
+                streamer_id=streamer.id,
+                streamer_name="Streamer 1",
+                streamer_external_id="streamer1",
+                created_at=now - timedelta(minutes=minutes),
+                viewer_count=100,
+                video_id=None,
+                fetched_at=now,
+            )
+            for external_id, minutes in (("a", 6), ("b", 5), ("c", 3), ("late", 120))
+        ]
+        session.add_all(clips)
+        await session.flush()
+        a, b, c, late = clips
+
+        repo = BurstRepository(session)
+        first = await repo.upsert_from_group(streamer.id, _group([a, b]), [a.id, b.id], ["a", "b"])
+        grown = await repo.upsert_from_group(streamer.id, _group([a, b, c]), [a.id, b.id, c.id], ["a", "b", "c"])
+        again = await repo.upsert_from_group(streamer.id, _group([a, b, c]), [a.id, b.id, c.id], ["a", "b", "c"])
+        other = await repo.upsert_from_group(streamer.id, _group([late]), [late.id], ["late"])
+
+        assert first.created and first.new_clip_external_ids == {"a", "b"}
+        assert not grown.created and grown.burst.id == first.burst.id
+        assert grown.new_clip_external_ids == {"c"}
+        assert grown.burst.clip_count == 3
+        assert grown.burst.end_time.replace(tzinfo=timezone.utc) == c.created_at
+        assert again.new_clip_external_ids == set()
+        assert other.created and other.burst.id != first.burst.id
+
+        burst_total = await session.scalar(select(func.count(BurstRecord.id)))
+        link_total = await session.scalar(
+            select(func.count(BurstClip.id)).where(BurstClip.burst_id == first.burst.id)
+        )
+        assert burst_total == 2
+        assert link_total == 3
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_links_already_recorded_are_skipped_not_counted():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        engine, expire_on_commit=False
+    )
+
+    async with session_factory() as session:
+        now = datetime.now(timezone.utc)
+        streamer = Streamer(twitch_user_id="streamer1", display_name="Streamer 1", avatar_url=None)
+        session.add(streamer)
+        await session.flush()
+        clip = ClipRecord(
+            clip_id="a",
+            streamer_id=streamer.id,
+            streamer_name="Streamer 1",
+            streamer_external_id="streamer1",
+            created_at=now,
+            viewer_count=100,
+            video_id=None,
+            fetched_at=now,
+        )
+        session.add(clip)
+        await session.flush()
+
+        # o mesmo clipe duas vezes bate em uq_burst_clip dentro do próprio INSERT
+        upsert = await BurstRepository(session).upsert_from_group(
+            streamer.id, _group([clip]), [clip.id, clip.id], ["a", "a"]
+        )
+
+        assert upsert.created
+        assert upsert.new_clip_external_ids == {"a"}
+        assert upsert.burst.clip_count == 1
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upserts_for_same_group_create_a_single_burst(migrated_postgres_url):
+    engine = create_async_engine(migrated_postgres_url)
+
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        engine, expire_on_commit=False
+    )
+
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        streamer = Streamer(twitch_user_id="streamer1", display_name="Streamer 1", avatar_url=None)
+        session.add(streamer)
+        await session.flush()
+        clips = [
+            ClipRecord(
+                clip_id=external_id,
+                streamer_id=streamer.id,
+                streamer_name="Streamer 1",
+                streamer_external_id="streamer1",
+                created_at=now - timedelta(minutes=minutes),
+                viewer_count=100,
+                video_id=None,
+                fetched_at=now,
+            )
+            for external_id, minutes in (("a", 2), ("b", 1))
+        ]
+        session.add_all(clips)
+        await session.commit()
+
+    async def _cycle() -> bool:
+        async with session_factory() as session:
+            upsert = await BurstRepository(session).upsert_from_group(
+                streamer.id, _group(clips), [clip.id for clip in clips], ["a", "b"]
+            )
+            await asyncio.sleep(0.05)
+            await session.commit()
+            return upsert.created
+
+    created = await asyncio.gather(_cycle(), _cycle())
+
+    async with session_factory() as session:
+        burst_total = await session.scalar(select(func.count(BurstRecord.id)))
+        link_total = await session.scalar(select(func.count(BurstClip.id)))
+
+    assert sorted(created) == [False, True]
+    assert burst_total == 1
+    assert link_total == 2
+
+    await engine.dispose()
@@ -0,0 +1,161 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from clipador_backend import db as db_module
+from clipador_backend.db import get_engine, session_scope
+from clipador_backend.main import create_app
+from clipador_backend.models import Base, ClipRecord, Streamer, UserAccount, UserStreamer
+from clipador_backend.security.auth import hash_password
+from clipador_backend.services import clip_export
+from clipador_backend.services.clip_export import aencode_rows, agzip_chunks
+from clipador_backend.settings import Settings
+
+FIELDS = ("id", "title", "createdAt")
+ROWS = [
+    {"id": index, "title": f'clip "{index}", ok', "createdAt": datetime.datetime(2024, 1, 1, index)}
+    for index in range(5)
+]
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+async def _encode(rows, fmt):
+    return [chunk async for chunk in aencode_rows(_rows(rows), fmt, FIELDS)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["csv", "ndjson", "json"])
+async def test_encoders_stream_in_bounded_chunks(monkeypatch, fmt):
+    monkeypatch.setattr(clip_export, "CHUNK_BYTES", 64)
+
+    chunks = await _encode(ROWS, fmt)
+    body = b"".join(chunks).decode()
+
+    assert len(chunks) > 1
+    if fmt == "csv":
+        parsed = list(csv.DictReader(io.StringIO(body)))
+        assert [row["title"] for row in parsed] == [row["title"] for row in ROWS]
+        assert parsed[0]["createdAt"] == "2024-01-01T00:00:00"
+    elif fmt == "ndjson":
+        assert [json.loads(line)["id"] for line in body.splitlines()] == [0, 1, 2, 3, 4]
+    else:
+        assert [item["id"] for item in json.loads(body)] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_empty_exports_are_still_valid_documents():
+    assert b"".join(await _encode([], "json")) == b"[]"
+    assert b"".join(await _encode([], "ndjson")) == b""
+    assert b"".join(await _encode([], "csv")) == b"id,title,createdAt\n"
+
+    encoded = aencode_rows(_rows(ROWS), "ndjson", FIELDS)
+    compressed = b"".join([chunk async for chunk in agzip_chunks(encoded)])
+    assert gzip.decompress(compressed) == b"".join(await _encode(ROWS, "ndjson"))
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_streams_clips(monkeypatch):
+    settings = Settings(
+        app_env="test",
+        database_url="sqlite+aiosqlite:///:memory:",
+        jwt_secret="secret",
+    )
+
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.security.auth.get_settings", lambda: settings)
+    monkeypatch.setattr(clip_export, "YIELD_PER", 2)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with session_scope() as session:
+        admin = UserAccount(username="admin", hashed_password=hash_password("123456"))
+        member = UserAccount(
+            username="member", hashed_password=hash_password("123456"), role="member"
+        )
+        streamer = Streamer(twitch_user_id="123", display_name="Gaules", avatar_url=None)
+        other = Streamer(twitch_user_id="456", display_name="Alanzoka", avatar_url=None)
+        session.add_all([admin, member, streamer, other])
+        await session.flush()
+        session.add(UserStreamer(user_id=member.id, streamer_id=streamer.id))
+        for index, age in enumerate([1, 2, 3, 40]):
+            session.add(
+                ClipRecord(
+                    clip_id=f"clip{index}",
+                    streamer_id=streamer.id,
+                    streamer_name=streamer.display_name,
+                    streamer_external_id=streamer.twitch_user_id,
+                    created_at=now - datetime.timedelta(days=age),
+                    viewer_count=10 * index,
+                    title=f"Clip {index}",
+                    fetched_at=now,
+                )
+            )
+        session.add(
+            ClipRecord(
+                clip_id="other0",
+                streamer_id=other.id,
+                streamer_name=other.display_name,
+                streamer_external_id=other.twitch_user_id,
+                created_at=now - datetime.timedelta(hours=1),
+                viewer_count=5,
+                title="Other",
+                fetched_at=now,
+            )
+        )
+
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/clips/export")).status_code == 401
+        login = await client.post("/auth/login", json={"username": "member", "password": "123456"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        response = await client.get(
+            "/clips/export", params={"fmt": "ndjson", "days": 30, "gzip": True}, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "clipes.ndjson" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == ["clip0", "clip1", "clip2"]
+
+        response = await client.get(
+            "/clips/export", params={"streamer": "nobody"}, headers=headers
+        )
+        assert response.text.splitlines() == [",".join(clip_export.CLIP_RECORD_FIELDS)]
+
+        # só admin exporta os clipes de streamers que não monitora
+        response = await client.get(
+            "/clips/export", params={"fmt": "ndjson", "all_streamers": True}, headers=headers
+        )
+        assert response.status_code == 403
+
+        login = await client.post("/auth/login", json={"username": "admin", "password": "123456"})
+        admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        response = await client.get(
+            "/clips/export", params={"fmt": "ndjson"}, headers=admin_headers
+        )
+        assert response.text == ""
+        response = await client.get(
+            "/clips/export", params={"fmt": "ndjson", "all_streamers": True}, headers=admin_headers
+        )
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == ["other0", "clip0", "clip1", "clip2"]
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
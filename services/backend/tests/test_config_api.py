@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 from httpx import ASGITransport, AsyncClient
 
 from clipador_backend import db as db_module
 from clipador_backend.db import get_engine, session_scope
 from clipador_backend.main import create_app
 from clipador_backend.models import Base, UserAccount
+from clipador_backend.repositories.user_config import invalidate_configs
 from clipador_backend.security.auth import hash_password
 from clipador_backend.settings import Settings
 
@@ -102,11 +104,124 @@ async def test_user_config_endpoints(monkeypatch):
         history_payload = history_resp.json()
         assert len(history_payload["items"]) == 1
         assert history_payload["items"][0]["clip_external_id"] == "clip123"
+        assert history_payload["next_cursor"] is None
+
+        async with session_scope() as session:
+            repo = UserConfigRepository(session)
+            for index in range(2):
+                await repo.record_delivery(
+                    user_id=1,
+                    streamer_id=streamer_id,
+                    burst_start=datetime.now(timezone.utc) - timedelta(minutes=1),
+                    burst_end=datetime.now(timezone.utc),
+                    clip_external_id=f"clip-extra-{index}",
+                )
+
+        # paginação por cursor: mais recentes primeiro, sem repetir nem pular
+        first_page = (await client.get("/config/me/history?limit=2", headers=headers)).json()
+        second_page = (
+            await client.get(
+                f"/config/me/history?limit=2&cursor={first_page['next_cursor']}", headers=headers
+            )
+        ).json()
+        paged = first_page["items"] + second_page["items"]
+        assert [item["clip_external_id"] for item in paged] == [
+            "clip-extra-1",
+            "clip-extra-0",
+            "clip123",
+        ]
+        assert second_page["next_cursor"] is None and second_page["prev_cursor"] is not None
+        bad_cursor = await client.get("/config/me/history?cursor=lixo", headers=headers)
+        assert bad_cursor.status_code == 400
 
         detach_resp = await client.delete(f"/config/me/streamers/{streamer_id}", headers=headers)
         assert detach_resp.status_code == 200
         assert detach_resp.json()["streamers"] == []
 
+        # the write stamped the user in Redis: the next read rebuilds once, then hits the cache
+        queries: list[str] = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2])
+        )
+        assert (await client.get("/config/me", headers=headers)).json() == detach_resp.json()
+        assert len(queries) == 1
+        cached_resp = await client.get("/config/me", headers=headers)
+        assert cached_resp.json() == detach_resp.json()
+        assert len(queries) == 1
+
+        # a change made by another process (e.g. the trial sweep) invalidates it here too
+        await invalidate_configs([1])
+        await client.get("/config/me", headers=headers)
+        assert len(queries) == 2
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_replace_streamer_set_applies_diff(monkeypatch):
+    settings = _make_settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.security.auth.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        session.add(
+            UserAccount(
+                username="pro",
+                hashed_password=hash_password("password"),
+                role="member",
+                plan="Anual Pro",
+                plan_expires_at=datetime.now(timezone.utc) + timedelta(days=365),
+                status="active",
+            )
+        )
+
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        login = await client.post("/auth/login", json={"username": "pro", "password": "password"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        def entries(*ids: str) -> dict[str, object]:
+            items = [{"twitch_user_id": twitch_id, "label": f"L-{twitch_id}"} for twitch_id in ids]
+            return {"streamers": items}
+
+        queries: list[str] = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2])
+        )
+
+        fifteen = entries(*(f"s{i}" for i in range(15)))
+        first = await client.put("/config/me/streamers", headers=headers, json=fifteen)
+        assert first.status_code == 200, first.text
+        assert first.json()["slots_used"] == 15
+        # snapshot, streamers SELECT, INSERT streamers, INSERT mappings, snapshot (+ BEGIN/COMMIT bookkeeping)
+        assert len([sql for sql in queries if not sql.startswith(("BEGIN", "COMMIT"))]) <= 6
+
+        second = await client.put("/config/me/streamers", headers=headers, json=entries("s3", "new", "s1"))
+        assert second.status_code == 200
+        body = second.json()
+        assert [item["twitch_user_id"] for item in body["streamers"]] == ["s3", "new", "s1"]
+        assert [item["order_index"] for item in body["streamers"]] == [0, 1, 2]
+        assert body["streamers"][2]["label"] == "L-s1"
+
+        duplicate = await client.put("/config/me/streamers", headers=headers, json=entries("s1", "s1"))
+        assert duplicate.status_code == 400
+        sixteen = entries(*(f"x{i}" for i in range(16)))
+        too_many = await client.put("/config/me/streamers", headers=headers, json=sixteen)
+        assert too_many.status_code == 409
+
+        cleared = await client.put("/config/me/streamers", headers=headers, json={"streamers": []})
+        assert cleared.json()["streamers"] == []
+
     await engine.dispose()
     db_module._ENGINE = None
     db_module._SESSION_FACTORY = None
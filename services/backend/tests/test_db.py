@@ -0,0 +1,159 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from clipador_backend import db as db_module
+from clipador_backend.db import engine_options, get_engine, get_read_engine, session_scope
+from clipador_backend.settings import Settings
+
+
+def _settings(**overrides) -> Settings:
+    values = {"app_env": "test", "database_url": "sqlite+aiosqlite:///:memory:", "jwt_secret": "secret"}
+    return Settings(**{**values, **overrides})
+
+
+def test_engine_options_apply_pool_and_asyncpg_profile():
+    settings = _settings(db_pool_size=5, db_max_overflow=2, db_statement_cache_size=0, db_statement_timeout_ms=1500)
+
+    url, options = engine_options("postgresql://user:pass@db:5432/clipador", settings)
+
+    assert url.startswith("postgresql+asyncpg://user:pass@db:5432/clipador")
+    assert "prepared_statement_cache_size=0" in url
+    assert options["pool_size"] == 5
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is True
+    assert options["echo"] is False
+    assert options["connect_args"] == {
+        "statement_cache_size": 0,
+        "server_settings": {"statement_timeout": "1500"},
+    }
+
+
+def test_engine_options_skip_pool_arguments_for_sqlite():
+    url, options = engine_options("sqlite+aiosqlite:///:memory:", _settings(db_echo=True))
+
+    assert url == "sqlite+aiosqlite:///:memory:"
+    assert options == {"echo": True}
+
+
+@pytest.mark.asyncio
+async def test_readonly_falls_back_to_writer_without_replica(monkeypatch):
+    settings = _settings()
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    db_module.reset_engine()
+
+    assert get_read_engine() is get_engine()
+    assert db_module.get_session_factory(readonly=True) is db_module.get_session_factory()
+
+    await db_module.dispose_engine()
+
+
+async def _two_databases(monkeypatch, tmp_path, **overrides) -> Settings:
+    settings = _settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        database_replica_url=f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}",
+        **overrides,
+    )
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    db_module.reset_engine()
+    for engine, origin in ((get_engine(), "primary"), (get_read_engine(), "replica")):
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE marker (origin TEXT)"))
+            await conn.execute(text("INSERT INTO marker VALUES (:origin)"), {"origin": origin})
+    return settings
+
+
+async def _read_origin() -> str:
+    async with session_scope(readonly=True) as session:
+        return (await session.execute(text("SELECT origin FROM marker"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_readonly_sessions_use_replica_engine(monkeypatch, tmp_path):
+    await _two_databases(monkeypatch, tmp_path)
+
+    assert get_read_engine() is not get_engine()
+    assert await _read_origin() == "replica"
+    async with session_scope() as session:
+        assert (await session.execute(text("SELECT origin FROM marker"))).scalar_one() == "primary"
+
+    await db_module.dispose_engine()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(monkeypatch, tmp_path):
+    await _two_databases(monkeypatch, tmp_path, replica_max_lag_seconds=5, replica_lag_check_seconds=60)
+    lags = iter([30.0, 0.0])
+    probes = []
+
+    async def fake_lag(engine):
+        probes.append(engine)
+        return next(lags)
+
+    monkeypatch.setattr(db_module, "measure_replica_lag", fake_lag)
+
+    assert await _read_origin() == "primary"
+    # resultado do probe fica em cache durante o intervalo de checagem
+    assert await _read_origin() == "primary"
+    assert probes == [get_read_engine()]
+
+    db_module._LAG_MONITOR._checked_at = None
+    assert await _read_origin() == "replica"
+
+    await db_module.dispose_engine()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(monkeypatch, tmp_path):
+    await _two_databases(monkeypatch, tmp_path)
+
+    async def broken_lag(engine):
+        raise ConnectionError("replica down")
+
+    monkeypatch.setattr(db_module, "measure_replica_lag", broken_lag)
+
+    assert await _read_origin() == "primary"
+
+    await db_module.dispose_engine()
+
+
+@pytest.mark.asyncio
+async def test_public_endpoint_reads_from_replica(monkeypatch, tmp_path):
+    from httpx import ASGITransport, AsyncClient
+
+    from clipador_backend.main import create_app
+    from clipador_backend.models import Base, ClipRecord, Streamer
+
+    await _two_databases(monkeypatch, tmp_path)
+    for engine in (get_engine(), get_read_engine()):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.now(timezone.utc)
+    async with db_module.get_session_factory(readonly=True)() as session:
+        streamer = Streamer(twitch_user_id="123", display_name="Streamer", avatar_url=None)
+        session.add(streamer)
+        await session.flush()
+        session.add(
+            ClipRecord(
+                clip_id="replicated",
+                streamer_id=streamer.id,
+                streamer_name="Streamer",
+                streamer_external_id="123",
+                created_at=now,
+                viewer_count=10,
+                fetched_at=now,
+            )
+        )
+        await session.commit()
+
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/public/clips")
+
+    assert response.status_code == 200
+    assert [clip["id"] for clip in response.json()["data"]] == ["replicated"]
+
+    await db_module.dispose_engine()
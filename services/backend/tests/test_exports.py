@@ -0,0 +1,260 @@
+import datetime
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from clipador_backend import db as db_module
+from clipador_backend.api.routes import exports as exports_routes
+from clipador_backend.db import get_engine, session_scope
+from clipador_backend.main import create_app
+from clipador_backend.models import (
+    Base,
+    ClipRecord,
+    ExportJob,
+    ExportStatus,
+    Streamer,
+    UserAccount,
+    UserStreamer,
+)
+from clipador_backend.security.auth import hash_password
+from clipador_backend.services.exports import PARQUET, ExportRunner, sweep_exports
+from clipador_backend.settings import Settings
+from clipador_backend.tasks.exports import run_export
+
+
+@pytest.mark.asyncio
+async def test_export_job_lifecycle_and_ranged_download(monkeypatch, tmp_path):
+    settings = Settings(
+        app_env="test",
+        database_url="sqlite+aiosqlite:///:memory:",
+        jwt_secret="secret",
+        export_dir=str(tmp_path),
+        export_row_group_size=2,
+    )
+
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.security.auth.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.tasks.exports.get_settings", lambda: settings)
+    queued: list[str] = []
+    monkeypatch.setattr(exports_routes, "enqueue_export", queued.append)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with session_scope() as session:
+        owner = UserAccount(username="owner", hashed_password=hash_password("123456"), role="member")
+        session.add(owner)
+        session.add(UserAccount(username="other", hashed_password=hash_password("123456"), role="member"))
+        session.add(UserAccount(username="admin", hashed_password=hash_password("123456")))
+        streamer = Streamer(twitch_user_id="123", display_name="Gaules", avatar_url=None)
+        unfollowed = Streamer(twitch_user_id="456", display_name="Alanzoka", avatar_url=None)
+        session.add_all([streamer, unfollowed])
+        await session.flush()
+        session.add(UserStreamer(user_id=owner.id, streamer_id=streamer.id))
+        session.add(
+            ClipRecord(
+                clip_id="unfollowed",
+                streamer_id=unfollowed.id,
+                streamer_name=unfollowed.display_name,
+                streamer_external_id=unfollowed.twitch_user_id,
+                created_at=now,
+                viewer_count=1,
+                fetched_at=now,
+            )
+        )
+        for index in range(5):
+            session.add(
+                ClipRecord(
+                    clip_id=f"clip{index}",
+                    streamer_id=streamer.id,
+                    streamer_name=streamer.display_name,
+                    streamer_external_id=streamer.twitch_user_id,
+                    created_at=now - datetime.timedelta(hours=index),
+                    viewer_count=index,
+                    fetched_at=now,
+                )
+            )
+
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+
+        async def headers_for(username: str) -> dict[str, str]:
+            login = await client.post("/auth/login", json={"username": username, "password": "123456"})
+            return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        owner = await headers_for("owner")
+        bad = await client.post("/exports", json={"fmt": "xlsx"}, headers=owner)
+        assert bad.status_code == 400
+
+        created = await client.post("/exports", json={"fmt": "csv.gz", "days": 7}, headers=owner)
+        assert created.status_code == 202, created.text
+        job_id = created.json()["id"]
+        assert queued == [job_id]
+        assert created.json()["status"] == "pending"
+
+        pending = await client.get(f"/exports/{job_id}/download", headers=owner)
+        assert pending.status_code == 409
+
+        assert await run_export(job_id) == "completed"
+
+        job = (await client.get(f"/exports/{job_id}", headers=owner)).json()
+        assert job["status"] == "completed" and job["rows_written"] == 5
+        assert (await client.get(f"/exports/{job_id}", headers=await headers_for("other"))).status_code == 404
+
+        full = await client.get(f"/exports/{job_id}/download", headers=owner)
+        assert full.status_code == 200
+        assert full.headers["accept-ranges"] == "bytes"
+        lines = gzip.decompress(full.content).decode().splitlines()
+        assert lines[0].startswith("id,title,streamer") and len(lines) == 6
+
+        # retomada: pede só o restante a partir do byte 10
+        tail = await client.get(
+            f"/exports/{job_id}/download", headers={**owner, "Range": "bytes=10-"}
+        )
+        assert tail.status_code == 206
+        assert tail.headers["content-range"] == f"bytes 10-{job['file_size'] - 1}/{job['file_size']}"
+        assert full.content[:10] + tail.content == full.content
+
+        # exportação global: só admin pede, e o worker inclui streamers não monitorados
+        payload = {"fmt": "csv.gz", "days": 7, "all_streamers": True}
+        assert (await client.post("/exports", json=payload, headers=owner)).status_code == 403
+        admin = await headers_for("admin")
+        created = await client.post("/exports", json=payload, headers=admin)
+        assert created.status_code == 202, created.text
+        assert await run_export(created.json()["id"]) == "completed"
+        everything = await client.get(f"/exports/{created.json()['id']}/download", headers=admin)
+        assert len(gzip.decompress(everything.content).decode().splitlines()) == 7
+
+        # depois do TTL a limpeza apaga o arquivo e o download passa a responder 410
+        await sweep_exports(
+            db_module.get_session_factory(),
+            str(tmp_path),
+            ttl=datetime.timedelta(0),
+            stuck_after=datetime.timedelta(hours=6),
+            keep_jobs=datetime.timedelta(days=30),
+        )
+        gone = await client.get(f"/exports/{job_id}/download", headers=owner)
+        assert gone.status_code == 410
+        assert (await client.get(f"/exports/{job_id}", headers=owner)).json()["status"] == "expired"
+
+    assert not list(tmp_path.glob("*.part"))
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+async def _session_factory() -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.mark.asyncio
+async def test_parquet_export_writes_one_row_group_per_batch(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    session_factory = await _session_factory()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with session_factory() as session:
+        owner = UserAccount(username="owner", hashed_password="x", role="member")
+        streamer = Streamer(twitch_user_id="123", display_name="Gaules", avatar_url=None)
+        session.add_all([owner, streamer])
+        await session.flush()
+        session.add(UserStreamer(user_id=owner.id, streamer_id=streamer.id))
+        session.add_all(
+            ClipRecord(
+                clip_id=f"clip{index}",
+                streamer_id=streamer.id,
+                streamer_name=streamer.display_name,
+                streamer_external_id=streamer.twitch_user_id,
+                created_at=now - datetime.timedelta(hours=index),
+                viewer_count=index,
+                fetched_at=now,
+            )
+            for index in range(5)
+        )
+        session.add(ExportJob(id="job", user_id=owner.id, fmt=PARQUET, params={"days": 7}))
+        await session.commit()
+
+    runner = ExportRunner(session_factory, session_factory, str(tmp_path), row_group_size=2)
+    job = await runner.run("job")
+
+    assert job.status == ExportStatus.COMPLETED.value and job.rows_written == 5
+    parquet = pq.ParquetFile(job.file_path)
+    assert parquet.metadata.num_row_groups == 3
+    assert [parquet.metadata.row_group(i).num_rows for i in range(3)] == [2, 2, 1]
+    table = parquet.read()
+    assert sorted(table.column("id").to_pylist()) == [f"clip{index}" for index in range(5)]
+    assert table.schema.field("createdAt").type.tz == "UTC"
+
+
+@pytest.mark.asyncio
+async def test_sweep_expires_files_interrupts_stuck_jobs_and_drops_old_rows(tmp_path):
+    session_factory = await _session_factory()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    hours = datetime.timedelta(hours=1)
+    fresh_file = tmp_path / "fresh.csv.gz"
+    old_file = tmp_path / "old.csv.gz"
+    stuck_part = tmp_path / "stuck.csv.gz.part"
+    for path in (fresh_file, old_file, stuck_part):
+        path.write_bytes(b"data")
+
+    async with session_factory() as session:
+        owner = UserAccount(username="owner", hashed_password="x", role="member")
+        session.add(owner)
+        await session.flush()
+
+        def job(job_id: str, status: ExportStatus, age: datetime.timedelta, **fields) -> ExportJob:
+            return ExportJob(
+                id=job_id,
+                user_id=owner.id,
+                fmt="csv.gz",
+                params={},
+                status=status.value,
+                created_at=now - age,
+                **fields,
+            )
+
+        session.add_all(
+            [
+                job("fresh", ExportStatus.COMPLETED, hours, finished_at=now - hours,
+                    file_path=str(fresh_file)),
+                job("old", ExportStatus.COMPLETED, 80 * hours, finished_at=now - 80 * hours,
+                    file_path=str(old_file)),
+                job("stuck", ExportStatus.RUNNING, 7 * hours, started_at=now - 7 * hours),
+                job("running", ExportStatus.RUNNING, hours, started_at=now - hours),
+                job("ancient", ExportStatus.FAILED, 40 * 24 * hours,
+                    finished_at=now - 40 * 24 * hours),
+            ]
+        )
+        await session.commit()
+
+    sweep = await sweep_exports(
+        session_factory,
+        str(tmp_path),
+        ttl=72 * hours,
+        stuck_after=6 * hours,
+        keep_jobs=datetime.timedelta(days=30),
+        now=now,
+    )
+
+    assert (sweep.expired, sweep.interrupted, sweep.deleted) == (1, 1, 1)
+    assert fresh_file.exists() and not old_file.exists() and not stuck_part.exists()
+    async with session_factory() as session:
+        jobs = {
+            job_id: await session.get(ExportJob, job_id)
+            for job_id in ("fresh", "old", "stuck", "running", "ancient")
+        }
+    assert jobs["ancient"] is None
+    assert jobs["fresh"].status == ExportStatus.COMPLETED.value
+    assert jobs["old"].status == ExportStatus.EXPIRED.value and jobs["old"].file_path is None
+    assert jobs["stuck"].status == ExportStatus.FAILED.value
+    assert jobs["running"].status == ExportStatus.RUNNING.value
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from clipador_backend import db as db_module
+from clipador_backend.adapters.twitch import TwitchAPI
+from clipador_backend.db import get_engine, session_scope
+from clipador_backend.models import Base, ClipRecord, Streamer
+from clipador_backend.services.ingestion import ClipIngestionService
+from clipador_backend.settings import Settings
+from clipador_backend.testing import FakeHelix, FakeHelixConfig, PoissonBursts, SteadyRate
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _settings() -> Settings:
+    return Settings(
+        app_env="test",
+        database_url="sqlite+aiosqlite:///:memory:",
+        jwt_secret="secret",
+        twitch_client_id="fake-client",
+        twitch_client_secret="fake-secret",
+    )
+
+
+@pytest.mark.asyncio
+async def test_twitch_client_paginates_clips_from_fake_helix(monkeypatch):
+    settings = _settings()
+    monkeypatch.setattr("clipador_backend.adapters.twitch.get_settings", lambda: settings)
+
+    fake = FakeHelix(arrivals=SteadyRate(interval_seconds=30), clock=NOW.timestamp)
+    twitch = TwitchAPI(client=httpx.AsyncClient(transport=fake.transport()))
+
+    clips = await twitch.get_clips("42", NOW - timedelta(hours=1))
+
+    # 120 clipes em 1h, 50 por página; o token é pedido uma vez só
+    assert len(clips) == 120
+    assert len({clip["id"] for clip in clips}) == 120
+    assert fake.requests["/helix/clips"] == 3
+    assert fake.requests["/oauth2/token"] == 1
+    assert clips == await twitch.get_clips("42", NOW - timedelta(hours=1))
+
+    stream_lookups = [await twitch.get_stream_info(str(user_id)) for user_id in range(20)]
+    assert any(stream_lookups) and not all(stream_lookups)
+    vod = await twitch.get_vod_by_id(clips[0]["video_id"])
+    assert vod["user_id"] == "42"
+
+
+@pytest.mark.asyncio
+async def test_fake_helix_rate_limit_and_error_injection():
+    fake = FakeHelix(config=FakeHelixConfig(rate_limit=2), clock=NOW.timestamp)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake.app), base_url="http://helix"
+    ) as client:
+        token = (
+            await client.post(
+                "/oauth2/token", data={"client_id": "cid", "client_secret": "s"}
+            )
+        ).json()["access_token"]
+        headers = {"Client-ID": "cid", "Authorization": f"Bearer {token}"}
+
+        fake.fail_next(1, status=500)
+        failed = await client.get("/helix/users", params={"id": "1"}, headers=headers)
+        assert failed.status_code == 500
+        assert failed.headers["Ratelimit-Remaining"] == "1"
+
+        users = await client.get("/helix/users", params={"login": "streamer7"}, headers=headers)
+        assert users.json()["data"][0]["id"] == "7"
+
+        limited = await client.get("/helix/users", params={"id": "1"}, headers=headers)
+        assert limited.status_code == 429
+        assert limited.headers["Ratelimit-Reset"] == str(int(NOW.timestamp()) + 60)
+
+        unauthorized = await client.get("/helix/users", params={"id": "1"})
+        assert unauthorized.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_ingestion_sync_once_against_fake_helix(monkeypatch):
+    settings = _settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.adapters.twitch.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        session.add_all(
+            Streamer(twitch_user_id=str(user_id), display_name=f"Streamer {user_id}")
+            for user_id in range(1, 6)
+        )
+
+    frozen = datetime.now(timezone.utc).timestamp()
+    fake = FakeHelix(
+        arrivals=PoissonBursts(background_per_hour=30, bursts_per_hour=6, seed=3),
+        clock=lambda: frozen,
+    )
+    service = ClipIngestionService(TwitchAPI(client=httpx.AsyncClient(transport=fake.transport())))
+    first = await service.sync_once()
+
+    async with session_scope() as session:
+        stored = (await session.scalars(select(ClipRecord.clip_id))).all()
+    assert len(first) == 5
+    assert stored and all(clip_id.startswith("Fake") for clip_id in stored)
+    assert sum(outcome.new_clips for outcome in first.values()) == len(stored)
+
+    # com o relógio parado, a Helix falsa devolve os mesmos clipes: nada novo
+    second = await service.sync_once()
+    assert sum(outcome.new_clips for outcome in second.values()) == 0
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
@@ -10,6 +10,7 @@ from clipador_backend.repositories.bursts import BurstRepository
 from clipador_backend.repositories.clips import ClipRepository
 from clipador_backend.repositories.streamers import StreamerRepository
 from clipador_backend.services.ingestion import ClipIngestionService
+from clipador_backend.services.leases import LeaseLostError, RedisLease
 from clipador_backend.settings import Settings
 
 
@@ -85,7 +86,10 @@ async def test_ingestion_creates_clips_and_bursts(monkeypatch):
     ]
 
     service = ClipIngestionService(FakeTwitch(fake_clips))
-    await service.sync_once()
+    outcomes = await service.sync_once()
+
+    assert outcomes[streamer.id].new_clips == 2
+    assert outcomes[streamer.id].bursts == 1
 
     async with session_scope() as session:
         clip_repo = ClipRepository(session)
@@ -99,6 +103,121 @@ async def test_ingestion_creates_clips_and_bursts(monkeypatch):
         burst = recent_bursts[0]
         assert burst.clip_count == 2
 
+    # um novo ciclo sem clipes novos não duplica o burst nem gera novas entregas
+    outcomes = await service.sync_once()
+    assert outcomes[streamer.id].bursts == 0
+
+    async with session_scope() as session:
+        assert len(await BurstRepository(session).list_recent(now - timedelta(minutes=10))) == 1
+
+    await service.aclose()
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_ingestion_limits_sync_to_shard_streamers(monkeypatch):
+    settings = Settings(
+        app_env="test",
+        database_url="sqlite+aiosqlite:///:memory:",
+        jwt_secret="secret",
+    )
+
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        first = Streamer(twitch_user_id="111", display_name="First", avatar_url=None)
+        second = Streamer(twitch_user_id="222", display_name="Second", avatar_url=None)
+        session.add_all([first, second])
+        await session.flush()
+        shard_ids = [second.id]
+
+    fake = FakeTwitch([])
+    requested = []
+
+    async def get_clips(broadcaster_id, started_at, **kwargs):
+        requested.append(broadcaster_id)
+        return []
+
+    fake.get_clips = get_clips
+    service = ClipIngestionService(fake)
+    await service.sync_once(shard_ids)
+
+    assert requested == ["222"]
+
+    async with session_scope() as session:
+        repo = StreamerRepository(session)
+        assert len(await repo.list_active_streamer_ids()) == 2
+
+    await service.aclose()
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_ingestion_aborts_without_writes_when_lease_is_lost_mid_cycle(
+    monkeypatch, fake_redis
+):
+    settings = Settings(
+        app_env="test",
+        database_url="sqlite+aiosqlite:///:memory:",
+        jwt_secret="secret",
+    )
+
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        session.add_all(
+            [
+                Streamer(twitch_user_id="111", display_name="First", avatar_url=None),
+                Streamer(twitch_user_id="222", display_name="Second", avatar_url=None),
+            ]
+        )
+
+    lease = RedisLease(fake_redis, "clipador:ingestion:shard:0", 30)
+    assert await lease.acquire()
+    now = datetime.now(timezone.utc)
+    fetched = []
+
+    async def get_clips(broadcaster_id, started_at, **kwargs):
+        fetched.append(broadcaster_id)
+        if broadcaster_id == "222":
+            # o lease expira durante a consulta e outro worker o assume
+            fake_redis.data[lease.key] = "other-worker"
+            await asyncio.sleep(0.05)
+        created_at = (now - timedelta(minutes=1)).isoformat().replace("+00:00", "Z")
+        return [{"id": f"clip-{broadcaster_id}", "created_at": created_at, "view_count": 1}]
+
+    fake = FakeTwitch([])
+    fake.get_clips = get_clips
+    service = ClipIngestionService(fake)
+    with pytest.raises(LeaseLostError):
+        async with lease.keepalive(interval_seconds=0.01):
+            await service.sync_once(checkpoint=lease.check)
+
+    assert fetched == ["111", "222"]
+    # nada do ciclo foi gravado, nem os clipes do streamer processado antes da perda
+    async with session_scope() as session:
+        assert await ClipRepository(session).list_recent_clips(since_minutes=60) == []
+
     await service.aclose()
     await engine.dispose()
     db_module._ENGINE = None
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from clipador_backend.metrics import metrics
+from clipador_backend.services import leases
+from clipador_backend.settings import Settings
+from clipador_backend.tasks import ingestion as ingestion_task
+
+
+@pytest.mark.asyncio
+async def test_lease_is_exclusive_and_release_checks_owner(fake_redis):
+    redis = fake_redis
+    first = leases.RedisLease(redis, "scope", 30)
+    second = leases.RedisLease(redis, "scope", 30)
+
+    assert await first.acquire()
+    assert not await second.acquire()
+    assert not await second.release()
+    assert "scope" in redis.data
+
+    assert await first.renew()
+    assert await first.release()
+    assert await second.acquire()
+
+
+@pytest.mark.asyncio
+async def test_renew_marks_lease_lost_when_taken_over(fake_redis):
+    redis = fake_redis
+    lease = leases.RedisLease(redis, "scope", 30)
+    await lease.acquire()
+    redis.data["scope"] = "someone-else"
+
+    assert not await lease.renew()
+    assert lease.lost
+
+
+@pytest.mark.asyncio
+async def test_keepalive_renews_while_work_runs(fake_redis):
+    redis = fake_redis
+    lease = leases.RedisLease(redis, "scope", 30)
+    await lease.acquire()
+    redis.ttls["scope"] = None
+
+    async with lease.keepalive(interval_seconds=0.01):
+        await asyncio.sleep(0.05)
+
+    assert redis.ttls["scope"] == 30_000
+
+
+@pytest.mark.asyncio
+async def test_busy_scope_coalesces_tick_and_reports_metrics(monkeypatch, fake_redis):
+    redis = fake_redis
+    monkeypatch.setattr(ingestion_task.runtime, "redis", lambda: redis)
+    monkeypatch.setattr(
+        ingestion_task,
+        "get_settings",
+        lambda: Settings(app_env="test", database_url="sqlite+aiosqlite:///:memory:"),
+    )
+    metrics.reset()
+    calls = []
+
+    async def work(lease):
+        calls.append("ran")
+        # um segundo tick durante o ciclo deve ser descartado, não enfileirado
+        return await ingestion_task._run_leased(
+            "clipador:test", "test", lambda _lease: asyncio.sleep(0, "nested")
+        )
+
+    ran, nested = await ingestion_task._run_leased("clipador:test", "test", work)
+
+    assert ran and nested == (False, None)
+    assert calls == ["ran"]
+    assert metrics.counter("ingestion_ticks_skipped", scope="test") == 1
+    assert len(metrics.observations("ingestion_lock_wait_seconds", scope="test")) == 2
+    assert "clipador:test" not in redis.data
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_aborts_work_at_next_checkpoint(monkeypatch, fake_redis):
+    redis = fake_redis
+    monkeypatch.setattr(ingestion_task.runtime, "redis", lambda: redis)
+    monkeypatch.setattr(
+        ingestion_task,
+        "get_settings",
+        lambda: Settings(app_env="test", database_url="sqlite+aiosqlite:///:memory:"),
+    )
+    metrics.reset()
+    steps = []
+
+    async def work(lease):
+        steps.append("before")
+        lease.check()
+        redis.data["clipador:test"] = "other-worker"
+        await lease.renew()
+        lease.check()
+        steps.append("after")
+
+    with pytest.raises(leases.LeaseLostError):
+        await ingestion_task._run_leased("clipador:test", "test", work)
+
+    assert steps == ["before"]
+    assert metrics.counter("ingestion_lease_lost", scope="test") == 1
+    # o lease do outro worker continua intacto
+    assert redis.data["clipador:test"] == "other-worker"
@@ -0,0 +1,21 @@
+from clipador_backend.metrics import RECENT_SAMPLES, Metrics
+
+
+def test_observations_keep_bounded_samples_and_exact_aggregates():
+    metrics = Metrics()
+    for value in range(RECENT_SAMPLES * 4):
+        metrics.observe("cycle_seconds", float(value), scope="test")
+
+    recent = metrics.observations("cycle_seconds", scope="test")
+    assert len(recent) == RECENT_SAMPLES
+    assert recent[-1] == RECENT_SAMPLES * 4 - 1
+
+    summary = metrics.summary("cycle_seconds", scope="test")
+    assert summary == {
+        "count": RECENT_SAMPLES * 4,
+        "sum": sum(range(RECENT_SAMPLES * 4)),
+        "min": 0.0,
+        "max": RECENT_SAMPLES * 4 - 1,
+    }
+    assert metrics.summary("cycle_seconds", scope="other") is None
+    assert metrics.snapshot()["observations"]["cycle_seconds{'scope': 'test'}"] == summary
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from clipador_backend.api.pagination import (
+    PREV,
+    apply_keyset,
+    build_page,
+    decode_cursor,
+    encode_cursor,
+)
+from clipador_backend.models import Base, ClipRecord, Streamer
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    cursor = decode_cursor(encode_cursor(created_at, 42, PREV))
+
+    assert (cursor.created_at, cursor.id, cursor.direction) == (created_at, 42, PREV)
+    assert decode_cursor(None) is None
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor("não-é-cursor")
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_walk_forward_and_back_without_gaps():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with session_factory() as session:
+        streamer = Streamer(twitch_user_id="s1", display_name="S1", avatar_url=None)
+        session.add(streamer)
+        await session.flush()
+        for index in range(7):
+            # pares de clipes com o mesmo created_at exercitam o desempate por id
+            session.add(
+                ClipRecord(
+                    clip_id=f"clip{index}",
+                    streamer_id=streamer.id,
+                    streamer_name="S1",
+                    streamer_external_id="s1",
+                    created_at=base + timedelta(minutes=index // 2),
+                    viewer_count=index,
+                    fetched_at=base,
+                )
+            )
+        await session.commit()
+
+        async def page(token: str | None):
+            cursor = decode_cursor(token)
+            query = apply_keyset(select(ClipRecord), ClipRecord.created_at, ClipRecord.id, cursor, limit=3)
+            rows = (await session.execute(query)).scalars().all()
+            return build_page(rows, cursor, limit=3, key=lambda clip: (clip.created_at, clip.id))
+
+        first = await page(None)
+        second = await page(first.next_cursor)
+        third = await page(second.next_cursor)
+
+        seen = [clip.clip_id for p in (first, second, third) for clip in p.items]
+        assert seen == ["clip6", "clip5", "clip4", "clip3", "clip2", "clip1", "clip0"]
+        assert first.prev_cursor is None
+        assert third.next_cursor is None
+
+        back = await page(third.prev_cursor)
+        assert [clip.clip_id for clip in back.items] == ["clip3", "clip2", "clip1"]
+        assert back.next_cursor is not None
+        start = await page(back.prev_cursor)
+        assert [clip.clip_id for clip in start.items] == ["clip6", "clip5", "clip4"]
+        assert start.prev_cursor is None
+
+    await engine.dispose()
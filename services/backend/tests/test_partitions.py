@@ -0,0 +1,60 @@
+from datetime import date
+
+from clipador_backend.services.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    month_partitions,
+    partition_name,
+    plan_partitions,
+)
+
+
+def test_month_helpers_roll_over_years():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partition_name("clips", date(2025, 2, 1)) == "clips_p202502"
+
+    partitions = month_partitions("clips", date(2024, 12, 15), date(2025, 1, 1))
+    assert [(p.name, p.start, p.end) for p in partitions] == [
+        ("clips_p202412", date(2024, 12, 1), date(2025, 1, 1)),
+        ("clips_p202501", date(2025, 1, 1), date(2025, 2, 1)),
+    ]
+    assert "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')" in partitions[0].create_sql()
+
+
+def test_plan_creates_future_months_and_expires_old_ones():
+    existing = ["clips_p202401", "clips_p202402", "clips_p202406", "clips_p202407", "clips_default"]
+
+    plan = plan_partitions(
+        "clips",
+        existing,
+        today=date(2024, 7, 20),
+        months_ahead=2,
+        retention_months=5,
+    )
+
+    assert [p.name for p in plan.to_create] == ["clips_p202408", "clips_p202409"]
+    # corte em 2024-02-01: janeiro saiu inteiro da retenção, fevereiro ainda não
+    assert plan.to_drop == ["clips_p202401"]
+
+
+def test_models_mirror_partitioned_constraints():
+    # PK/UNIQUE de tabelas particionadas precisam da chave de partição, e nada
+    # referencia `clips.id` (migração 0005); os modelos devem refletir isso.
+    from sqlalchemy import UniqueConstraint
+
+    from clipador_backend.models import Base
+
+    clips = Base.metadata.tables["clips"]
+    assert not clips.c.clip_id.unique
+    assert {
+        tuple(constraint.columns.keys())
+        for constraint in clips.constraints
+        if isinstance(constraint, UniqueConstraint)
+    } == {("clip_id", "created_at")}
+    assert not [
+        fk
+        for table in Base.metadata.tables.values()
+        for fk in table.foreign_keys
+        if fk.column.table.name in PARTITIONED_TABLES
+    ]
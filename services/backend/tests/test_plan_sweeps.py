@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from clipador_backend.models import Base, UserAccount, UserChannelConfig
+from clipador_backend.repositories.user_config import config_changes
+from clipador_backend.services.plan_sweeps import expiring_plans, revoke_expired_trials
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _user(name: str, plan: str, expires_at: datetime | None, status: str = "active") -> UserAccount:
+    return UserAccount(
+        username=name,
+        hashed_password="x",
+        email=f"{name}@example.com",
+        plan=plan,
+        plan_expires_at=expires_at,
+        status=status,
+    )
+
+
+@pytest.mark.asyncio
+async def test_revoke_expired_trials_in_chunks(session_factory):
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        expired = [
+            _user(f"trial{i}", "Teste Gratuito", now - timedelta(hours=i + 1)) for i in range(5)
+        ]
+        session.add_all(expired)
+        session.add_all(
+            [
+                _user("fresh", "Teste Gratuito", now + timedelta(days=1)),
+                _user("paid", "Mensal Solo", now - timedelta(days=1)),
+                _user("gone", "teste gratuito", now - timedelta(days=1), status="inactive"),
+            ]
+        )
+        await session.flush()
+        session.add_all(UserChannelConfig(user_id=user.id) for user in expired)
+        await session.commit()
+
+    engine = session_factory.kw["bind"]
+    updates: list[str] = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("UPDATE"):
+            updates.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        revoked = await revoke_expired_trials(session_factory, now=now, chunk_size=2)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert sorted(revoked) == sorted(user.id for user in expired)
+    # 3 lotes (2 + 2 + 1) com um UPDATE de usuários e um de configurações cada
+    assert len(updates) == 6
+
+    async with session_factory() as session:
+        users = {user.username: user for user in (await session.scalars(select(UserAccount))).all()}
+        modes = set((await session.scalars(select(UserChannelConfig.monitor_mode))).all())
+    for index in range(5):
+        user = users[f"trial{index}"]
+        assert (user.plan, user.status, user.plan_expires_at) == ("free", "trial_expired", None)
+    assert users["fresh"].plan == "Teste Gratuito"
+    assert users["paid"].status == "active"
+    assert users["gone"].plan == "teste gratuito"
+    assert modes == {"DESATIVADO"}
+    # o `/config/me` em cache desses usuários deixa de valer em todos os processos
+    for user in expired:
+        assert await config_changes.changed_at(user.id) is not None
+    assert await config_changes.changed_at(users["paid"].id) is None
+
+
+@pytest.mark.asyncio
+async def test_revocation_follows_the_catalog_trial_rules(session_factory):
+    now = datetime.now(timezone.utc)
+    yesterday = now - timedelta(days=1)
+    async with session_factory() as session:
+        session.add_all(
+            [
+                _user("gratis", "Grátis", yesterday),
+                _user("accented", "TESTE GRÁTIS", yesterday),
+                # "mensal solo" vem antes de "teste" no catálogo: é plano pago
+                _user("solo", "Mensal Solo Teste", yesterday),
+                _user("legacy", None, yesterday),
+            ]
+        )
+        await session.commit()
+
+    revoked = await revoke_expired_trials(session_factory, now=now)
+
+    async with session_factory() as session:
+        users = {user.username: user for user in (await session.scalars(select(UserAccount))).all()}
+    assert sorted(revoked) == sorted([users["gratis"].id, users["accented"].id])
+    assert users["solo"].status == "active" and users["solo"].plan == "Mensal Solo Teste"
+    assert users["legacy"].status == "active"
+
+
+@pytest.mark.asyncio
+async def test_expiring_plans_buckets_in_one_query(session_factory):
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        session.add_all(
+            [
+                _user("d0", "Mensal Solo", now + timedelta(hours=5)),
+                _user("d1", "Mensal Plus", now + timedelta(days=1, hours=2)),
+                _user("d2", "Mensal Plus", now + timedelta(days=2, hours=2)),
+                _user("d3", "Anual Pro", now + timedelta(days=3, hours=1)),
+                _user("d7", "Anual Pro", now + timedelta(days=7, minutes=1)),
+                _user("past", "Anual Pro", now - timedelta(hours=1)),
+                _user("off", "Anual Pro", now + timedelta(days=1), status="inactive"),
+            ]
+        )
+        await session.commit()
+
+    engine = session_factory.kw["bind"]
+    queries: list[str] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    reminders = await expiring_plans(session_factory, now=now)
+
+    assert len(queries) == 1
+    by_email = {reminder.email: reminder.days_left for reminder in reminders}
+    # cada usuário aparece uma vez, no balde da sua faixa
+    assert by_email == {
+        "d0@example.com": 0,
+        "d1@example.com": 1,
+        "d3@example.com": 3,
+        "d7@example.com": 7,
+    }
@@ -0,0 +1,41 @@
+from clipador_backend.services.polling import PollingPolicy, PollOutcome, outcomes_for
+
+
+def test_bursts_poll_at_the_fast_interval():
+    policy = PollingPolicy(min_interval=30, base_interval=180, max_interval=1800)
+
+    assert policy.next_interval(960, PollOutcome(1, new_clips=3, bursts=1)) == 30
+
+
+def test_new_clips_reset_to_streamer_base_interval():
+    policy = PollingPolicy(min_interval=30, base_interval=180, max_interval=1800)
+
+    assert policy.next_interval(960, PollOutcome(1, new_clips=2)) == 180
+    assert policy.next_interval(960, PollOutcome(1, new_clips=2, base_interval=120)) == 120
+
+
+def test_idle_streamers_back_off_exponentially_up_to_cap():
+    policy = PollingPolicy(min_interval=30, base_interval=180, max_interval=1800)
+    interval = None
+    seen = []
+    for _ in range(6):
+        interval = policy.next_interval(interval, PollOutcome(1))
+        seen.append(interval)
+
+    assert seen == [360, 720, 1440, 1800, 1800, 1800]
+    # depois de um burst o próximo período ocioso recomeça do intervalo base
+    assert policy.next_interval(30, PollOutcome(1)) == 360
+
+
+def test_failures_back_off_even_with_partial_results():
+    policy = PollingPolicy()
+
+    assert policy.next_interval(180, PollOutcome(1, bursts=1, failed=True)) == 360
+
+
+def test_outcomes_fill_unvisited_streamers_as_idle():
+    results = {2: PollOutcome(2, new_clips=1)}
+
+    outcomes = outcomes_for([1, 2], results)
+
+    assert [(o.streamer_id, o.new_clips) for o in outcomes] == [(1, 0), (2, 1)]
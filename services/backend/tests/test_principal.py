@@ -0,0 +1,126 @@
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from clipador_backend.cache import TTLCache
+from clipador_backend.models import Base, UserAccount
+from clipador_backend.security.principal import (
+    clear_principal_cache,
+    invalidate_principal,
+    principal_changes,
+    principal_claims,
+    resolve_principal,
+)
+from clipador_backend.settings import Settings
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" passa a ser o mais recente
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_principal_resolves_from_claims_until_invalidated(monkeypatch):
+    settings = Settings(app_env="test", database_url="sqlite+aiosqlite:///:memory:", jwt_secret="secret")
+    monkeypatch.setattr("clipador_backend.security.principal.get_settings", lambda: settings)
+    clear_principal_cache()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+
+    queries: list[str] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    async with session_factory() as session:
+        user = UserAccount(username="member", hashed_password="x", role="member", plan="Mensal Solo", status="active")
+        session.add(user)
+        await session.commit()
+
+        issued_at = int(time.time()) - 5
+        payload = {"sub": "member", "iat": issued_at, **principal_claims(user)}
+        queries.clear()
+
+        principal = await resolve_principal(payload, session)
+        assert principal is not None and principal.plan == "Mensal Solo" and principal.id == user.id
+        assert queries == []
+
+        # plano revogado: o token antigo não é mais confiável e o banco é consultado
+        user.plan = "free"
+        user.status = "inactive"
+        await session.commit()
+        await invalidate_principal("member")
+        queries.clear()
+
+        principal = await resolve_principal(payload, session)
+        assert principal.plan == "free" and principal.status == "inactive"
+        assert len(queries) == 1
+
+        # a resposta do banco fica em cache para as próximas requisições
+        queries.clear()
+        assert (await resolve_principal(payload, session)).plan == "free"
+        assert queries == []
+
+        # alteração feita por outro processo (ex.: worker de cobrança): só a marca no
+        # Redis muda, e o principal em cache deste processo deixa de valer
+        user.plan = "Mensal Duo"
+        user.status = "active"
+        await session.commit()
+        await principal_changes.touch(["member"])
+        queries.clear()
+        assert (await resolve_principal(payload, session)).plan == "Mensal Duo"
+        assert len(queries) == 1
+
+        # tokens sem as claims novas continuam funcionando via banco
+        clear_principal_cache()
+        legacy = await resolve_principal({"sub": "member", "iat": issued_at, "role": "member"}, session)
+        assert legacy.plan == "Mensal Duo"
+        assert await resolve_principal({"sub": "ghost", "iat": issued_at}, session) is None
+
+    clear_principal_cache()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_principal_falls_back_to_database_when_redis_is_down(monkeypatch):
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    class DownRedis:
+        async def get(self, key):
+            raise RedisConnectionError("redis down")
+
+    monkeypatch.setattr("clipador_backend.redis_client._CLIENT", DownRedis())
+    clear_principal_cache()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        user = UserAccount(username="member", hashed_password="x", plan="free", status="inactive")
+        session.add(user)
+        await session.commit()
+
+        # as claims dizem que o plano está ativo, mas sem a marca não dá para confiar nelas
+        claims = {**principal_claims(user), "plan": "Mensal Solo", "status": "active"}
+        payload = {"sub": "member", "iat": int(time.time()), **claims}
+        principal = await resolve_principal(payload, session)
+        assert principal.plan == "free" and principal.status == "inactive"
+
+    clear_principal_cache()
+    await engine.dispose()
@@ -0,0 +1,156 @@
+"""Regressão de planos de consulta dos repositórios em Postgres com ~1M de linhas.
+
+Roda apenas com `CLIPADOR_TEST_POSTGRES_URL` apontando para um banco descartável: o
+schema é recriado do zero com `alembic upgrade head`, populado com `generate_series` e
+cada método de repositório tem o SQL capturado e submetido a `EXPLAIN (FORMAT JSON)`.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from clipador_backend.repositories.bursts import BurstRepository
+from clipador_backend.repositories.clips import ClipRepository
+from clipador_backend.repositories.user_config import UserConfigRepository
+
+POSTGRES_URL = os.environ.get("CLIPADOR_TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not POSTGRES_URL, reason="CLIPADOR_TEST_POSTGRES_URL não definido (requer Postgres descartável)"
+)
+
+# Tabelas pequenas (streamers, users) podem legitimamente usar seq scan.
+LARGE_TABLES = {"clips", "bursts", "burst_clips", "clip_deliveries", "streamer_status", "user_streamers"}
+
+SEED_SQL = [
+    """
+    INSERT INTO users (username, hashed_password, role, plan, status, trial_used, created_at, updated_at)
+    SELECT 'user' || g, 'x', 'member', 'free', 'active', false, now(), now()
+    FROM generate_series(1, 5000) g
+    """,
+    """
+    INSERT INTO streamers (twitch_user_id, display_name, is_active, monitor_interval_seconds,
+                           monitor_min_clips, api_mode, created_at, updated_at)
+    SELECT 's' || g, 'Streamer ' || g, g % 10 <> 0, 180, 2, 'clipador_only', now(), now()
+    FROM generate_series(1, 500) g
+    """,
+    """
+    INSERT INTO clips (clip_id, streamer_id, streamer_name, streamer_external_id, created_at, viewer_count)
+    SELECT 'clip' || g, 1 + g % 500, 'Streamer', 's' || (1 + g % 500),
+           now() - (g % 525600) * interval '1 minute', g % 5000
+    FROM generate_series(1, 1000000) g
+    """,
+    """
+    INSERT INTO bursts (streamer_id, start_time, end_time, clip_count)
+    SELECT 1 + g % 500, now() - (g % 525600) * interval '1 minute',
+           now() - (g % 525600) * interval '1 minute' + interval '3 minutes', 2
+    FROM generate_series(1, 200000) g
+    """,
+    """
+    INSERT INTO burst_clips (burst_id, clip_id, clip_external_id)
+    SELECT g, g, 'clip' || g FROM generate_series(1, 200000) g
+    """,
+    """
+    INSERT INTO user_streamers (user_id, streamer_id, order_index, created_at)
+    SELECT 1 + g / 20, 1 + g % 500, g % 20, now() FROM generate_series(0, 99999) g
+    """,
+    """
+    INSERT INTO clip_deliveries (user_id, streamer_id, clip_external_id, burst_start, burst_end,
+                                 delivered_at, delivery_channel)
+    SELECT 1 + g % 5000, 1 + g % 500, 'clip' || g, now(), now(),
+           now() - (g % 525600) * interval '1 minute', 'web'
+    FROM generate_series(1, 1000000) g
+    """,
+    """
+    INSERT INTO streamer_status (user_id, streamer_id, status, updated_at)
+    SELECT 1 + g / 40, 1 + g % 500, 'offline', now() - g * interval '1 second'
+    FROM generate_series(0, 199999) g
+    """,
+]
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(_seq_scans(child))
+    return scans
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_engine(migrated_postgres_url):
+    engine = create_async_engine(migrated_postgres_url)
+    async with engine.begin() as conn:
+        for statement in SEED_SQL:
+            await conn.execute(text(statement))
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    yield engine
+    await engine.dispose()
+
+
+async def _explain_calls(engine, call) -> list[tuple[str, list[str]]]:
+    captured: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            await call(session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in captured:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            raw = result.scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            plans.append((statement, _seq_scans(plan)))
+    return plans
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+REPOSITORY_CALLS = {
+    "clips.clip_exists": lambda s: ClipRepository(s).clip_exists("clip123456"),
+    "clips.list_recent_clips": lambda s: ClipRepository(s).list_recent_clips(since_minutes=60),
+    "clips.list_recent_clips[streamer]": lambda s: ClipRepository(s).list_recent_clips(
+        since_minutes=60, streamer_id="s42"
+    ),
+    "clips.recent_bursts": lambda s: ClipRepository(s).recent_bursts(since_minutes=60),
+    "clips.list_public_clips": lambda s: ClipRepository(s).list_public_clips(limit=12),
+    "bursts.find_matching": lambda s: BurstRepository(s).find_matching(
+        42, _now() - timedelta(minutes=10), _now(), ["clip42", "clip542"]
+    ),
+    "bursts.list_recent": lambda s: BurstRepository(s).list_recent(_now() - timedelta(minutes=30)),
+    "user_config.recent_deliveries": lambda s: UserConfigRepository(s).recent_deliveries(42),
+    "user_config.recent_deliveries_with_streamer": lambda s: UserConfigRepository(
+        s
+    ).recent_deliveries_with_streamer(42),
+    "user_config.list_streamer_status": lambda s: UserConfigRepository(s).list_streamer_status(42),
+    "user_config.list_users_for_streamer": lambda s: UserConfigRepository(s).list_users_for_streamer(42),
+}
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("name", sorted(REPOSITORY_CALLS))
+async def test_repository_queries_avoid_seq_scans(seeded_engine, name):
+    plans = await _explain_calls(seeded_engine, REPOSITORY_CALLS[name])
+
+    assert plans, f"{name} não executou SELECT"
+    for statement, scans in plans:
+        assert not scans, f"{name} faz seq scan em {scans}:\n{statement}"
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from clipador_backend.metrics import metrics
+from clipador_backend.models import (
+    Base,
+    BurstClip,
+    BurstRecord,
+    ClipRecord,
+    RetentionProgress,
+    Streamer,
+    WebhookEvent,
+    WebhookStatus,
+)
+from clipador_backend.services.retention import RetentionService, default_policies
+
+
+async def _count(session_factory, model) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_retention_deletes_old_rows_in_resumable_chunks():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        streamer = Streamer(twitch_user_id="streamer1", display_name="Streamer 1", avatar_url=None)
+        session.add(streamer)
+        await session.flush()
+        for index, age in enumerate((400, 400, 400, 400, 400, 10, 1)):
+            session.add(
+                ClipRecord(
+                    clip_id=f"clip{index}",
+                    streamer_id=streamer.id,
+                    streamer_name="Streamer 1",
+                    streamer_external_id="streamer1",
+                    created_at=now - timedelta(days=age),
+                    viewer_count=10,
+                    fetched_at=now,
+                )
+            )
+        old_burst = BurstRecord(
+            streamer_id=streamer.id,
+            start_time=now - timedelta(days=400),
+            end_time=now - timedelta(days=400),
+            clip_count=2,
+        )
+        new_burst = BurstRecord(
+            streamer_id=streamer.id, start_time=now - timedelta(days=1), end_time=now, clip_count=1
+        )
+        session.add_all([old_burst, new_burst])
+        await session.flush()
+        session.add_all(
+            [
+                BurstClip(burst_id=old_burst.id, clip_id=1, clip_external_id="clip0"),
+                BurstClip(burst_id=old_burst.id, clip_id=2, clip_external_id="clip1"),
+                BurstClip(burst_id=new_burst.id, clip_id=7, clip_external_id="clip6"),
+            ]
+        )
+        await session.commit()
+
+    metrics.reset()
+    policies = default_policies(clips_days=365)
+
+    # orçamento de um lote: para no meio e deixa o checkpoint gravado
+    partial = RetentionService(session_factory, policies, chunk_size=2, sleep_seconds=0, max_chunks=1)
+    reports = {report.table: report for report in await partial.run(now=now)}
+
+    assert "historico_envio" not in reports  # tabela legada ausente é ignorada
+    assert reports["clips"].deleted == 2 and not reports["clips"].completed
+    async with session_factory() as session:
+        progress = await session.get(RetentionProgress, "clips")
+        assert progress.last_pk == 2
+        assert progress.rows_deleted == 2
+
+    full = RetentionService(session_factory, policies, chunk_size=2, sleep_seconds=0)
+    reports = {report.table: report for report in await full.run(now=now)}
+
+    assert reports["clips"].deleted == 3 and reports["clips"].completed
+    assert await _count(session_factory, ClipRecord) == 2
+    assert await _count(session_factory, BurstRecord) == 1
+    assert await _count(session_factory, BurstClip) == 1
+
+    async with session_factory() as session:
+        progress = await session.get(RetentionProgress, "clips")
+        assert progress.last_pk == 0 and progress.cutoff is None
+        assert progress.rows_deleted == 5
+        assert progress.runs == 1
+
+    assert metrics.counter("retention_rows_deleted", table="clips") == 5
+    assert metrics.counter("retention_rows_deleted", table="burst_clips") == 2
+    assert len(metrics.observations("retention_rows_per_second", table="clips")) == 2
+
+    await engine.dispose()
+
+
+def test_partitioned_tables_are_left_to_partition_maintenance():
+    from clipador_backend.services.partitions import PARTITIONED_TABLES
+
+    tables = [policy.table for policy in default_policies(partitioned=PARTITIONED_TABLES)]
+
+    assert tables == ["historico_envio", "burst_clips", "bursts", "webhook_inbox"]
+    assert "clips" in [policy.table for policy in default_policies()]
+
+
+@pytest.mark.asyncio
+async def test_retention_drops_only_settled_webhook_events():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        engine, expire_on_commit=False
+    )
+
+    now = datetime.now(timezone.utc)
+    events = [
+        ("old-processed", WebhookStatus.PROCESSED, 40),
+        ("old-failed", WebhookStatus.FAILED, 40),
+        ("old-pending", WebhookStatus.PENDING, 40),
+        ("new-processed", WebhookStatus.PROCESSED, 1),
+    ]
+    async with session_factory() as session:
+        session.add_all(
+            WebhookEvent(
+                source="kirvano",
+                idempotency_key=key,
+                payload={},
+                status=status.value,
+                attempts=1,
+                received_at=now - timedelta(days=age),
+            )
+            for key, status, age in events
+        )
+        await session.commit()
+
+    policies = [
+        policy for policy in default_policies(webhook_days=30) if policy.table == "webhook_inbox"
+    ]
+    await RetentionService(session_factory, policies, sleep_seconds=0).run(now=now)
+
+    async with session_factory() as session:
+        kept = set((await session.scalars(select(WebhookEvent.idempotency_key))).all())
+    assert kept == {"old-pending", "new-processed"}
+
+    await engine.dispose()
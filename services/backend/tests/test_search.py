@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from clipador_backend.models import Base, Streamer, UserAccount
+from clipador_backend.repositories.search import (
+    NgramIndex,
+    escape_like,
+    ilike_contains,
+    search_streamers,
+    search_users,
+)
+
+
+def test_ngram_index_matches_substrings_case_insensitively():
+    index = NgramIndex.build(
+        [(1, "Gaules", "181077473"), (2, "gaulesTV", None), (3, "Alanzoka", "38244180")]
+    )
+
+    assert index.search("GAUL") == {1, 2}
+    assert index.search("lanz") == {3}
+    assert index.search("ul") == {1, 2}  # curto demais para trigramas: varredura
+    assert index.search("0774") == {1}
+    assert index.search("zzz") == set()
+    assert index.search("  ") == set()
+
+
+def test_like_wildcards_are_escaped():
+    assert escape_like("100%_off\\") == "100\\%\\_off\\\\"
+
+    compiled = ilike_contains(UserAccount.username, " a_b ").compile(dialect=postgresql.dialect())
+    assert "ILIKE" in str(compiled) and "ESCAPE" in str(compiled)
+    assert list(compiled.params.values()) == ["%a\\_b%"]
+
+
+@pytest.mark.asyncio
+async def test_search_streamers_and_users_on_sqlite():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        session.add_all(
+            [
+                Streamer(twitch_user_id="101", display_name="Gaules"),
+                Streamer(twitch_user_id="102", display_name="gaulesTV"),
+                Streamer(twitch_user_id="103", display_name="Alanzoka"),
+                UserAccount(username="ana_1", email="ana@example.com", hashed_password="x"),
+                UserAccount(username="anax1", email="other@example.com", hashed_password="x"),
+            ]
+        )
+        await session.commit()
+
+        found = await search_streamers(session, "GAUL")
+        assert [streamer.display_name for streamer in found] == ["Gaules", "gaulesTV"]
+        assert [s.display_name for s in await search_streamers(session, "gaul", limit=1)] == [
+            "Gaules"
+        ]
+        assert [s.display_name for s in await search_streamers(session, "103")] == ["Alanzoka"]
+
+        # "_" é literal, não curinga
+        assert [user.username for user in await search_users(session, "a_1")] == ["ana_1"]
+        users = await search_users(session, "example")
+        assert [user.username for user in users] == ["ana_1", "anax1"]
+
+    await engine.dispose()
@@ -0,0 +1,34 @@
+from collections import Counter
+
+import pytest
+
+from clipador_backend.services.sharding import HashRing
+
+
+def test_hash_ring_is_deterministic_and_covers_all_shards():
+    ring = HashRing(4)
+    keys = list(range(1, 2001))
+
+    partition = ring.partition(keys)
+
+    assert sorted(partition) == [0, 1, 2, 3]
+    assert sorted(key for bucket in partition.values() for key in bucket) == keys
+    assert all(ring.shard_for(key) == HashRing(4).shard_for(key) for key in keys)
+    # nós virtuais mantêm a distribuição razoavelmente equilibrada
+    assert max(map(len, partition.values())) < 2 * min(map(len, partition.values()))
+
+
+def test_hash_ring_moves_few_keys_when_adding_a_shard():
+    keys = range(1, 5001)
+    before = {key: HashRing(4).shard_for(key) for key in keys}
+    grown = HashRing(5)
+    moved = Counter(before[key] != grown.shard_for(key) for key in keys)
+
+    # idealmente 1/5 das chaves migram; hash modular moveria ~80%
+    assert moved[True] / len(before) < 0.35
+    assert all(grown.shard_for(key) == 4 for key in keys if before[key] != grown.shard_for(key))
+
+
+def test_hash_ring_rejects_zero_shards():
+    with pytest.raises(ValueError):
+        HashRing(0)
@@ -65,6 +65,20 @@ async def test_stream_crud_requires_auth(monkeypatch):
         assert data[0]["has_client_credentials"] is False
         assert data[0]["api_mode"] == "clipador_only"
 
+        search_resp = await client.get("/streams", params={"q": "stream"}, headers=headers)
+        assert [item["id"] for item in search_resp.json()] == [streamer_id]
+        miss_resp = await client.get("/streams", params={"q": "nobody"}, headers=headers)
+        assert miss_resp.json() == []
+
+        other_resp = await client.post(
+            "/streams",
+            json={"twitch_user_id": "user456", "display_name": "Another"},
+            headers=headers,
+        )
+        assert other_resp.status_code == 201, other_resp.text
+        limited_resp = await client.get("/streams", params={"limit": 1}, headers=headers)
+        assert [item["display_name"] for item in limited_resp.json()] == ["Another"]
+
         delete_resp = await client.delete(f"/streams/{streamer_id}", headers=headers)
         assert delete_resp.status_code == 204
 
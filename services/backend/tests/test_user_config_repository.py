@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 
 from clipador_backend import db as db_module
 from clipador_backend.db import get_engine, session_scope
@@ -113,3 +114,46 @@ async def test_record_delivery(monkeypatch):
     await engine.dispose()
     db_module._ENGINE = None
     db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_load_snapshot_uses_a_single_query(monkeypatch):
+    settings = _make_settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        user = UserAccount(username="demo", hashed_password=hash_password("secret"))
+        first = Streamer(twitch_user_id="s1", display_name="Bravo", is_active=True)
+        second = Streamer(twitch_user_id="s2", display_name="Alpha", is_active=True)
+        session.add_all([user, first, second])
+        await session.flush()
+
+        repo = UserConfigRepository(session)
+        empty = await repo.load_snapshot(user.id)
+        assert empty.config.user_id == user.id and empty.streamers == []
+
+        await repo.attach_streamer(user_id=user.id, streamer_id=first.id, order_index=1)
+        await repo.attach_streamer(user_id=user.id, streamer_id=second.id, order_index=2)
+        await repo.upsert_streamer_status(user_id=user.id, streamer_id=first.id, status="online")
+        session.expunge_all()
+
+        queries: list[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+        snapshot = await repo.load_snapshot(user.id)
+
+        assert len(queries) == 1
+        assert [streamer.display_name for _, streamer, _ in snapshot.streamers] == ["Bravo", "Alpha"]
+        statuses = [status.status if status else None for _, _, status in snapshot.streamers]
+        assert statuses == ["online", None]
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select
 
 from clipador_backend import db as db_module
-from clipador_backend.db import get_engine, session_scope
+from clipador_backend.db import get_engine, get_session_factory, session_scope
 from clipador_backend.main import create_app
-from clipador_backend.models import Base, UserAccount
+from clipador_backend.models import Base, UserAccount, WebhookEvent, WebhookStatus
 from clipador_backend.security.auth import hash_password
+from clipador_backend.services.webhook_inbox import (
+    InboxDrainer,
+    apply_kirvano_event,
+    kirvano_idempotency_key,
+)
 from clipador_backend.settings import Settings
 
 
@@ -21,6 +29,31 @@ def _make_settings(database_url: str = "sqlite+aiosqlite:///:memory:") -> Settin
     )
 
 
+def test_repeated_subscription_events_get_distinct_keys():
+    renewal = {
+        "event": "subscription.renewed",
+        "sale_id": "sale-9",
+        "customer": {"email": "member@example.com"},
+    }
+    monday = datetime(2024, 5, 6, 10, tzinfo=timezone.utc)
+
+    # a venda em si só é aprovada uma vez
+    sale = {**renewal, "event": "SALE_APPROVED"}
+    assert kirvano_idempotency_key(sale, received_at=monday) == "sale:sale-9"
+    assert kirvano_idempotency_key(sale, received_at=monday + timedelta(days=30)) == "sale:sale-9"
+
+    # renovações da mesma venda se distinguem pelo instante do evento
+    may = {**renewal, "created_at": "2024-05-06 10:00:00"}
+    june = {**renewal, "created_at": "2024-06-06 10:00:00"}
+    assert kirvano_idempotency_key(may) == kirvano_idempotency_key(dict(may))
+    assert kirvano_idempotency_key(may) != kirvano_idempotency_key(june)
+
+    # sem `created_at`, a unicidade vale dentro do dia do recebimento
+    same_day = kirvano_idempotency_key(renewal, received_at=monday + timedelta(hours=5))
+    assert kirvano_idempotency_key(renewal, received_at=monday) == same_day
+    assert kirvano_idempotency_key(renewal, received_at=monday + timedelta(days=31)) != same_day
+
+
 @pytest.mark.asyncio
 async def test_kirvano_webhook_requires_token(monkeypatch):
     settings = _make_settings()
@@ -79,6 +112,15 @@ async def test_kirvano_webhook_processes_sale(monkeypatch):
             json=payload,
         )
         assert response.status_code == 200, response.text
+        assert response.json() == {"status": "success"}
+
+    # a rota só enfileira: o plano muda quando o worker drena a caixa de entrada
+    async with session_scope() as session:
+        user = await session.get(UserAccount, 1)
+        assert user.kirvano_last_sale_id is None
+
+    report = await InboxDrainer(get_session_factory()).drain()
+    assert report.processed == 1
 
     async with session_scope() as session:
         user = await session.get(UserAccount, 1)
@@ -86,6 +128,184 @@ async def test_kirvano_webhook_processes_sale(monkeypatch):
         assert user.plan.lower() == "mensal solo".lower()
         assert user.plan_expires_at is not None
         assert user.kirvano_last_sale_id == "sale-001"
+        inbox = (await session.scalars(select(WebhookEvent))).one()
+        assert inbox.status == WebhookStatus.PROCESSED.value
+        assert inbox.attempts == 1
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_kirvano_webhook_rejects_duplicate_sale_without_db(monkeypatch):
+    settings = _make_settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.api.routes.webhooks.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    app = create_app()
+    payload = {
+        "event": "SALE_APPROVED",
+        "sale_id": "sale-dup",
+        "status": "approved",
+        "customer": {"email": "member@example.com"},
+        "products": [{"offer_name": "Mensal Solo"}],
+    }
+    headers = {"Security-Token": "webhook-secret"}
+
+    queries: list[str] = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/webhooks/kirvano", headers=headers, json=payload)
+        assert first.json() == {"status": "success"}
+
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: queries.append(a[2]))
+        retry = await client.post("/webhooks/kirvano", headers=headers, json=payload)
+        assert retry.status_code == 200
+        assert retry.json() == {"status": "duplicate"}
+
+        missing = await client.post(
+            "/webhooks/kirvano", headers=headers, json={**payload, "sale_id": None}
+        )
+        assert missing.status_code == 400
+
+    assert queries == []
+    async with session_scope() as session:
+        count = await session.scalar(select(func.count()).select_from(WebhookEvent))
+        assert count == 1
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_inbox_drainer_retries_then_marks_failed(monkeypatch):
+    settings = _make_settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_scope() as session:
+        for index in range(3):
+            session.add(
+                WebhookEvent(
+                    source="kirvano",
+                    idempotency_key=f"sale:{index}",
+                    event_type="SALE_APPROVED",
+                    payload={"sale_id": str(index)},
+                )
+            )
+
+    handled: list[str] = []
+
+    async def handler(payload, session):
+        if payload["sale_id"] == "1":
+            raise RuntimeError("boom")
+        handled.append(payload["sale_id"])
+        return []
+
+    drainer = InboxDrainer(get_session_factory(), handler=handler, batch_size=2, max_attempts=2)
+    first = await drainer.drain()
+    assert (first.processed, first.retried, first.failed) == (2, 1, 0)
+    assert handled == ["0", "2"]
+
+    second = await drainer.drain()
+    assert (second.processed, second.retried, second.failed) == (0, 0, 1)
+
+    async with session_scope() as session:
+        statuses = dict(
+            (await session.execute(select(WebhookEvent.idempotency_key, WebhookEvent.status))).all()
+        )
+    assert statuses == {"sale:0": "processed", "sale:1": "failed", "sale:2": "processed"}
+
+    await engine.dispose()
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+
+@pytest.mark.asyncio
+async def test_inbox_drainer_commits_billing_and_status_together(monkeypatch):
+    settings = _make_settings()
+    monkeypatch.setattr("clipador_backend.settings.get_settings", lambda: settings)
+    monkeypatch.setattr("clipador_backend.db.get_settings", lambda: settings)
+
+    db_module._ENGINE = None
+    db_module._SESSION_FACTORY = None
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    expires_at = datetime.now(timezone.utc) + timedelta(days=10)
+    async with session_scope() as session:
+        session.add(
+            UserAccount(
+                username="member",
+                email="member@example.com",
+                hashed_password="x",
+                plan="Mensal Solo",
+                plan_expires_at=expires_at,
+            )
+        )
+        session.add(
+            WebhookEvent(
+                source="kirvano",
+                idempotency_key="subscription.renewed:sale-9",
+                event_type="subscription.renewed",
+                payload={
+                    "event": "subscription.renewed",
+                    "sale_id": "sale-9",
+                    "customer": {"email": "member@example.com"},
+                    "plan": {"name": "Mensal Solo"},
+                },
+            )
+        )
+
+    crashes = [RuntimeError("worker died before the commit")]
+
+    async def handler(payload, session):
+        changed = await apply_kirvano_event(payload, session)
+        if crashes:
+            raise crashes.pop()
+        return changed
+
+    drainer = InboxDrainer(get_session_factory(), handler=handler)
+    first = await drainer.drain()
+    assert (first.processed, first.retried) == (0, 1)
+
+    # a renovação foi desfeita junto com o evento, que segue pendente
+    async with session_scope() as session:
+        user = (await session.scalars(select(UserAccount))).one()
+        assert user.plan_expires_at.replace(tzinfo=timezone.utc) == expires_at
+        inbox = (await session.scalars(select(WebhookEvent))).one()
+        assert (inbox.status, inbox.attempts) == (WebhookStatus.PENDING.value, 1)
+
+    second = await drainer.drain()
+    assert second.processed == 1
+    assert (await drainer.drain()).processed == 0
+
+    # aplicada uma vez só, mesmo depois de duas drenagens
+    async with session_scope() as session:
+        user = (await session.scalars(select(UserAccount))).one()
+        extended = user.plan_expires_at.replace(tzinfo=timezone.utc) - expires_at
+        assert timedelta(days=29) < extended <= timedelta(days=31)
+        inbox = (await session.scalars(select(WebhookEvent))).one()
+        assert (inbox.status, inbox.attempts) == (WebhookStatus.PROCESSED.value, 2)
 
     await engine.dispose()
     db_module._ENGINE = None
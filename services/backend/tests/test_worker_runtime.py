@@ -0,0 +1,141 @@
+import asyncio
+import threading
+
+import pytest
+
+from clipador_backend import db as db_module
+from clipador_backend.settings import Settings
+from clipador_backend.tasks import ingestion as ingestion_task
+from clipador_backend.tasks.runtime import WorkerRuntime
+
+
+class FakeTwitch:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_runtime_reuses_single_loop_across_calls():
+    runtime = WorkerRuntime()
+    try:
+        async def _current():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first_loop, first_thread = runtime.run(_current())
+        second_loop, second_thread = runtime.run(_current())
+
+        assert first_loop is second_loop
+        assert first_thread == second_thread == "clipador-worker-loop"
+        assert threading.current_thread().name != first_thread
+    finally:
+        runtime.shutdown()
+
+    assert not runtime.running
+
+
+def test_runtime_shutdown_closes_shared_twitch_client(monkeypatch):
+    fake = FakeTwitch()
+    monkeypatch.setattr("clipador_backend.tasks.runtime.TwitchAPI", lambda: fake)
+    monkeypatch.setattr(db_module, "_ENGINE", None)
+    monkeypatch.setattr(db_module, "_SESSION_FACTORY", None)
+
+    runtime = WorkerRuntime()
+    runtime.start()
+    assert runtime.twitch() is runtime.twitch()
+
+    runtime.shutdown()
+
+    assert fake.closed
+
+
+def test_ingestion_task_keeps_client_open_between_ticks(monkeypatch, fake_redis):
+    fake = FakeTwitch()
+    runtime = WorkerRuntime()
+    runtime._twitch = fake
+    runtime._redis = fake_redis
+    seen = []
+
+    class StubService:
+        def __init__(self, twitch_client):
+            self._twitch = twitch_client
+
+        async def sync_once(self, streamer_ids=None, checkpoint=None):
+            seen.append((self._twitch, asyncio.get_running_loop()))
+            return {}
+
+    class StubScheduler:
+        def __init__(self, redis):
+            pass
+
+        async def reschedule(self, outcomes):
+            return {outcome.streamer_id: 60 for outcome in outcomes}
+
+    async def claim_due():
+        return [1]
+
+    monkeypatch.setattr(ingestion_task, "runtime", runtime)
+    monkeypatch.setattr(ingestion_task, "run_coroutine", runtime.run)
+    monkeypatch.setattr(ingestion_task, "ClipIngestionService", StubService)
+    monkeypatch.setattr(ingestion_task, "PollingScheduler", StubScheduler)
+    monkeypatch.setattr(ingestion_task, "_claim_due_streamers", claim_due)
+    monkeypatch.setattr(
+        ingestion_task,
+        "get_settings",
+        lambda: Settings(app_env="test", database_url="sqlite+aiosqlite:///:memory:"),
+    )
+
+    try:
+        ingestion_task.run_ingestion_task()
+        ingestion_task.run_ingestion_task()
+    finally:
+        runtime._twitch = runtime._redis = None
+        runtime.shutdown()
+
+    assert [client for client, _ in seen] == [fake, fake]
+    assert seen[0][1] is seen[1][1]
+    assert not fake.closed
+
+
+def test_shard_task_releases_claimed_streamers_when_it_cannot_sync(monkeypatch, fake_redis):
+    runtime = WorkerRuntime()
+    runtime._twitch = FakeTwitch()
+    runtime._redis = fake_redis
+    released = []
+
+    class FailingService:
+        def __init__(self, twitch_client):
+            pass
+
+        async def sync_once(self, streamer_ids=None, checkpoint=None):
+            raise RuntimeError("helix down")
+
+    class StubScheduler:
+        def __init__(self, redis):
+            pass
+
+        async def release(self, streamer_ids):
+            released.append(list(streamer_ids))
+
+    monkeypatch.setattr(ingestion_task, "runtime", runtime)
+    monkeypatch.setattr(ingestion_task, "run_coroutine", runtime.run)
+    monkeypatch.setattr(ingestion_task, "ClipIngestionService", FailingService)
+    monkeypatch.setattr(ingestion_task, "PollingScheduler", StubScheduler)
+    monkeypatch.setattr(
+        ingestion_task,
+        "get_settings",
+        lambda: Settings(app_env="test", database_url="sqlite+aiosqlite:///:memory:"),
+    )
+
+    try:
+        with pytest.raises(RuntimeError):
+            ingestion_task.run_ingestion_shard_task(0, [1, 2])
+        # outro worker segura o lease do shard: os streamers voltam a vencer na hora
+        fake_redis.data[ingestion_task.SHARD_LEASE_KEY.format(shard=1)] = "busy"
+        ingestion_task.run_ingestion_shard_task(1, [3])
+    finally:
+        runtime._twitch = runtime._redis = None
+        runtime.shutdown()
+
+    assert released == [[1, 2], [3]]